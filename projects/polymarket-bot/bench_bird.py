@@ -0,0 +1,105 @@
+"""Benchmark X searches through bird: serial shell, async subprocesses, worker.
+
+Uses fake_bird.py, so it runs offline; each fake process costs
+FAKE_BIRD_STARTUP to start and FAKE_BIRD_DELAY per search, roughly what a
+node CLI costs. Also checks a hanging search is cut off at its deadline
+with its process killed, and that queries reach bird verbatim.
+
+    python bench_bird.py
+"""
+import os
+import shlex
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("FAKE_BIRD_STARTUP", "0.3")
+os.environ.setdefault("FAKE_BIRD_DELAY", "0.2")
+
+from checks_common import check, finish, temp_dir
+from src.config import config
+from src.cache import ResponseCache
+from src import bird, sentiment as sentiment_module
+from src.sentiment import SentimentAnalyzer
+from src.tweet_store import TweetStore
+
+ROUNDS = 5
+FAKE = str(Path(__file__).with_name("fake_bird.py"))
+config.bird_command = f"{shlex.quote(sys.executable)} {shlex.quote(FAKE)}"
+
+# Searches must reach bird every round, and fake tweets must not land in
+# the real response cache
+sentiment_module.cache = ResponseCache(temp_dir() / "cache.db")
+sentiment_module.cache.enabled = False
+
+
+def old_read(queries: list[str]) -> int:
+    """The previous path: one shell command after another."""
+    tweets = 0
+    for query in queries:
+        result = subprocess.run(
+            f'{config.bird_command} search "{query}" --count 15 --json',
+            shell=True, capture_output=True, text=True, timeout=30
+        )
+        tweets += len(result.stdout.split('"id"')) - 1
+    return tweets
+
+
+def timed(read) -> tuple[float, object]:
+    times, result = [], None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = read()
+        times.append((time.perf_counter() - start) * 1000)
+    return sum(times) / len(times), result
+
+
+def fake_searches() -> list[str]:
+    out = subprocess.run(["pgrep", "-f", f"{FAKE} search"], capture_output=True, text=True).stdout
+    return out.split()
+
+
+analyzer = SentimentAnalyzer(store=TweetStore("btc", temp_dir() / "tweets.db"))
+queries = analyzer.queries
+
+old_ms, _ = timed(lambda: old_read(queries))
+bird.worker.args = ""
+spawn_ms, spawned = timed(analyzer.analyze_btc_sentiment)
+bird.worker.args = "worker"
+analyzer.analyze_btc_sentiment()  # start the worker
+worker_ms, served = timed(analyzer.analyze_btc_sentiment)
+
+print(f"{len(queries)} searches per read, {ROUNDS} reads each")
+print(f"  serial shell       {old_ms:7.0f}ms per read")
+print(f"  async subprocesses {spawn_ms:7.0f}ms per read  x{old_ms / spawn_ms:.1f}")
+print(f"  persistent worker  {worker_ms:7.0f}ms per read  x{old_ms / worker_ms:.1f}")
+check("same tweets every way", spawned.total_tweets == served.total_tweets == 15 * len(queries),
+      f"{spawned.total_tweets} / {served.total_tweets}")
+check("concurrent beats serial", spawn_ms * 2 < old_ms, "")
+check("worker skips spawn cost", worker_ms < spawn_ms, "")
+
+# A search that never answers
+config.gather_deadlines = "bird=1,sentiment=5"
+os.environ["FAKE_BIRD_HANG"] = "#BTC"
+for mode in ("", "worker"):
+    bird.worker.stop()
+    bird.worker.args = mode
+    start = time.perf_counter()
+    result = analyzer.analyze_btc_sentiment()
+    elapsed = time.perf_counter() - start
+    time.sleep(0.1)
+    leftover = fake_searches()
+    check(f"hang cut at deadline ({mode or 'spawn'})",
+          result.missing_sources == ["#BTC"] and elapsed < 1.5 and not leftover,
+          f"{elapsed * 1000:.0f}ms, {result.total_tweets} tweets kept, {len(leftover)} bird processes left")
+bird.worker.stop()
+os.environ.pop("FAKE_BIRD_HANG")
+
+# Shell metacharacters in a query are just text
+bird.worker.args = ""
+tricky = 'btc "; echo pwned; "'
+tweets = sentiment_module.run_sync(analyzer._bird_search(tricky, 1))
+check("query passed verbatim", bool(tweets) and tweets[0]["text"].startswith(tricky), repr(tweets[0]["text"][:40]) if tweets else "no result")
+
+finish()
@@ -0,0 +1,132 @@
+"""Benchmark batch tweet classification on synthetic corpora of 1k/10k/100k tweets.
+
+Compares the old path (one tally per tweet, then an uncompiled price
+regex and a second classification for high-engagement tweets) with
+BatchClassifier, and checks both give the same labels and signals.
+
+    python bench_classifier.py                  # print throughput
+    python bench_classifier.py data/bench.json  # also compare to a baseline
+
+With a baseline file, the run fails if batch throughput at any size
+drops by more than BENCH_TOLERANCE (default 0.2) from it; a missing
+file is written with this run's numbers.
+"""
+import json
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from checks_common import check, finish
+from src.classifier import BatchClassifier
+from src.matcher import KeywordMatcher
+from src.sentiment import SentimentAnalyzer
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+SIZES = (1_000, 10_000, 100_000)
+TOLERANCE = float(os.getenv("BENCH_TOLERANCE", "0.2"))
+
+FILLER = (
+    "btc looking at the weekly close and funding while traders watch spot etf "
+    "flows on every major exchange today after that move lol gm"
+).split()
+KEYWORDS = SentimentAnalyzer.BULLISH_KEYWORDS + SentimentAnalyzer.BEARISH_KEYWORDS
+# The per-tweet tally the old path ran
+TWEET_MATCHER = KeywordMatcher(
+    {"bullish": SentimentAnalyzer.BULLISH_KEYWORDS, "bearish": SentimentAnalyzer.BEARISH_KEYWORDS}, cache_size=0
+)
+
+
+def corpus(n: int, seed: int = 7) -> list[dict]:
+    """Tweets of 8-30 words with 0-3 sentiment keywords and the odd price target."""
+    rng = random.Random(seed)
+    tweets = []
+    for i in range(n):
+        words = rng.choices(FILLER, k=rng.randint(8, 30)) + rng.choices(KEYWORDS, k=rng.randint(0, 3))
+        if rng.random() < 0.2:
+            words.append(f"${rng.randint(60, 150)},{rng.randint(0, 999):03d}")
+        rng.shuffle(words)
+        text = " ".join(w.upper() if rng.random() < 0.05 else w for w in words)
+        tweets.append({"id": str(i), "text": text, "likes": rng.choice((0, 12, 300, 2500))})
+    return tweets
+
+
+def old_classify(text: str) -> str:
+    hits = TWEET_MATCHER.tally(text)
+    if hits["bullish"] > hits["bearish"]:
+        return "bullish"
+    elif hits["bearish"] > hits["bullish"]:
+        return "bearish"
+    return "neutral"
+
+
+def old_signals(tweets: list[dict]) -> list[str]:
+    signals = []
+    for tweet in tweets[:10]:
+        text = tweet.get("text", "")
+        for match in re.findall(r'\$(\d{2,3}),?(\d{3})', text):
+            signals.append(f"Price target: ${int(match[0]) * 1000 + int(match[1]):,}")
+        likes = tweet.get("likes", 0)
+        if likes > 1000:
+            signals.append(f"High engagement ({likes} likes): {old_classify(text)}")
+    return signals[:5]
+
+
+def old_path(tweets: list[dict]) -> tuple[list[str], list[str]]:
+    """Per-tweet labels, then signals from every 10-tweet read."""
+    labels = [old_classify(t["text"]) for t in tweets]
+    signals = [s for i in range(0, len(tweets), 10) for s in old_signals(tweets[i:i + 10])]
+    return labels, signals
+
+
+def new_path(tweets: list[dict]) -> tuple[list[str], list[str]]:
+    labels = classifier.classify([t["text"] for t in tweets]).labels
+    signals = [s for i in range(0, len(tweets), 10) for s in classifier.signals(tweets[i:i + 10])]
+    return labels, signals
+
+
+def best(fn, tweets, repeat: int) -> tuple[float, object]:
+    times, out = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(tweets)
+        times.append(time.perf_counter() - start)
+    return min(times), out
+
+
+classifier = SentimentAnalyzer.CLASSIFIER
+rates = {}
+for n in SIZES:
+    tweets = corpus(n)
+    repeat = 5 if n <= 10_000 else 2
+    old_s, (old_labels, old_sigs) = best(old_path, tweets, repeat)
+    new_s, (new_labels, new_sigs) = best(new_path, tweets, repeat)
+    rates[str(n)] = round(n / new_s)
+    print(f"{n:>7} tweets  old {old_s * 1000:8.1f}ms ({n / old_s:>9,.0f}/s)  "
+          f"batch {new_s * 1000:8.1f}ms ({n / new_s:>9,.0f}/s)  x{old_s / new_s:.2f}")
+    check(f"same labels and signals ({n})", old_labels == new_labels and old_sigs == new_sigs,
+          f"{sum(a != b for a, b in zip(old_labels, new_labels))} labels differ")
+
+weighted = BatchClassifier({"moon": 3.0, "pump": 1.0}, {"dump": 1.0, "crash": 1.0})
+result = weighted.classify(["moon then dump then crash", "pump dump crash", "MOON moon moon", ""])
+check("weights decide the label", result.labels == ["bullish", "bearish", "bullish", "neutral"]
+      and list(result.scores) == [1.0, -1.0, 3.0, 0.0], f"{result.labels} {list(result.scores)}")
+phrases = BatchClassifier(["all time high"], []).classify(["ALL  time\thigh!", "all time", "high"])
+check("phrases across tokens", phrases.labels == ["bullish", "neutral", "neutral"], str(phrases.labels))
+
+if len(sys.argv) > 1:
+    path = Path(sys.argv[1])
+    if path.exists():
+        baseline = json.loads(path.read_text())
+        for n, rate in rates.items():
+            if n in baseline:
+                check(f"throughput vs baseline ({n})", rate >= baseline[n] * (1 - TOLERANCE),
+                      f"{rate:,}/s vs {baseline[n]:,}/s")
+    else:
+        path.write_text(json.dumps(rates, indent=2))
+        print(f"Baseline written to {path}")
+
+finish()
@@ -0,0 +1,118 @@
+"""Benchmark fill estimates and the order slicer on synthetic books.
+
+1. DepthProfile estimates vs OrderBook.walk on a deep book (results must match).
+2. Old single-FOK path vs OrderSlicer on thin books against a fake CLOB that
+   kills FOKs it can't fill at their limit price.
+
+    python bench_fills.py
+"""
+import random
+import time
+
+from src.config import config
+from src.orderbook import OrderBook, BID
+from src.fills import DepthProfile, OrderSlicer
+from src.order_pipeline import OrderPipeline
+
+config.trading_enabled = True
+random.seed(7)
+
+# 1. Estimates: one profile answering many sizes vs a walk per size
+book = OrderBook("bench")
+asks = [(round(0.40 + i * 0.001, 3), random.uniform(5, 500)) for i in range(500)]
+bids = [(round(0.399 - i * 0.001, 3), random.uniform(5, 500)) for i in range(399)]
+book.load(bids, asks)
+sizes = [random.uniform(1, 60_000) for _ in range(20_000)]
+
+start = time.perf_counter()
+walks = [book.walk(BID, s) for s in sizes]
+walk_s = time.perf_counter() - start
+
+start = time.perf_counter()
+profile = DepthProfile.from_book(book, BID)
+estimates = [profile.estimate(s) for s in sizes]
+profile_s = time.perf_counter() - start
+
+mismatches = sum(
+    abs(w.shares - e.shares) > 1e-6 or abs(w.avg_price - e.avg_price) > 1e-9
+    or w.worst_price != e.worst_price or w.filled != e.filled
+    for w, e in zip(walks, estimates)
+)
+print(f"{len(asks)} ask levels, {len(sizes)} sizes")
+print(f"OrderBook.walk      {walk_s*1000:8.1f}ms  {len(sizes)/walk_s:>10,.0f} estimates/sec")
+print(f"DepthProfile        {profile_s*1000:8.1f}ms  {len(sizes)/profile_s:>10,.0f} estimates/sec  "
+      f"({walk_s/profile_s:.0f}x, {mismatches} mismatches)")
+
+within = profile.max_within(0.03)
+check = profile.estimate(within)
+print(f"max within 3%       ${within:,.2f} -> avg {check.avg_price:.4f} vs best {check.best_price:.3f} "
+      f"(slippage {check.slippage:.4%})")
+
+
+# 2. Slicing against a thin book
+RTT = 0.03  # seconds per CLOB round-trip
+
+
+class FakeClob:
+    """Thin ask book; makers re-quote ``refill`` shares at the touch after each fill."""
+
+    _authenticated = True
+
+    def __init__(self, levels: list[tuple[float, float]], refill: float):
+        self.asks = dict(levels)
+        self.touch = min(self.asks)
+        self.refill = refill
+        self.posts = self.rejected = 0
+        self.spent = self.shares = 0.0
+
+    def get_orderbook(self, token_id, depth=None):
+        time.sleep(RTT)
+        return {"bids": [], "asks": sorted(self.asks.items())}
+
+    def get_price(self, token_id, side="BUY"):
+        time.sleep(RTT)
+        return min(self.asks)
+
+    def sign_market_order(self, token_id, amount, side="BUY", price=None):
+        return {"amount": amount, "limit": price or 1.0}
+
+    def post_signed_order(self, signed):
+        time.sleep(RTT)
+        self.posts += 1
+        levels = [(p, s) for p, s in sorted(self.asks.items()) if p <= signed["limit"]]
+        if sum(p * s for p, s in levels) < signed["amount"] - 1e-9:
+            self.rejected += 1
+            raise RuntimeError("FOK order couldn't be fully filled")
+        remaining = signed["amount"]
+        for price, size in levels:
+            take = min(size, remaining / price)
+            self.asks[price] -= take
+            if self.asks[price] <= 1e-9:
+                del self.asks[price]
+            remaining -= take * price
+            self.spent += take * price
+            self.shares += take
+            if remaining <= 1e-9:
+                break
+        self.asks[self.touch] = self.asks.get(self.touch, 0) + self.refill
+        return {"success": True}
+
+
+def thin_book():
+    return [(0.50, 60), (0.51, 40), (0.53, 40), (0.60, 50), (0.75, 80)]
+
+
+print()
+print(f"{'order':>7} {'path':<8} {'posts':>5} {'rejected':>8} {'filled $':>9} {'avg price':>9} {'time':>7}")
+for amount in (20, 80, 200):
+    for label in ("old FOK", "slicer"):
+        clob = FakeClob(thin_book(), refill=40)
+        pipeline = OrderPipeline(clob, amounts=[])
+        start = time.perf_counter()
+        if label == "slicer":
+            OrderSlicer(clob, pipeline, max_slippage=0.03, min_child=1, max_children=4).submit("tok", amount)
+        else:
+            pipeline.submit("tok", amount)
+        elapsed = (time.perf_counter() - start) * 1000
+        avg = clob.spent / clob.shares if clob.shares else 0
+        print(f"{amount:>7} {label:<8} {clob.posts:>5} {clob.rejected:>8} {clob.spent:>9.2f} {avg:>9.4f} {elapsed:>6.0f}ms")
@@ -0,0 +1,147 @@
+"""Benchmark the local sentiment model against the lexicon classifier.
+
+Measures latency for one sentiment read (60 tweets) and throughput over
+a corpus, for the lexicon path and for the model cold (unbatched, then
+batched across workers) and warm (every text already scored). Checks
+that no text is scored twice, within a call, across calls or across a
+restart, and that a missing model falls back to the lexicons.
+
+With SENTIMENT_MODEL set to an exported model directory the real model
+runs. Without it (or without onnxruntime) a simulated model stands in:
+lexicon labels at a fixed CPU cost per batch and per text, which still
+measures the batching, worker pool and score cache around inference.
+
+    python bench_local_model.py
+    SENTIMENT_MODEL=models/distilbert-sst2-int8 python bench_local_model.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from checks_common import check, finish, temp_dir
+from src import local_model
+from src.config import config
+from src.local_model import LocalSentimentModel
+from src.news import NewsAggregator
+from src.sentiment import SentimentAnalyzer
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+TEXTS = int(os.getenv("BENCH_TEXTS", "1000"))
+READ = 60  # tweets in one sentiment read: 3 queries x 20
+# Simulated cost, roughly a small int8 transformer on one core
+BATCH_MS, TEXT_MS = 2.0, 1.0
+
+
+WORDS = (
+    "btc looking at the weekly close and funding while traders watch spot etf "
+    "flows on every major exchange today after that move lol gm"
+).split() + SentimentAnalyzer.BULLISH_KEYWORDS + SentimentAnalyzer.BEARISH_KEYWORDS
+
+
+def corpus(n: int, seed: int = 24) -> list[str]:
+    """Tweet-like texts of 8-30 words, a few of them repeated."""
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(8, 30))) for _ in range(n)]
+    return [rng.choice(texts[:i]) if i and rng.random() < 0.05 else text for i, text in enumerate(texts)]
+
+
+class SimulatedModel(LocalSentimentModel):
+    """Lexicon labels at a fixed inference cost; sleeping releases the GIL like onnxruntime."""
+
+    def _load(self):
+        self.identity = "simulated"
+        self.labels = ["bearish", "neutral", "bullish"]
+
+    def _infer(self, texts: list[str]) -> list[tuple[str, float]]:
+        time.sleep((BATCH_MS + TEXT_MS * len(texts)) / 1000)
+        return [(label, 0.9) for label in SentimentAnalyzer.CLASSIFIER.classify(texts).labels]
+
+
+def real_model_available() -> bool:
+    return bool(config.sentiment_model) and local_model._load_runtime() is not None
+
+
+def make(batch_size: int, workers: int, cache_path: Path) -> LocalSentimentModel:
+    cls = LocalSentimentModel if REAL else SimulatedModel
+    return cls(config.sentiment_model, batch_size=batch_size, workers=workers, cache_path=cache_path)
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def read_latency(classify, texts: list[str]) -> float:
+    """Median seconds for one READ-sized call."""
+    return statistics.median(
+        timed(classify, texts[i:i + READ])[0] for i in range(0, len(texts) - READ + 1, READ)
+    )
+
+
+REAL = real_model_available()
+print(f"Model: {config.sentiment_model if REAL else f'simulated ({BATCH_MS}ms/batch + {TEXT_MS}ms/text)'}")
+texts = corpus(TEXTS)
+tmp = temp_dir()
+lexicon = SentimentAnalyzer.CLASSIFIER
+
+lex_s, _ = timed(lambda: lexicon.classify(texts))
+lex_read = read_latency(lambda batch: lexicon.classify(batch), texts)
+print(f"{'lexicon':<26} {TEXTS / lex_s:>9,.0f} texts/s   read {lex_read * 1000:7.2f}ms")
+
+unbatched = make(1, 1, tmp / "unbatched.db")
+cold1_s, _ = timed(unbatched.classify, texts)
+print(f"{'model cold, batch 1':<26} {TEXTS / cold1_s:>9,.0f} texts/s")
+
+workers = max(config.sentiment_model_workers, 4)
+model = make(config.sentiment_model_batch, workers, tmp / "scores.db")
+cold_read = read_latency(make(config.sentiment_model_batch, workers, tmp / "reads.db").classify, texts[:READ * 5])
+cold_s, cold_labels = timed(model.classify, texts)
+print(f"{f'model cold, batch {model.batch_size} x{workers}':<26} {TEXTS / cold_s:>9,.0f} texts/s   "
+      f"read {cold_read * 1000:7.2f}ms   x{cold1_s / cold_s:.1f} vs batch 1")
+
+scored = model.inferences
+warm_s, warm_labels = timed(model.classify, texts)
+warm_read = read_latency(model.classify, texts)
+warm_scored = model.inferences - scored
+print(f"{'model warm (cached)':<26} {TEXTS / warm_s:>9,.0f} texts/s   read {warm_read * 1000:7.2f}ms")
+
+# A typical cycle: most of a read was seen last cycle
+overlap = texts[:READ * 4 // 5] + [f"{t} fresh" for t in texts[:READ // 5]]
+cycle_s, _ = timed(model.classify, overlap)
+print(f"{'model read, 80% seen':<26} {'':>18}   read {cycle_s * 1000:7.2f}ms")
+
+distinct = len(set(texts))
+check("each distinct text scored once", scored == distinct, f"{scored} inferences for {distinct} distinct texts")
+check("warm pass scores nothing", warm_scored == 0 and warm_labels == cold_labels, f"{warm_scored} new inferences")
+check("a cycle scores only unseen texts", model.inferences == scored + READ // 5,
+      f"{model.inferences - scored} of {len(overlap)} scored")
+twice = make(8, 2, tmp / "dupes.db")
+twice.classify(["same text"] * 50 + ["other text"])
+check("repeats in one call scored once", twice.inferences == 2, f"{twice.inferences} inferences")
+restarted = make(config.sentiment_model_batch, workers, tmp / "scores.db")
+restarted_s, restarted_labels = timed(restarted.classify, texts)
+check("scores survive a restart", restarted.inferences == 0 and restarted_labels == cold_labels,
+      f"{restarted.inferences} inferences, {restarted_s * 1000:.1f}ms")
+if not REAL:
+    check("simulated labels match lexicon", cold_labels == lexicon.classify(texts).labels, "")
+
+# A model that cannot load falls back to the lexicons, once
+saved = config.sentiment_model
+config.sentiment_model = str(tmp / "no-such-model")
+try:
+    analyzer, news = SentimentAnalyzer(), NewsAggregator()
+    labels = analyzer._classify_tweets(texts[:20])
+    headlines = news._classify_headlines(["Bitcoin surges to record", "Exchange hacked, funds lost"])
+    check("missing model falls back to lexicons", local_model.get_model() is None
+          and labels == lexicon.classify(texts[:20]).labels and headlines == ["bullish", "bearish"],
+          str(headlines))
+finally:
+    config.sentiment_model = saved
+    local_model._model_failed = False
+
+finish()
@@ -0,0 +1,106 @@
+"""Benchmark the shared KeywordMatcher against the old any(kw in text) loops."""
+import random
+import string
+import sys
+import time
+
+from src.matcher import KeywordMatcher
+from src.news import NewsAggregator
+from src.universes import CRYPTO_KEYWORDS, BTC_KEYWORDS
+from src.sentiment import SentimentAnalyzer
+
+sys.stdout.reconfigure(encoding='utf-8')
+random.seed(42)
+
+FILLER = (
+    "the market is looking at price action today and traders say that volume "
+    "will decide where we go next after the weekly close on major exchanges"
+).split()
+
+
+def timed(fn, items, repeat: int = 5) -> float:
+    """Best-of-N wall time for calling fn on every item."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, old: float, new: float, n: int):
+    print(f"{name:<28} n={n:<7} old {old*1000:8.1f}ms  new {new*1000:8.1f}ms  x{old/new:5.2f}")
+
+
+def count_hits(lexicon: list[str]):
+    """The old per-lexicon loop from _classify_tweet/_classify_headline."""
+    def count(text: str) -> int:
+        text_lower = text.lower()
+        return sum(1 for kw in lexicon if kw in text_lower)
+    return count
+
+
+def sentence(lexicon: list[str], words: int = 30, hits: int = 2) -> str:
+    parts = random.choices(FILLER, k=words) + random.choices(lexicon, k=hits)
+    random.shuffle(parts)
+    return " ".join(parts)
+
+
+# Markets: ~12k outcomes across 600 events, titles repeat per outcome
+events = [
+    (sentence(CRYPTO_KEYWORDS + FILLER, 8, 1), sentence(CRYPTO_KEYWORDS, 120, 1))
+    for _ in range(600)
+]
+outcomes = []
+for title, _ in events:
+    for _ in range(10):
+        question = sentence(BTC_KEYWORDS + FILLER, 10, 0)
+        outcomes += [(question, title), (question, title)]
+
+old_btc = ["bitcoin", "btc", "microstrategy"]
+report(
+    "btc market filter",
+    timed(lambda m: any(kw in m[0].lower() or kw in m[1].lower() for kw in old_btc), outcomes),
+    timed(lambda m, mt=KeywordMatcher(BTC_KEYWORDS): mt.search(*m), outcomes),
+    len(outcomes)
+)
+
+rows = [events[i // 20] for i in range(len(outcomes))]
+report(
+    "crypto catalog filter",
+    timed(lambda e: any(kw in (e[0] + " " + e[1]).lower() for kw in CRYPTO_KEYWORDS), rows),
+    timed(lambda e, mt=KeywordMatcher(CRYPTO_KEYWORDS): mt.search(*e), rows),
+    len(rows)
+)
+
+# Tweets and headlines: unique texts, two lexicons each
+bull, bear = SentimentAnalyzer.BULLISH_KEYWORDS, SentimentAnalyzer.BEARISH_KEYWORDS
+tweets = [sentence(bull + bear) for _ in range(20000)]
+report(
+    "tweet classification",
+    timed(lambda t, b=count_hits(bull), s=count_hits(bear): (b(t), s(t)), tweets),
+    timed(KeywordMatcher({"bullish": bull, "bearish": bear}, cache_size=0).tally, tweets),
+    len(tweets)
+)
+
+up, down = NewsAggregator.BULLISH_WORDS, NewsAggregator.BEARISH_WORDS
+headlines = [sentence(up + down, 12, 1) for _ in range(20000)]
+report(
+    "headline classification",
+    timed(lambda h, b=count_hits(up), s=count_hits(down): (b(h), s(h)), headlines),
+    timed(NewsAggregator.HEADLINE_MATCHER.tally, headlines),
+    len(headlines)
+)
+
+# Cost vs lexicon size: the old loop is O(keywords), the compiled trie is not
+vocab = ["".join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))) for _ in range(3000)]
+texts = [" ".join(random.choices(vocab, k=30)) for _ in range(10000)]
+for size in (15, 50, 150, 300):
+    lexicon = random.sample(vocab, size)
+    report(
+        f"lexicon of {size} keywords",
+        timed(count_hits(lexicon), texts),
+        timed(KeywordMatcher(lexicon, cache_size=0).findall, texts),
+        len(texts)
+    )
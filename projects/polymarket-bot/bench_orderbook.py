@@ -0,0 +1,123 @@
+"""Benchmark the streamed L2 order book against recorded or synthetic channel messages.
+
+    python bench_orderbook.py                  # synthetic feed, 10 tokens
+    python bench_orderbook.py data/book.jsonl  # replay a `main.py book --record` capture
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+
+from src.market_data import MarketDataStream, ReplayServer, websockets
+from src.orderbook import BID, ASK
+
+random.seed(42)
+
+TOKENS = [str(random.getrandbits(250)) for _ in range(10)]
+UPDATES = 200_000
+PER_MESSAGE = 5
+
+
+def synthetic_feed() -> list[dict]:
+    """A book snapshot per token, then batched price_change deltas around the touch."""
+    messages = []
+    mids = {t: random.uniform(0.1, 0.9) for t in TOKENS}
+    for token, mid in mids.items():
+        bids = [{"price": f"{mid - i / 1000:.3f}", "size": f"{random.uniform(10, 500):.2f}"} for i in range(1, 200)]
+        asks = [{"price": f"{mid + i / 1000:.3f}", "size": f"{random.uniform(10, 500):.2f}"} for i in range(1, 200)]
+        messages.append({"event_type": "book", "asset_id": token, "bids": bids, "asks": asks})
+
+    for _ in range(UPDATES // PER_MESSAGE):
+        changes = []
+        for _ in range(PER_MESSAGE):
+            token = random.choice(TOKENS)
+            side = random.choice((BID, ASK))
+            offset = int(random.expovariate(0.1)) + 1
+            price = mids[token] - offset / 1000 if side == BID else mids[token] + offset / 1000
+            # About one delta in five empties its level
+            size = 0 if random.random() < 0.2 else random.uniform(1, 500)
+            changes.append({"asset_id": token, "price": f"{price:.3f}", "side": side, "size": f"{size:.2f}"})
+        messages.append({"event_type": "price_change", "price_changes": changes})
+    return messages
+
+
+def count_updates(messages: list) -> int:
+    total = 0
+    for message in messages:
+        for event in message if isinstance(message, list) else [message]:
+            total += len(event.get("price_changes", event.get("changes", []))) or 1
+    return total
+
+
+if len(sys.argv) > 1:
+    with open(sys.argv[1]) as f:
+        raw = [line.strip() for line in f if line.strip() and line.strip() != "PONG"]
+    messages = [json.loads(line) for line in raw]
+else:
+    messages = synthetic_feed()
+    raw = [json.dumps(m) for m in messages]
+
+updates = count_updates(messages)
+tokens = sorted({e.get("asset_id") for m in messages for e in (m if isinstance(m, list) else [m]) if e.get("asset_id")})
+print(f"{len(messages)} messages, {updates} book updates, {len(tokens)} tokens")
+
+# Book maintenance alone: decoded messages straight into apply_message
+best = float("inf")
+for _ in range(3):
+    stream = MarketDataStream(tokens)
+    start = time.perf_counter()
+    for message in messages:
+        stream.apply_message(message)
+    best = min(best, time.perf_counter() - start)
+print(f"apply_message        {best*1000:8.1f}ms  {updates/best:>10,.0f} updates/sec")
+
+# JSON decode + apply, as the socket loop does per frame
+start = time.perf_counter()
+stream = MarketDataStream(tokens)
+for line in raw:
+    stream.apply_message(json.loads(line))
+elapsed = time.perf_counter() - start
+print(f"decode + apply       {elapsed*1000:8.1f}ms  {updates/elapsed:>10,.0f} updates/sec")
+
+# Queries against the resulting books
+book = stream.book(tokens[0])
+near = book.best_ask() + 0.01
+queries = 100_000
+start = time.perf_counter()
+for _ in range(queries):
+    book.best_bid()
+    book.depth_at(ASK, book.best_ask())
+    book.depth_through(ASK, near)
+    book.walk(BID, 250)
+elapsed = time.perf_counter() - start
+print(f"queries (4 per loop) {elapsed*1000:8.1f}ms  {queries/elapsed:>10,.0f} loops/sec  "
+      f"({len(book.bids.prices)}/{len(book.asks.prices)} levels)")
+
+# Depth through a price across the whole book: cumulative sizes vs summing levels
+deep = book.best_ask() + 0.5
+start = time.perf_counter()
+for _ in range(queries):
+    book.depth_through(ASK, deep)
+elapsed = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range(queries // 10):
+    sum(size for price, size in book.asks.sizes.items() if price <= deep)
+summed = (time.perf_counter() - start) * 10
+print(f"depth_through        {elapsed*1000:8.1f}ms  {queries/elapsed:>10,.0f} queries/sec  "
+      f"(x{summed / elapsed:.0f} vs summing levels)")
+
+
+# End to end over a local websocket
+async def replay() -> float:
+    async with ReplayServer(raw) as server:
+        stream = MarketDataStream(tokens, url=server.url, reconnect=False)
+        start = time.perf_counter()
+        await stream.run()
+        return time.perf_counter() - start
+
+if websockets is None:
+    print("websocket replay     skipped (pip install websockets)")
+else:
+    elapsed = asyncio.run(replay())
+    print(f"websocket replay     {elapsed*1000:8.1f}ms  {updates/elapsed:>10,.0f} updates/sec")
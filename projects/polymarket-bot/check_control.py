@@ -0,0 +1,171 @@
+"""Check the control API and the CLI's thin-client path.
+
+Serves a BotService backed by a fake trader on a temporary socket, then
+checks JSON round trips, error statuses, the owner-only socket, stale
+socket cleanup, that `main.py status` is answered by the daemon (but
+not with --no-cache, whose fresh fetches the daemon's cache would hide)
+and the token, Host and Content-Type checks on the loopback TCP
+fallback. Compares a warm API call with spawning a cold `main.py markets`-style
+trader per command.
+
+    python check_control.py
+"""
+import http.client
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+from checks_common import check, finish, temp_dir
+import src.control
+from src.config import config
+from src.market_table import MarketTable
+from src.control import ControlError, ControlServer, call, running, socket_path, token_path
+from src.service import BotService
+from src.universes import get_universe
+
+CONNECT_S = 0.8  # what a cold command pays to connect and load markets
+
+config.control_socket = str(temp_dir() / "bot.sock")
+
+MARKETS = MarketTable.from_rows([
+    {
+        "condition_id": f"c{i}", "question": f"Bitcoin above {100 + i}k?", "event_title": "BTC",
+        "end_date": "2026-12-31", "yes_token": f"{i}1111", "no_token": f"{i}2222",
+        "yes_price": 0.4, "no_price": 0.6, "volume": 1000.0 * i
+    }
+    for i in range(5)
+])
+
+
+class FakeTrader:
+    def __init__(self):
+        self.loads = 0
+        self.universe = get_universe()
+        self.polymarket = self
+
+    def get_markets(self):
+        if not self.loads:
+            time.sleep(CONNECT_S)
+        self.loads += 1
+        return MARKETS
+
+    def get_universe_markets(self, universe, refresh=True):
+        return self.get_markets()
+
+    def resolve_token(self, token_id, universe=None):
+        return token_id
+
+
+service = BotService(read_only=True)
+service._trader = FakeTrader()
+
+# A socket file left behind by a daemon that died
+stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+stale.bind(config.control_socket)
+stale.close()
+check("no daemon on a stale socket", call("GET", "/health") is None and not running(), socket_path().name)
+
+start = time.perf_counter()
+service.start()
+warm_s = time.perf_counter() - start
+server = ControlServer(service.routes())
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+mode = stat.S_IMODE(os.stat(config.control_socket).st_mode)
+check("stale socket replaced, owner-only", running() and mode == 0o600, f"mode {mode:o}")
+
+try:
+    ControlServer(service.routes())
+    check("second daemon refused", False, "bound twice")
+except ControlError as e:
+    check("second daemon refused", e.status == 409, str(e))
+
+markets = call("GET", "/markets?limit=3")
+check("markets round trip", markets["total"] == 10 and len(markets["markets"]) == 3,
+      f"{markets['total']} markets, top {markets['markets'][0]['question']}")
+
+try:
+    call("POST", "/trade", {"token_id": "01111", "amount": 5, "dry_run": False})
+    check("read-only daemon refuses trades", False, "trade accepted")
+except ControlError as e:
+    check("read-only daemon refuses trades", e.status == 403, str(e))
+
+errors = []
+for method, path, body in (("GET", "/nope", None), ("POST", "/trade", {"bogus": 1})):
+    try:
+        call(method, path, body)
+    except ControlError as e:
+        errors.append(e.status)
+check("unknown route and bad params", errors == [404, 400], f"statuses {errors}")
+
+# Warm calls vs a cold process that connects and loads markets each time
+calls = 50
+start = time.perf_counter()
+for _ in range(calls):
+    call("GET", "/markets?limit=10")
+per_call_ms = (time.perf_counter() - start) * 1000 / calls
+check("warm call beats cold start", per_call_ms * 10 < warm_s * 1000,
+      f"{per_call_ms:.1f}ms per call vs {warm_s * 1000:.0f}ms to warm up, {service._trader.loads} market loads")
+
+# The real CLI, as a thin client
+env = {**os.environ, "CONTROL_SOCKET": config.control_socket, "PYTHONPATH": os.pathsep.join(sys.path)}
+before = service.requests
+out = subprocess.run([sys.executable, "main.py", "status"], capture_output=True, text=True, env=env).stdout
+check("main.py status answered by daemon", f"PID {os.getpid()}" in out and service.requests == before + 1,
+      f"{service.requests - before} request(s)")
+before = service.requests
+out = subprocess.run([sys.executable, "main.py", "--no-cache", "status"], capture_output=True, text=True, env=env).stdout
+check("--no-cache bypasses the daemon", f"PID {os.getpid()}" not in out and service.requests == before,
+      f"{service.requests - before} request(s)")
+
+call("POST", "/shutdown")
+check("POST /shutdown stops the service", service._stop.wait(1), "")
+server.shutdown()
+server.server_close()
+check("socket removed on close", not socket_path().exists() and call("GET", "/health") is None, "")
+
+# The loopback TCP fallback (no AF_UNIX): token, Host and Content-Type
+src.control.USE_UNIX = False
+with socket.socket() as probe:
+    probe.bind(("127.0.0.1", 0))
+    config.control_port = probe.getsockname()[1]
+check("no daemon without a token file", call("GET", "/health") is None and not token_path().exists(), "")
+server = ControlServer(service.routes())
+threading.Thread(target=server.serve_forever, daemon=True).start()
+mode = stat.S_IMODE(os.stat(token_path()).st_mode)
+check("token file owner-only", mode == 0o600 and running(), f"mode {mode:o}")
+
+
+def raw(headers: dict, body: dict) -> int:
+    """POST /trade as a browser or another local user could."""
+    conn = http.client.HTTPConnection("127.0.0.1", config.control_port, timeout=5)
+    conn.request("POST", "/trade", body=json.dumps(body), headers=headers)
+    status = conn.getresponse().status
+    conn.close()
+    return status
+
+
+order = {"token_id": "01111", "amount": 5, "dry_run": False}
+auth = {"Authorization": f"Bearer {token_path().read_text()}"}
+statuses = [
+    raw({"Content-Type": "application/json"}, order),
+    raw({"Content-Type": "application/json", "Authorization": "Bearer guess"}, order),
+    raw({**auth, "Content-Type": "text/plain"}, order),
+    raw({**auth, "Content-Type": "application/json", "Host": "evil.example:8765"}, order),
+]
+check("unauthenticated requests refused", statuses == [401, 401, 415, 403], f"statuses {statuses}")
+try:
+    call("POST", "/trade", order)
+    check("token holder reaches the service", False, "trade accepted")
+except ControlError as e:
+    check("token holder reaches the service", e.status == 403 and "read-only" in str(e).lower(), str(e))
+server.shutdown()
+server.server_close()
+check("token removed on close", not token_path().exists() and call("GET", "/health") is None, "")
+
+finish()
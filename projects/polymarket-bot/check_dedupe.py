@@ -0,0 +1,129 @@
+"""Check near-duplicate suppression for tweets and headlines.
+
+Builds a synthetic stream of original tweets and bot reposts (tags,
+mentions, links, case and one-word edits added), and checks:
+- the MinHash estimates track true similarity;
+- reposts are collapsed and originals are kept;
+- lookups stay flat as the index grows;
+- memory stays within capacity.
+Then runs the sentiment and news paths with copypasta and syndicated
+headlines. Offline; temporary stores only.
+
+    python check_dedupe.py
+"""
+import random
+import time
+
+from checks_common import check, finish, temp_dir
+from src.dedupe import NearDuplicateIndex, normalize
+from src.news import NewsAggregator, NewsItem
+from src.sentiment import SentimentAnalyzer
+from src.tweet_store import TweetStore
+
+rng = random.Random(23)
+VOCAB = [
+    "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 8))) for _ in range(2000)
+] + SentimentAnalyzer.BULLISH_KEYWORDS + SentimentAnalyzer.BEARISH_KEYWORDS
+TAGS = ["🚀🚀", "@whale_alert", "#BTC", "https://t.co/x1y2z3", "follow me", "RT"]
+
+
+def original() -> str:
+    return " ".join(rng.choices(VOCAB, k=rng.randint(10, 25)))
+
+
+def repost(text: str) -> str:
+    words = text.split()
+    edit = rng.random()
+    if edit < 0.3:
+        words.append(rng.choice(TAGS))
+    elif edit < 0.5:
+        words.insert(0, f"@bot{rng.randint(0, 999)}")
+    elif edit < 0.7:
+        words = [w.upper() if rng.random() < 0.3 else w for w in words]
+    elif edit < 0.85:
+        words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    else:
+        words += [rng.choice(TAGS), f"https://t.co/{rng.randint(0, 10**6)}"]
+    return " ".join(words)
+
+
+def jaccard(a: str, b: str, n: int = 5) -> float:
+    grams = [{t[i:i + n] for i in range(max(len(t) - n + 1, 1))} for t in (normalize(a), normalize(b))]
+    return len(grams[0] & grams[1]) / len(grams[0] | grams[1])
+
+
+index = NearDuplicateIndex(threshold=0.7, capacity=50_000)
+
+# Estimates against true similarity, over reposts and unrelated pairs
+pairs = [(t, repost(t)) for t in (original() for _ in range(200))] + [(original(), original()) for _ in range(200)]
+errors = [abs(index.similarity(index.signature(a), index.signature(b)) - jaccard(a, b)) for a, b in pairs]
+check("estimates track similarity", sum(errors) / len(errors) < 0.06, f"mean error {sum(errors) / len(errors):.3f}")
+
+# A stream of originals and reposts of earlier ones
+stream, originals = [], []
+for i in range(20_000):
+    if originals and rng.random() < 0.3:
+        stream.append((f"r{i}", repost(rng.choice(originals)), True))
+    else:
+        originals.append(original())
+        stream.append((f"o{i}", originals[-1], False))
+
+times, caught, false_hits = [], 0, 0
+for key, text, is_repost in stream:
+    start = time.perf_counter()
+    duplicate_of = index.add(key, text)
+    times.append(time.perf_counter() - start)
+    if duplicate_of is not None:
+        caught += is_repost
+        false_hits += not is_repost
+reposts = sum(is_repost for _, _, is_repost in stream)
+check("reposts collapsed", caught / reposts > 0.95, f"{caught}/{reposts}")
+check("originals kept", false_hits / (len(stream) - reposts) < 0.005, f"{false_hits} originals collapsed")
+
+early, late = sum(times[1000:2000]) / 1000, sum(times[-1000:]) / 1000
+check("lookup cost flat as index grows", late < 3 * early,
+      f"{early * 1e6:.0f}us at 1k items, {late * 1e6:.0f}us at {len(index):,}")
+
+bounded = NearDuplicateIndex(capacity=1000)
+for i in range(5000):
+    bounded.add(i, original())
+stats = bounded.stats()
+check("memory bounded by capacity", stats["items"] == 1000 and stats["buckets"] <= bounded.bands * 1000, str(stats))
+check("same key is not a duplicate", bounded.add(4999, "anything") is None, "")
+
+# Sentiment: copypasta with new ids is collapsed before classification
+analyzer = SentimentAnalyzer(store=TweetStore("btc", temp_dir() / "tweets.db"))
+pasta = "BTC to $150,000 by christmas, the breakout is here 🚀 load up now"
+copies = [f"{pasta} 🚀🚀", f"@bot{{}} {pasta}", pasta.upper(), f"{pasta} https://t.co/{{}}", f"RT {pasta}!!"]
+analyzer._run_bird_search = lambda query, count=20, since_id=None: [
+    {"id": f"{query}-{i}", "text": copies[i % 5].format(i) if i % 2 else f"{query} {original()}"}
+    for i in range(10)
+]
+result = analyzer.analyze_btc_sentiment()
+queries = len(analyzer.queries)
+check("copypasta collapsed in sentiment", result.new_tweets == 5 * queries + 1 and result.duplicates == 5 * queries - 1,
+      f"{result.new_tweets} stored, {result.duplicates} collapsed")
+
+# News: one story syndicated across outlets
+news = NewsAggregator()
+story = "Bitcoin surges past $120,000 as ETF inflows hit a record"
+news.fetch_crypto_news = lambda: [
+    NewsItem(story, "https://a.example/1", "Outlet A", ""),
+    NewsItem(f"{story} - Outlet B", "https://b.example/1", "Outlet B", ""),
+    NewsItem(story.upper(), "https://c.example/1", "Outlet C", ""),
+    NewsItem("SEC delays decision on ether staking ETFs", "https://a.example/2", "Outlet A", ""),
+]
+news.fetch_coindesk_headlines = lambda: [NewsItem(f"{story}!", "https://coindesk.example/1", "CoinDesk", "")]
+first = news.aggregate_news()
+again = news.aggregate_news()
+check("syndicated headlines collapsed", len(first.items) == 2 and first.duplicates == 3,
+      f"{[i.source for i in first.items]}, {first.duplicates} collapsed")
+check("same headlines next cycle still count", len(again.items) == 2 and again.bullish_headlines == first.bullish_headlines,
+      f"{len(again.items)} items")
+# The first outlet's copy drops out of the feed; the syndicated one now stands
+news.fetch_crypto_news = lambda: [NewsItem(f"{story} - Outlet B", "https://b.example/1", "Outlet B", "")]
+news.fetch_coindesk_headlines = lambda: []
+moved = news.aggregate_news()
+check("story kept when its original drops", [i.source for i in moved.items] == ["Outlet B"], f"{len(moved.items)} items")
+
+finish()
@@ -0,0 +1,124 @@
+"""Exercise the execution engine against a local fake CLOB.
+
+Checks that concurrent execution beats the old serial loop, never has two
+orders for one token in flight, keeps per-token order, and stays inside
+the CLOB rate limit.
+
+    python check_execution.py
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+
+from checks_common import check, finish
+from src.config import config
+from src.execution import ExecutionEngine
+from src.order_pipeline import OrderPipeline
+
+# The fake never touches the network; let the pipeline "post" to it
+config.trading_enabled = True
+
+PRICE_MS, SIGN_MS, POST_MS = 40, 20, 80
+
+
+class FakeClob:
+    """In-process stand-in for the PolymarketClient surface the pipeline uses.
+
+    Rejects posts beyond ``limit`` per second with a 429, and records any
+    token that has two orders in flight at once.
+    """
+
+    _authenticated = True
+
+    def __init__(self, limit: float = 50):
+        self.limit = limit
+        self.posts: deque[float] = deque()
+        self.sequence: dict[str, list[float]] = defaultdict(list)
+        self.in_flight: set[str] = set()
+        self.conflicts = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def get_price(self, token_id: str) -> float:
+        time.sleep(PRICE_MS / 1000)
+        return 0.5
+
+    def sign_market_order(self, token_id, amount, side="BUY", price=None):
+        time.sleep(SIGN_MS / 1000)
+        return {"token_id": token_id, "amount": amount}
+
+    def post_signed_order(self, signed: dict) -> dict:
+        token_id = signed["token_id"]
+        with self.lock:
+            now = time.monotonic()
+            while self.posts and now - self.posts[0] > 1.0:
+                self.posts.popleft()
+            if len(self.posts) >= self.limit:
+                self.rejected += 1
+                raise RuntimeError("429 Too Many Requests")
+            self.posts.append(now)
+            if token_id in self.in_flight:
+                self.conflicts += 1
+            self.in_flight.add(token_id)
+        time.sleep(POST_MS / 1000)
+        with self.lock:
+            self.in_flight.discard(token_id)
+            self.sequence[token_id].append(signed["amount"])
+        return {"success": True, "orderID": f"0x{len(self.posts):04x}"}
+
+
+@dataclass
+class Decision:
+    token_id: str
+    amount: float
+
+
+def submitter(clob: FakeClob):
+    pipeline = OrderPipeline(clob, amounts=[])
+    return lambda d: pipeline.submit(d.token_id, d.amount).response is not None
+
+
+# 1. Eight decisions on five tokens: serial loop vs engine
+decisions = [Decision(f"tok{i % 5}", 10 + i) for i in range(8)]
+
+clob = FakeClob()
+submit = submitter(clob)
+start = time.perf_counter()
+serial_ok = sum(submit(d) for d in decisions)
+serial_ms = (time.perf_counter() - start) * 1000
+
+clob = FakeClob()
+report = ExecutionEngine(workers=8).execute(decisions, submitter(clob))
+expected = {t: [d.amount for d in decisions if d.token_id == t] for t in {d.token_id for d in decisions}}
+
+check("all orders filled", report.executed == serial_ok == len(decisions), f"{report.executed}/{len(decisions)}")
+check("faster than serial", report.elapsed_ms < serial_ms / 2, f"{report.elapsed_ms:.0f}ms vs {serial_ms:.0f}ms serial")
+check("no concurrent orders per token", clob.conflicts == 0, f"{clob.conflicts} conflicts")
+check("per-token order kept", dict(clob.sequence) == expected, "")
+
+results = {"trades_executed": 0, "errors": []}
+report.merge_into(results)
+check("results merged into cycle dict", results["trades_executed"] == len(decisions), str(results))
+
+# 2. Thirty tokens at once against a 10/s CLOB limit. A bucket lets
+# burst + rate * window through any window, so 5 + 5/s fits 10/s
+clob = FakeClob(limit=10)
+burst = [Decision(f"tok{i}", 10) for i in range(30)]
+report = ExecutionEngine(workers=8, rate=5, burst=5).execute(burst, submitter(clob))
+check("rate limit respected", clob.rejected == 0, f"{clob.rejected} rejected by the CLOB")
+check("rate-limited batch completes", report.executed == len(burst), f"{report.executed}/{len(burst)} in {report.elapsed_ms:.0f}ms")
+
+clob = FakeClob(limit=10)
+report = ExecutionEngine(workers=8, rate=1000, burst=1000).execute(burst, submitter(clob))
+check("unlimited engine trips the fake", clob.rejected > 0, f"{clob.rejected} rejected (sanity check)")
+
+# 3. A zero rate is refused up front instead of dividing by it
+try:
+    ExecutionEngine(rate=0)
+    error = None
+except ValueError as e:
+    error = str(e)
+check("zero rate rejected", error is not None and "CLOB_ORDER_RATE" in error, str(error))
+
+finish()
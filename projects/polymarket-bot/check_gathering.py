@@ -0,0 +1,88 @@
+"""Check concurrent intelligence gathering with slow and hanging sources.
+
+Markets, each X search and each news source are replaced with sleeps, so
+no network or bird CLI is needed. The gather must take about as long as
+the slowest source that answers, and a source past its deadline must show
+up as missing instead of stalling the report.
+
+    python check_gathering.py
+"""
+import random
+import time
+
+from checks_common import check, finish, temp_dir
+from src.config import config
+from src.market_table import MarketTable
+from src.sentiment import SentimentAnalyzer
+from src.news import NewsAggregator, NewsItem
+from src.gathering import gather, run_sync
+from src.tweet_store import TweetStore
+
+MARKETS_S, SEARCH_S, NEWS_S, HANG_S = 0.30, 0.20, 0.15, 3.0
+config.gather_deadlines = "markets=1,sentiment=1,bird=0.8,news=0.8,cryptocompare=0.5,coindesk=0.5"
+
+# Distinct tweets, so none is collapsed as a near-duplicate of another
+WORDS = (
+    "funding flipped negative overnight etf inflows keep climbing miners sending coins to exchanges "
+    "weekly close above resistance asia session selling again whales bid spot shorts squeezed"
+).split()
+
+
+def tweet_text(query: str, i: int) -> str:
+    words = " ".join(random.Random(f"{query}-{i}").sample(WORDS, 10))
+    return f"{words}: breakout, bullish" if i % 2 else f"{words}: dump"
+
+
+def slow(seconds: float, value):
+    def run(*args, **kwargs):
+        time.sleep(seconds)
+        return value() if callable(value) else value
+    return run
+
+
+sentiment = SentimentAnalyzer(store=TweetStore("btc", temp_dir() / "tweets.db"))
+sentiment._run_bird_search = lambda query, count=20, since_id=None: slow(SEARCH_S, [
+    {"id": f"{query}-{i}", "text": tweet_text(query, i), "likes": 10}
+    for i in range(5)
+])()
+
+news = NewsAggregator()
+news.fetch_crypto_news = slow(NEWS_S, lambda: [NewsItem("Bitcoin rallies", "https://a", "cc", "")])
+news.fetch_coindesk_headlines = slow(HANG_S, lambda: [NewsItem("late", "https://b", "CoinDesk", "")])
+
+
+def sources():
+    return {
+        "markets": slow(MARKETS_S, MarketTable),
+        "sentiment": sentiment.analyze_btc_sentiment_async,
+        "news": news.aggregate_news_async
+    }
+
+
+# The old path: one source after another (hanging source included)
+serial_s = MARKETS_S + len(SentimentAnalyzer.QUERIES) * SEARCH_S + NEWS_S + HANG_S
+
+start = time.perf_counter()
+report = run_sync(gather(sources(), label="check"))
+elapsed = time.perf_counter() - start
+
+s, n = report.value("sentiment"), report.value("news")
+check("all top-level sources answered", not report.partial, f"missing: {report.missing}")
+check("bounded by coindesk deadline, not sum", elapsed < 0.5 + 0.2, f"{elapsed * 1000:.0f}ms vs {serial_s * 1000:.0f}ms serial")
+check("searches ran concurrently", report.results["sentiment"].elapsed_ms < 2 * SEARCH_S * 1000,
+      f"sentiment {report.results['sentiment'].elapsed_ms:.0f}ms for {len(SentimentAnalyzer.QUERIES)} searches")
+check("every search counted", s.total_tweets == 5 * len(SentimentAnalyzer.QUERIES), f"{s.total_tweets} tweets")
+check("hanging news source dropped", n.missing_sources == ["coindesk"] and len(n.items) == 1,
+      f"missing {n.missing_sources}, {len(n.items)} items kept")
+
+# A whole stage past its deadline degrades to a partial report
+config.gather_deadlines = "markets=0.1,sentiment=1,bird=0.8,news=0.8,cryptocompare=0.5,coindesk=0.5"
+start = time.perf_counter()
+report = run_sync(gather(sources(), label="check"))
+elapsed = time.perf_counter() - start
+check("slow markets reported missing", report.missing == ["markets"] and report.results["markets"].timed_out,
+      f"missing: {report.missing}")
+check("others still delivered", report.value("sentiment") is not None and report.value("news") is not None,
+      f"{elapsed * 1000:.0f}ms")
+
+finish()
@@ -0,0 +1,94 @@
+"""Check intel report versioning and deltas.
+
+Feeds a sequence of synthetic reports through IntelHistory on a temporary
+database: unchanged gathers keep their version, sub-threshold drift is
+not material on its own but adds up in ``changes_since``, and new
+headlines, closed markets and sentiment shifts are reported. Compares the
+size of the compact delta with the full report text.
+
+    python check_intel_deltas.py
+"""
+
+from checks_common import check, finish, temp_dir
+from src.intel import format_intel_for_quinn
+from src.intel_history import IntelHistory, format_changes_for_quinn
+
+TOKENS = [f"{7000 + i}{'3' * 70}" for i in range(20)]
+
+
+def report(timestamp: str, prices=None, headlines=("Bitcoin steady",), score=0.1) -> dict:
+    prices = prices or [0.5] * len(TOKENS)
+    return {
+        "timestamp": timestamp,
+        "markets": [
+            {"token_id": t, "question": f"Bitcoin above {100 + i}k by December?", "outcome": "YES",
+             "price": p, "volume": 1000.0 * (20 - i), "end_date": "2026-12-31"}
+            for i, (t, p) in enumerate(zip(TOKENS, prices))
+        ],
+        "sentiment": {"bullish_count": 3, "bearish_count": 2, "neutral_count": 5, "total_tweets": 10,
+                      "sentiment_score": score, "key_signals": []},
+        "news": {"total_articles": len(headlines), "bullish_headlines": 0, "bearish_headlines": 0,
+                 "breaking_news": [], "top_headlines": [{"title": h, "source": "cc", "url": ""} for h in headlines]},
+        "summary": {"total_crypto_markets": 40, "btc_markets": 20, "sentiment_score": score,
+                    "news_bias": 0.0, "missing_sources": []},
+        "sources": {"markets": {"elapsed_ms": 120}}
+    }
+
+
+history = IntelHistory(temp_dir() / "intel.db", keep=4)
+
+r1, stored = history.record(report("t1"))
+check("first report is v1", stored and r1["version"] == 1 and r1["changes"] is None, f"v{r1['version']}")
+
+r, stored = history.record(report("t2"))
+check("unchanged gather keeps its version", not stored and r["version"] == 1, "timestamp/timings ignored")
+
+drift = [0.51] + [0.5] * 19
+r2, stored = history.record(report("t3", drift))
+check("small drift: new version, not material", stored and r2["version"] == 2 and not r2["changes"]["material"],
+      f"v{r2['version']}, {len(r2['changes']['price_moves'])} price moves")
+
+drift = [0.52] + [0.5] * 19
+r3, _ = history.record(report("t4", drift))
+since_1 = history.changes_since(1)
+check("drift adds up across versions", not r3["changes"]["material"] and since_1.material
+      and len(since_1.price_moves) == 1, f"v2->v3 not material, v1->v3 moves {since_1.price_moves[0]['old']}->{since_1.price_moves[0]['new']}")
+
+# A market closes (dropped and absent from the open set) and a headline lands
+later = report("t5", drift, headlines=("Bitcoin steady", "ETF inflows hit record"), score=0.3)
+later["markets"] = later["markets"][1:]
+r4, _ = history.record(later, open_tokens=set(TOKENS[1:]))
+c = r4["changes"]
+check("closed market, headline, sentiment", c["material"] and c["removed_markets"][0]["closed"]
+      and [h["title"] for h in c["new_headlines"]] == ["ETF inflows hit record"] and c["sentiment_shift"] is not None,
+      f"{len(c['removed_markets'])} closed, {len(c['new_headlines'])} headline, sentiment {c['sentiment_shift']:+.2f}")
+
+full_text = format_intel_for_quinn(r4)
+delta_text = format_changes_for_quinn(history.changes_since(3).to_dict())
+check("delta is a fraction of the report", len(delta_text) * 3 < len(full_text),
+      f"{len(delta_text)} vs {len(full_text)} chars")
+
+r5, _ = history.record(report("t6", [0.9] * 20))
+check("old versions pruned", history.changes_since(1) is None and history.oldest_version() == 2,
+      f"kept v{history.oldest_version()}-v{r5['version']}")
+
+quiet = format_changes_for_quinn(history.changes_since(5).to_dict())
+check("nothing new says so", "No material changes" in quiet, quiet.splitlines()[-1])
+
+# A gather where every source missed its deadline: empty sections are
+# not changes, and an empty market set closes nothing
+empty = report("t7", headlines=())
+empty["markets"], empty["sentiment"]["sentiment_score"] = [], 0.0
+empty["summary"]["missing_sources"] = ["markets", "sentiment", "news"]
+r6, _ = history.record(empty, open_tokens=set())
+check("missing sources carried forward", not r6["changes"]["material"] and len(r6["markets"]) == 20
+      and r6["sentiment"]["sentiment_score"] == 0.1, f"{len(r6['markets'])} markets kept")
+back = history.record(report("t8", [0.9] * 20))[0]["changes"]
+check("recovered sources diff cleanly", not back["material"], f"{len(back['new_headlines'])} new headlines")
+dropped = report("t9", [0.9] * 20)
+dropped["markets"] = dropped["markets"][1:]
+c = history.record(dropped, open_tokens=set())[0]["changes"]
+check("empty open set closes nothing", not any(m["closed"] for m in c["removed_markets"]),
+      f"{len(c['removed_markets'])} removed, none closed")
+
+finish()
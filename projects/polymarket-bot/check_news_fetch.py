@@ -0,0 +1,165 @@
+"""Check conditional news fetching against a local HTTP server.
+
+Serves a JSON feed with an ETag and a text feed with only Last-Modified,
+each after a delay, and checks:
+- expired entries are re-requested with If-None-Match/If-Modified-Since;
+- a 304 keeps the stored value without parsing it again;
+- a changed feed is downloaded and parsed;
+- entries inside their TTL make no request at all;
+- inside the stale-while-revalidate window the request is still made in
+  the foreground, so a 304 is reported and counted;
+- news sources are fetched at once and report timing and outcome.
+Offline; temporary cache only.
+
+    python check_news_fetch.py
+"""
+import json
+import sqlite3
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from checks_common import check, finish, temp_dir
+from src.cache import ResponseCache, cache, conditional_get
+from src.news import NewsAggregator
+
+DELAY = 0.3
+tmp = temp_dir()
+
+
+class Feed:
+    def __init__(self, body: str, etag: bool):
+        self.body, self.etag = body, etag
+        self.modified = formatdate(time.time() - 60, usegmt=True)
+        self.requests, self.not_modified = 0, 0
+        self.conditional_headers = []
+
+    def update(self, body: str):
+        self.body = body
+        self.modified = formatdate(time.time(), usegmt=True)
+
+
+FEEDS = {
+    "/news": Feed(json.dumps({"Data": [
+        {"title": "Bitcoin surges past record", "url": "https://a.example/1", "source": "A", "body": ""},
+    ]}), etag=True),
+    "/rss": Feed("first version", etag=False),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        feed = FEEDS[self.path.split("?")[0]]
+        feed.requests += 1
+        time.sleep(DELAY)
+        etag = f'"{hash(feed.body) & 0xffffffff:x}"'
+        sent = {k: v for k, v in self.headers.items() if k.lower().startswith("if-")}
+        feed.conditional_headers.append(sent)
+        if (feed.etag and sent.get("If-None-Match") == etag) or (
+            not feed.etag and sent.get("If-Modified-Since") == feed.modified
+        ):
+            feed.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = feed.body.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if feed.etag:
+            self.send_header("ETag", etag)
+        else:
+            self.send_header("Last-Modified", feed.modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+# Everything expires at once but stays inside the stale window, where
+# plain cached sources would be served stale and refreshed behind
+cache.path, cache.stale_seconds = tmp / "cache.db", 3600
+cache.ttls = {"fresh": 3600, **dict.fromkeys(("news", "rss", "cryptocompare", "coindesk"), 0)}
+
+parses = []
+
+
+def parse_text(text: str) -> str:
+    parses.append(text)
+    return text
+
+
+news_feed, rss_feed = FEEDS["/news"], FEEDS["/rss"]
+
+first, outcome1 = conditional_get("news", f"{base}/news")
+again, outcome2 = conditional_get("news", f"{base}/news")
+check("first request fetches", outcome1 == "fetched" and news_feed.conditional_headers[0] == {}, outcome1)
+check("ETag revalidates to 304", outcome2 == "unchanged" and again == first
+      and "If-None-Match" in news_feed.conditional_headers[1], f"{outcome2}, sent {news_feed.conditional_headers[1]}")
+
+conditional_get("rss", f"{base}/rss", parse=parse_text)
+value, outcome = conditional_get("rss", f"{base}/rss", parse=parse_text)
+check("Last-Modified revalidates to 304", outcome == "unchanged" and value == "first version" and len(parses) == 1,
+      f"{outcome}, {len(parses)} parse(s)")
+rss_feed.update("second version")
+value, outcome = conditional_get("rss", f"{base}/rss", parse=parse_text)
+check("changed feed is downloaded", outcome == "fetched" and value == "second version" and len(parses) == 2, outcome)
+
+conditional_get("fresh", f"{base}/news")
+before = news_feed.requests
+value, outcome = conditional_get("fresh", f"{base}/news")
+check("entry inside TTL makes no request", outcome == "cached" and news_feed.requests == before, outcome)
+
+counts = cache.stats()
+check("304s counted per source", counts["news"]["unchanged"] == 1 and counts["rss"]["unchanged"] == 1,
+      f"news {counts['news']['unchanged']}, rss {counts['rss']['unchanged']}")
+check("stale entries revalidated up front", counts["news"]["stale"] == counts["rss"]["stale"] == 0
+      and not any(t.name.startswith("cache-refresh") for t in threading.enumerate()),
+      f"{counts['news']['stale'] + counts['rss']['stale']} served stale")
+
+# Both news sources at once, the second round answered by 304s
+news = NewsAggregator()
+news.CRYPTOCOMPARE_URL = f"{base}/news"
+
+
+def coindesk():
+    # feedparser may not be installed; the text feed stands in for the RSS
+    text, news.outcomes["coindesk"] = conditional_get("coindesk", f"{base}/rss", parse=parse_text)
+    return []
+
+
+news.fetch_coindesk_headlines = coindesk
+start = time.perf_counter()
+cycle1 = news.aggregate_news()
+elapsed = time.perf_counter() - start
+# A new aggregator, as in the next one-shot CLI command
+news = NewsAggregator()
+news.CRYPTOCOMPARE_URL = f"{base}/news"
+news.fetch_coindesk_headlines = coindesk
+cycle2 = news.aggregate_news()
+unchanged = {name: cache.stats()[name]["unchanged"] for name in ("cryptocompare", "coindesk")}
+check("sources fetched concurrently", elapsed < DELAY * 1.8, f"{elapsed * 1000:.0f}ms for two {DELAY * 1000:.0f}ms feeds")
+check("outcomes reported per source", {k: v["outcome"] for k, v in cycle1.sources.items()}
+      == {"cryptocompare": "fetched", "coindesk": "fetched"}, str({k: v["outcome"] for k, v in cycle1.sources.items()}))
+check("second cycle unchanged", all(v["outcome"] == "unchanged" for v in cycle2.sources.values())
+      and unchanged == {"cryptocompare": 1, "coindesk": 1} and len(cycle2.items) == len(cycle1.items) == 1,
+      f"{unchanged}, timings {[v['elapsed_ms'] for v in cycle2.sources.values()]}")
+
+# A cache.db from before the unchanged counter gains the column
+old = tmp / "old.db"
+with sqlite3.connect(old) as conn:
+    conn.execute("CREATE TABLE stats (source TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0, "
+                  "disk_hits INTEGER NOT NULL DEFAULT 0, stale INTEGER NOT NULL DEFAULT 0, "
+                  "misses INTEGER NOT NULL DEFAULT 0)")
+    conn.execute("INSERT INTO stats VALUES ('bird', 3, 1, 0, 2)")
+migrated = ResponseCache(old).stats()
+check("old stats table migrated", migrated["bird"]["unchanged"] == 0 and migrated["bird"]["hits"] == 3,
+      str(migrated["bird"]))
+
+server.shutdown()
+finish()
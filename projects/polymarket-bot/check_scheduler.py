@@ -0,0 +1,136 @@
+"""Check the multi-cadence scheduler against a fake trader.
+
+Stages run on sub-second cadences against sleeps, so this finishes in a few
+seconds without network, bird or an LLM. Checks that cheap stages run far
+more often than slow ones, a slow stage never overlaps itself, the first
+decision waits for a full picture, a price move brings a decision forward,
+and shutdown waits for running stages.
+
+    python check_scheduler.py
+"""
+import threading
+import time
+from datetime import datetime
+
+from checks_common import check, finish
+from src.config import config
+from src.market_table import MarketTable
+from src.sentiment import SentimentResult
+from src.news import NewsResult
+from src.scheduler import TradingScheduler
+
+SENTIMENT_S = 0.7  # slower than its 0.5s cadence, so runs must be skipped
+config.decision_min_seconds = 0.5
+config.schedule_jitter = 0.05
+
+TOKENS = [f"tok{i}" for i in range(6)]
+MARKETS = MarketTable.from_rows([
+    {
+        "condition_id": f"c{i}", "question": f"Bitcoin above {100 + i}k?", "event_title": "BTC",
+        "end_date": "", "yes_token": TOKENS[2 * i], "no_token": TOKENS[2 * i + 1],
+        "yes_price": 0.5, "no_price": 0.5, "volume": 1000.0 * i
+    }
+    for i in range(3)
+])
+
+
+class Snapshot:
+    def __init__(self, mids):
+        self.midpoints = mids
+
+
+class FakePolymarket:
+    def __init__(self):
+        self.mid = 0.50
+
+    def get_universe_markets(self, universe, refresh=True):
+        time.sleep(0.05)
+        return MARKETS
+
+    def get_snapshot(self, tokens, prices=True, midpoints=True, books=True):
+        time.sleep(0.01)
+        return Snapshot({t: self.mid for t in tokens})
+
+
+class FakeSentiment:
+    def __init__(self):
+        self.running = self.overlaps = 0
+        self.lock = threading.Lock()
+
+    def analyze_btc_sentiment(self):
+        with self.lock:
+            self.running += 1
+            self.overlaps += self.running > 1
+        time.sleep(SENTIMENT_S)
+        with self.lock:
+            self.running -= 1
+        return SentimentResult(3, 1, 1, 5, 0.4, [], datetime.now().isoformat())
+
+
+class FakeNews:
+    def aggregate_news(self):
+        time.sleep(0.05)
+        return NewsResult([], 0, 0, [], datetime.now().isoformat())
+
+
+class FakePipeline:
+    def stop(self):
+        pass
+
+
+class FakeTrader:
+    def __init__(self):
+        self.universe = None
+        self.polymarket = FakePolymarket()
+        self.sentiment = FakeSentiment()
+        self.news = FakeNews()
+        self.pipeline = FakePipeline()
+        self.token_index = None
+        self.is_running = False
+        self.decisions: list[float] = []
+
+    def decide_and_execute(self, intel):
+        self.decisions.append(time.monotonic())
+        return {"markets_found": len(intel["markets"]), "errors": []}
+
+
+trader = FakeTrader()
+# Timed decisions only every 6s: anything sooner was brought forward
+scheduler = TradingScheduler(
+    trader, decision_minutes=0.1,
+    intervals={"prices": 0.1, "markets": 1, "news": 0.5, "sentiment": 0.5}
+)
+start = time.monotonic()
+scheduler.start()
+
+time.sleep(1.5)
+first = trader.decisions[0] - start if trader.decisions else None
+before_move = len(trader.decisions)
+trader.polymarket.mid = 0.56  # a 6c move on every token
+moved_at = time.monotonic()
+time.sleep(1.2)
+after_move = [t - moved_at for t in trader.decisions[before_move:]]
+
+# Stop while a sentiment run is in flight
+while trader.sentiment.running == 0:
+    time.sleep(0.01)
+stop_start = time.monotonic()
+scheduler.shutdown()
+stop_ms = (time.monotonic() - stop_start) * 1000
+status = scheduler.status()
+
+stats = {name: s.stats for name, s in scheduler.stages.items()}
+check("cheap stage runs most often", stats["prices"].runs > 3 * stats["sentiment"].runs,
+      f"prices {stats['prices'].runs} runs, sentiment {stats['sentiment'].runs}")
+check("slow stage never overlaps itself", trader.sentiment.overlaps == 0 and stats["sentiment"].skipped > 0,
+      f"{trader.sentiment.overlaps} overlaps, {stats['sentiment'].skipped} runs skipped")
+check("first decision after full picture", first is not None and SENTIMENT_S <= first < SENTIMENT_S + 0.5,
+      f"at {first * 1000:.0f}ms" if first is not None else "never")
+check("price move brings decision forward", bool(after_move) and after_move[0] < 0.6,
+      f"{after_move[0] * 1000:.0f}ms after the move" if after_move else "no decision")
+check("no decision storm", len(trader.decisions) <= 3, f"{len(trader.decisions)} decisions in {time.monotonic() - start:.1f}s")
+check("shutdown waits for running stage", trader.sentiment.running == 0 and not status["running"],
+      f"waited {stop_ms:.0f}ms")
+check("errors", all(s.errors == 0 for s in stats.values()), "")
+
+finish()
@@ -0,0 +1,73 @@
+"""Startup budget check: fails if `main.py status`/`logs` get slow or import heavy stacks.
+
+    python check_startup.py            # default 500ms budget
+    python check_startup.py 300        # custom budget in ms
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+BUDGET_MS = float(sys.argv[1]) if len(sys.argv) > 1 else float(os.getenv("STARTUP_BUDGET_MS", "500"))
+RUNS = 5
+
+COMMANDS = [["status"], ["logs", "-n", "1"]]
+
+# None of these are needed to read config, logs or the local catalog/cache
+FORBIDDEN = [
+    "py_clob_client", "web3", "eth_account", "openai", "anthropic",
+    "requests", "aiohttp", "websockets", "feedparser", "src.trader",
+    "src.polymarket_client", "src.decision_engine", "src.intel"
+]
+
+
+def run(args: list[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "main.py", *args],
+        cwd=ROOT, capture_output=True, text=True
+    )
+
+
+def imported_modules(stderr: str) -> dict[str, int]:
+    """Module -> cumulative import time (us) from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+failed = False
+for args in COMMANDS:
+    label = " ".join(args)
+
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = run(args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            print(f"FAIL  main.py {label} exited {result.returncode}\n{result.stderr[-2000:]}")
+            sys.exit(1)
+
+    modules = imported_modules(run(args, importtime=True).stderr)
+    heavy = sorted(
+        name for name in modules
+        if any(name == f or name.startswith(f + ".") for f in FORBIDDEN)
+    )
+    top = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)
+
+    ok = best <= BUDGET_MS and not heavy
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'}  main.py {label:<10} best of {RUNS}: {best:6.0f}ms (budget {BUDGET_MS:.0f}ms)")
+    if heavy:
+        print(f"      imports heavy modules: {', '.join(heavy[:10])}")
+    print("      slowest imports: " + ", ".join(f"{n} {us / 1000:.0f}ms" for n, us in top[:5]))
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,102 @@
+"""Check the rolling tweet store and incremental sentiment reads.
+
+Windows are checked with hand-placed tweets, then SentimentAnalyzer reads
+twice from fake_bird.py (a new tweet per query every second) with
+BIRD_SINCE_ARG set: the second read must fetch and classify only the
+tweets posted in between. The store must survive a restart and forget
+tweets older than its longest window. Runs offline on a temporary
+database.
+
+    python check_tweet_store.py
+"""
+import os
+import shlex
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("FAKE_BIRD_STARTUP", "0.05")
+os.environ.setdefault("FAKE_BIRD_DELAY", "0.05")
+os.environ["FAKE_BIRD_FRESH"] = "1"
+
+from checks_common import check, finish, temp_dir
+from src.config import config
+from src.cache import ResponseCache
+from src import sentiment as sentiment_module
+from src.sentiment import SentimentAnalyzer
+from src.tweet_store import TweetStore, posted_at
+
+FAKE = str(Path(__file__).with_name("fake_bird.py"))
+WINDOWS = {"15m": 900, "1h": 3600, "4h": 14400}
+
+# Windows from hand-placed tweets
+now = time.time()
+words = {"bullish": "bullish", "bearish": "bearish", "meh": "neutral"}
+labels = lambda texts: [words[text] for text in texts]
+store = TweetStore("btc", temp_dir() / "tweets.db", windows=WINDOWS)
+store.add("q", [
+    {"id": "1", "text": "bearish", "createdAt": now - 2 * 3600},
+    {"id": "2", "text": "meh", "createdAt": now - 30 * 60},
+    {"id": "3", "text": "bullish", "createdAt": now - 5 * 60},
+    {"id": "4", "text": "bullish", "createdAt": now - 60},
+    {"id": "5", "text": "bearish", "createdAt": now - 5 * 3600},  # past every window
+], labels)
+store.advance()
+summary = store.summary()
+check("counts per window", [(w["bullish"], w["bearish"], w["neutral"]) for w in summary.values()]
+      == [(2, 0, 0), (2, 0, 1), (2, 1, 1)], str({n: w["total"] for n, w in summary.items()}))
+check("seen tweets not counted twice", not store.add("q", [{"id": "4", "text": "bullish"}], labels)
+      and summary == store.summary(), f"cursor {store.since_id('q')}")
+check("timestamps parsed", abs(posted_at({"created_at": "Sun Oct 18 12:00:00 +0000 2026"}, now * 2)
+                                - posted_at({"createdAt": "2026-10-18T12:00:00Z"}, now * 2)) < 1, "")
+
+store.advance(now + 3600)
+aged = store.summary()
+check("tweets age out incrementally", [w["total"] for w in aged.values()] == [0, 0, 4],
+      str({n: w["total"] for n, w in aged.items()}))
+store.advance(now + 5 * 3600)
+rows = store._conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+check("evicted past the longest window", rows == 0 and store.summary()["4h"]["total"] == 0, f"{rows} rows left")
+
+# Incremental reads through fake bird
+config.bird_command = f"{shlex.quote(sys.executable)} {shlex.quote(FAKE)}"
+config.bird_since_arg = "--since-id"
+sentiment_module.cache = ResponseCache(temp_dir() / "cache.db")
+sentiment_module.cache.enabled = False
+
+path = temp_dir() / "tweets.db"
+analyzer = SentimentAnalyzer(store=TweetStore("btc", path))
+fetched = []
+search = analyzer._bird_search
+
+
+async def counting_search(query, count, since_id=None):
+    tweets = await search(query, count, since_id)
+    fetched.append(len(tweets or []))
+    return tweets
+
+
+analyzer._bird_search = counting_search
+queries = len(analyzer.queries)
+
+first = analyzer.analyze_btc_sentiment()
+first_fetched = sum(fetched)
+fetched.clear()
+time.sleep(2.2)
+second = analyzer.analyze_btc_sentiment()
+
+check("first read fills the store", first.new_tweets == first_fetched == 15 * queries,
+      f"{first_fetched} fetched, {first.new_tweets} stored")
+check("second read fetches only new tweets", 0 < sum(fetched) <= 3 * queries and second.new_tweets == sum(fetched),
+      f"{sum(fetched)} fetched, {second.new_tweets} stored")
+check("window keeps both reads", second.total_tweets == first.total_tweets + second.new_tweets,
+      f"{first.total_tweets} -> {second.total_tweets} tweets, momentum {second.momentum:+.2f}")
+check("windows on the result", list(second.windows) == list(WINDOWS), str(list(second.windows)))
+
+reopened = TweetStore("btc", path)
+check("store survives a restart", reopened.summary() == analyzer.store.summary()
+      and all(reopened.since_id(q) == analyzer.store.since_id(q) for q in analyzer.queries),
+      f"cursor {reopened.since_id(analyzer.queries[0])}")
+check("universes kept apart", TweetStore("eth", path).summary()["4h"]["total"] == 0, "")
+
+finish()
@@ -0,0 +1,102 @@
+"""Check market universes and the parallel universe runner.
+
+Seeds a temporary catalog with BTC, ETH, Fed and election events, checks
+each universe picks out only its own markets, then runs all four through
+UniverseRunner with X searches, news and the LLM replaced by sleeps. The
+round should take about as long as one universe, sync the shared catalog
+once, and give each universe its own queries and prompt.
+
+    python check_universes.py
+"""
+import threading
+import time
+
+from checks_common import check, finish, temp_dir
+from src.catalog import MarketCatalog
+from src.decision_engine import DecisionEngine
+from src.polymarket_client import PolymarketClient
+from src.news import NewsItem
+from src.trader import UniverseRunner
+from src.tweet_store import TweetStore
+from src.universes import UNIVERSES, select_universes
+
+SEARCH_S, NEWS_S, LLM_S = 0.15, 0.10, 0.40
+
+EVENTS = {
+    "btc": ("Bitcoin price", "Where will BTC close?", "Bitcoin above $120k on Dec 31?"),
+    "eth": ("Ethereum price", "ETH milestones", "Will Ethereum hit $5k in 2026?"),
+    "macro": ("Fed decision in December", "FOMC meeting", "Fed rate cut in December?"),
+    "politics": ("2028 presidential election", "Who wins?", "Will a Democrat win the presidential election?"),
+}
+
+
+def event(i: int, title: str, description: str, question: str) -> dict:
+    return {
+        "id": str(i), "title": title, "description": description, "updatedAt": "2026-10-18T00:00:00Z",
+        "markets": [{
+            "conditionId": f"c{i}", "question": question, "clobTokenIds": f'["{i}1", "{i}2"]',
+            "outcomePrices": '["0.4", "0.6"]', "volume": "1000", "endDate": "2026-12-31"
+        }]
+    }
+
+
+catalog = MarketCatalog(temp_dir() / "markets.db")
+catalog.upsert_events(event(i, *spec) for i, spec in enumerate(EVENTS.values()))
+polymarket = PolymarketClient(catalog=catalog)
+syncs = []
+polymarket.sync_catalog = lambda full=False: syncs.append(threading.current_thread().name) or 0
+
+
+class FakeEngine(DecisionEngine):
+    """The universe's real prompts, with a sleep for the LLM call."""
+
+    def _setup_provider(self):
+        self.prompts = []
+
+    def analyze_markets(self, markets, sentiment, news, index=None):
+        self.prompts.append(self.system_prompt + self._build_analysis_prompt(markets, sentiment, news, index))
+        time.sleep(LLM_S)
+        return []
+
+
+picked = {
+    name: [m.question for m in polymarket.get_universe_markets(u, refresh=False)]
+    for name, u in UNIVERSES.items()
+}
+check("each universe finds only its markets", all(
+    set(picked[name]) == {EVENTS[name][2]} for name in EVENTS
+), ", ".join(f"{name} {len(q)}" for name, q in picked.items()))
+
+runner = UniverseRunner(select_universes("all"), polymarket=polymarket)
+searched = {}
+for name, trader in runner.traders.items():
+    def search(query, count=20, since_id=None, name=name):
+        searched.setdefault(name, []).append(query)
+        time.sleep(SEARCH_S)
+        return [{"id": f"{name}-{query}", "text": "bullish breakout"}]
+    trader.sentiment._run_bird_search = search
+    trader.sentiment.store = TweetStore(name, temp_dir() / "tweets.db")
+    trader.news.fetch_crypto_news = lambda: time.sleep(NEWS_S) or [NewsItem("headline", "u", "cc", "")]
+    trader.news.fetch_coindesk_headlines = lambda: []
+    trader._decision_engine = FakeEngine(trader.universe)
+
+one_universe_s = max(SEARCH_S, NEWS_S) + LLM_S
+start = time.perf_counter()
+results = runner.run_cycle()
+elapsed = time.perf_counter() - start
+
+check("universes run in parallel", elapsed < 2 * one_universe_s,
+      f"{elapsed * 1000:.0f}ms for {len(results)} universes vs {one_universe_s * 1000:.0f}ms for one")
+check("catalog synced once for all", len(syncs) == 1, f"{len(syncs)} syncs")
+check("every universe found its markets", all(r["markets_found"] == 2 and not r["errors"] for r in results.values()),
+      ", ".join(f"{n} {r['markets_found']}" for n, r in results.items()))
+check("own X searches per universe", all(
+    sorted(searched[name]) == sorted(UNIVERSES[name].queries) for name in EVENTS
+), f"eth searched {searched['eth']}")
+prompts = {name: t.decision_engine.prompts[0] for name, t in runner.traders.items()}
+check("own prompt per universe", "Bitcoin" in prompts["btc"] and "Active politics Markets" in prompts["politics"]
+      and UNIVERSES["eth"].prompt_rules[0] in prompts["eth"], prompts["macro"].splitlines()[0][:70])
+check("shared client and rate limit", len({id(t.polymarket) for t in runner.traders.values()}) == 1
+      and len({id(t.execution) for t in runner.traders.values()}) == 1, "")
+
+finish()
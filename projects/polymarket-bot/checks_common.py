@@ -0,0 +1,40 @@
+"""Shared harness for the check_*.py and bench_*.py scripts.
+
+    from checks_common import check, finish, temp_dir
+
+    check("label", ok, "detail")   # prints an ok/FAIL line, remembers failures
+    path = temp_dir() / "x.db"     # removed when the script exits
+    finish()                       # exit 1 if any check failed
+"""
+import atexit
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+
+class Checks:
+    """Prints one aligned line per check and counts the failures."""
+
+    def __init__(self):
+        self.failed = 0
+
+    def __call__(self, label: str, ok: bool, detail: str = ""):
+        self.failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'}  {label:<38} {detail}")
+
+
+check = Checks()
+
+
+def finish():
+    """Exit 1 if any check failed, else 0."""
+    sys.exit(1 if check.failed else 0)
+
+
+def temp_dir() -> Path:
+    """A fresh temporary directory, deleted (with its contents) at exit."""
+    path = Path(tempfile.mkdtemp(prefix="polymarket-check-"))
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    return path
+
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Offline stand-in for the bird CLI, for benchmarks and checks.
+
+    python fake_bird.py search QUERY --count N --json [--since-id ID]
+    python fake_bird.py worker      # JSON-lines worker (BIRD_WORKER_ARGS=worker)
+
+Point the bot at it with BIRD_COMMAND="python fake_bird.py". Timing is
+set by environment variables:
+
+    FAKE_BIRD_STARTUP  seconds of process start-up cost (default 0.3)
+    FAKE_BIRD_DELAY    seconds per search (default 0.2)
+    FAKE_BIRD_HANG     comma-separated queries that never answer
+    FAKE_BIRD_FRESH    seconds between new tweets per query; 0 (default)
+                       returns the same tweets every time
+    FAKE_BIRD_REPOSTS  share of tweets that are bot reposts of the one
+                       before, with a new id and a tag added (default 0)
+
+Tweet ids are integers that grow with time, like X's, so BIRD_SINCE_ARG
+can be pointed at ``--since-id``.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from typing import Optional
+
+STARTUP_S = float(os.getenv("FAKE_BIRD_STARTUP", "0.3"))
+DELAY_S = float(os.getenv("FAKE_BIRD_DELAY", "0.2"))
+HANG = {q for q in os.getenv("FAKE_BIRD_HANG", "").split(",") if q}
+FRESH_S = float(os.getenv("FAKE_BIRD_FRESH", "0"))
+REPOSTS = float(os.getenv("FAKE_BIRD_REPOSTS", "0"))
+
+WORDS = ["bullish", "breakout", "dump", "moon", "crash", "steady", "rally", "red"]
+FILLER = (
+    "funding open interest spot etf flows weekly close daily candle support resistance "
+    "liquidity whales miners halving hashrate leverage shorts longs squeeze chart volume "
+    "range wick retest macro fed cpi dollar yields gold stocks nasdaq asia london session "
+    "orderbook bid ask spread basis perp futures options expiry gamma vol realized implied"
+).split()
+TAGS = ["🚀", "🔥", "@cryptobot", "#crypto", "👀", "follow for more"]
+
+
+def text(query: str, n: int) -> str:
+    """A tweet unlike its neighbours, or with FAKE_BIRD_REPOSTS a repost of one."""
+    rng = random.Random(f"{query}-{n}")
+    if n > 1 and rng.random() < REPOSTS:
+        return f"{text(query, n - 1)} {rng.choice(TAGS)}"
+    words = " ".join(rng.sample(FILLER, 8))
+    return f"{query} looking {WORDS[n % len(WORDS)]} at $10{n % 10},000: {words}"
+
+
+def tweets(query: str, count: int, since_id: Optional[str] = None) -> list[dict]:
+    """Newest first: tweet n of a query has id n * 10**9 + a per-query tag."""
+    if query in HANG:
+        time.sleep(3600)
+    time.sleep(DELAY_S)
+    latest = int(time.time() / FRESH_S) if FRESH_S else count
+    tag = zlib.crc32(query.encode()) % 10**9
+    found = []
+    for n in range(latest, max(latest - count, 0), -1):
+        tweet_id = n * 10**9 + tag
+        if since_id and tweet_id <= int(since_id):
+            break
+        found.append({
+            "id": str(tweet_id),
+            "text": text(query, n),
+            "likes": (n % count) * 150
+        })
+    return found
+
+
+def worker():
+    lock = threading.Lock()
+
+    def answer(request: dict):
+        found = tweets(request["query"], int(request.get("count", 20)), request.get("since_id"))
+        reply = {"id": request["id"], "tweets": found}
+        with lock:
+            sys.stdout.write(json.dumps(reply) + "\n")
+            sys.stdout.flush()
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        threading.Thread(target=answer, args=(request,), daemon=True).start()
+
+
+def main(argv: list[str]) -> int:
+    time.sleep(STARTUP_S)
+    if argv[:1] == ["worker"]:
+        worker()
+        return 0
+    if argv[:1] != ["search"] or len(argv) < 2:
+        print("usage: fake_bird.py search QUERY --count N --json | worker", file=sys.stderr)
+        return 2
+    count = int(argv[argv.index("--count") + 1]) if "--count" in argv else 20
+    since_id = argv[argv.index("--since-id") + 1] if "--since-id" in argv else None
+    print(json.dumps(tweets(argv[1], count, since_id)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -9,37 +9,88 @@ Automated trading on Polymarket prediction markets using:
 
 Usage:
     python main.py intel        # Gather intel report for Quinn
+    python main.py intel --since 12  # Only what changed since v12
+    python main.py run          # Run one trading cycle (per universe)
+    python main.py daemon       # Run continuously
+    python main.py serve        # Warm daemon; other commands talk to it
     python main.py markets      # List crypto markets
+    python main.py book         # Stream live order books
     python main.py trade        # Execute a trade (Quinn's decision)
     python main.py status       # Show bot status
     python main.py logs         # Show recent logs
 """
 
+from datetime import datetime
+
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 
-from src.trader import PolymarketTrader
-from src.config import config
-from src.logger import get_recent_logs, summarize_trades
-from src.intel import gather_intel, get_latest_intel, format_intel_for_quinn
+# Only the response cache (for --no-cache) loads here. The trader, intel
+# and market-data stacks (py_clob_client/web3, LLM SDKs, HTTP clients) are
+# imported inside the commands that use them so `status` and `logs` start
+# fast; check_startup.py guards this.
+from src.cache import cache
 
 app = typer.Typer(help="Polymarket BTC Trading Bot")
 console = Console()
 
+# Commands go to a running `serve` daemon unless --no-daemon or
+# --no-cache (the daemon answers from its own warm cache)
+use_daemon = True
+
+
+@app.callback()
+def main(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Refetch Gamma, news and X instead of using cached results (runs in-process)"),
+    no_daemon: bool = typer.Option(False, "--no-daemon", help="Run in this process even if a daemon is serving"),
+):
+    """Polymarket BTC Trading Bot"""
+    global use_daemon
+    cache.enabled = not no_cache
+    use_daemon = not (no_daemon or no_cache)
+
+
+def call(method: str, path: str, local, body: dict = None):
+    """Ask the daemon when one is running, otherwise run ``local()`` here.
+    
+    Both return the same JSON-shaped dict, so commands render one way.
+    """
+    from src.control import ControlError, call as daemon_call
+    
+    try:
+        result = daemon_call(method, path, body) if use_daemon else None
+        return local() if result is None else result
+    except (ControlError, ValueError) as e:
+        rprint(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+
+def service(read_only: bool = True):
+    from src.service import BotService
+    return BotService(read_only=read_only)
+
 
 @app.command()
-def intel():
+def intel(
+    since: int = typer.Option(None, "--since", help="Only show what changed since this report version"),
+    universe: str = typer.Option(None, "--universe", "-u", help="Market universe (btc, eth, macro, politics)"),
+):
     """Gather intelligence report for Quinn to analyze."""
+    from pathlib import Path
+    from src.universes import get_universe
+    
     rprint("[bold]Gathering Polymarket intelligence...[/bold]\n")
     
+    body = {"since": since, "universe": universe}
     try:
-        from dataclasses import asdict
-        report = gather_intel()
-        formatted = format_intel_for_quinn(asdict(report))
-        print(formatted)
-        rprint("\n[green]Report saved to data/latest_intel.json[/green]")
+        data = call("POST", "/intel", lambda: service().intel(since, universe), body)
+        print(data["text"])
+        latest = get_universe(universe).data_path(Path("data"), "latest_intel.json")
+        rprint(f"\n[green]Report v{data['report']['version']} in {latest}[/green]")
+    except typer.Exit:
+        raise
     except Exception as e:
         rprint(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
@@ -51,80 +102,250 @@ def trade(
     amount: float = typer.Argument(..., help="Amount in USD"),
     side: str = typer.Option("BUY", "--side", "-s", help="BUY or SELL"),
     dry_run: bool = typer.Option(True, "--dry-run/--execute", help="Simulate or execute"),
+    universe: str = typer.Option(None, "--universe", "-u", help="Universe whose intel report the token id is from"),
 ):
     """Execute a trade (called by Quinn after analysis)."""
-    trader = PolymarketTrader()
-    
-    if dry_run:
-        rprint(f"[yellow]DRY RUN: Would {side} ${amount} of {token_id[:20]}...[/yellow]")
-        return
+    # Short token ids from intel reports are accepted and expanded
+    body = {"token_id": token_id, "amount": amount, "side": side, "dry_run": dry_run, "universe": universe}
+    data = call("POST", "/trade", lambda: service(read_only=dry_run).trade(**body), body)
     
-    if not trader.initialize(read_only=False):
-        rprint("[red]Failed to initialize. Check wallet credentials.[/red]")
-        raise typer.Exit(1)
-    
-    result = trader.polymarket.place_market_order(token_id, amount, side)
-    if result:
-        rprint(f"[green]Trade executed: {result}[/green]")
+    if data["dry_run"]:
+        rprint(f"[yellow]DRY RUN: Would {side} ${amount} of {data['token_id'][:20]}...[/yellow]")
     else:
-        rprint("[red]Trade failed[/red]")
-        raise typer.Exit(1)
+        rprint(f"[green]Trade executed: {data['result']}[/green]")
 
 
 @app.command()
-def markets():
-    """List active BTC prediction markets."""
-    trader = PolymarketTrader()
-    
-    # Read-only connection
-    if not trader.initialize(read_only=True):
-        rprint("[red]Failed to connect to Polymarket.[/red]")
-        raise typer.Exit(1)
+def markets(
+    refresh: bool = typer.Option(False, "--refresh", help="Force a catalog sync first"),
+    by_spread: bool = typer.Option(False, "--by-spread", help="Rank by live bid/ask spread"),
+    universe: str = typer.Option("btc", "--universe", "-u", help="Market universe (btc, eth, macro, politics)"),
+):
+    """List active prediction markets of a universe (BTC by default)."""
+    from src.universes import get_universe
     
-    btc_markets = trader.get_markets()
+    data = call(
+        "GET", f"/markets?refresh={refresh}&by_spread={by_spread}&universe={universe}",
+        lambda: service().markets(refresh, by_spread, universe=universe)
+    )
+    label = get_universe(universe).label
     
-    if not btc_markets:
-        rprint("[yellow]No BTC markets found.[/yellow]")
+    if not data["markets"]:
+        rprint(f"[yellow]No {label} markets found.[/yellow]")
         return
     
-    table = Table(title="BTC Prediction Markets")
+    table = Table(title=f"{label} Prediction Markets")
     table.add_column("Question", style="cyan", max_width=50)
     table.add_column("Outcome", style="green")
     table.add_column("Price", justify="right")
     table.add_column("Volume", justify="right")
     table.add_column("Ends", style="dim")
     
-    for m in btc_markets[:10]:
+    if by_spread:
+        table.add_column("Bid", justify="right")
+        table.add_column("Ask", justify="right")
+        table.add_column("Spread", justify="right")
+    
+    for m in data["markets"]:
+        cells = [
+            m["question"][:50] + ("..." if len(m["question"]) > 50 else ""),
+            m["outcome"],
+            f"${m['price']:.2f}",
+            f"${m['volume']:,.0f}",
+            m["end_date"][:10] if m["end_date"] else "N/A"
+        ]
+        if by_spread:
+            cells += [
+                f"{m[k]:.3f}" if m[k] is not None else "-"
+                for k in ("bid", "ask", "spread")
+            ]
+        table.add_row(*cells)
+    
+    console.print(table)
+
+
+@app.command()
+def book(
+    seconds: float = typer.Option(15, "--seconds", help="How long to stream"),
+    top: int = typer.Option(5, "--top", help="Stream the top N BTC outcomes by volume"),
+    record: str = typer.Option(None, "--record", help="Append raw channel messages to this JSONL file"),
+):
+    """Stream full L2 books for top BTC markets from the CLOB websocket."""
+    import asyncio
+    from src.market_data import MarketDataStream
+    from src.trader import PolymarketTrader
+
+    trader = PolymarketTrader()
+    if not trader.initialize(read_only=True):
+        rprint("[red]Failed to connect to Polymarket.[/red]")
+        raise typer.Exit(1)
+
+    btc_markets = trader.get_markets().sort_by_volume()[:top]
+    if not btc_markets:
+        rprint("[yellow]No BTC markets found.[/yellow]")
+        return
+
+    stream = MarketDataStream(btc_markets.column("token_id"), record_path=record)
+    rprint(f"[bold]Streaming {len(btc_markets)} books for {seconds:.0f}s...[/bold]\n")
+    try:
+        asyncio.run(stream.run(max_seconds=seconds))
+    except RuntimeError as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    table = Table(title=f"Live Books ({stream.messages} messages)")
+    table.add_column("Question", style="cyan", max_width=40)
+    table.add_column("Outcome", style="green")
+    table.add_column("Bid", justify="right")
+    table.add_column("Ask", justify="right")
+    table.add_column("Levels", justify="right")
+    table.add_column("Updates", justify="right")
+
+    for m in btc_markets:
+        ob = stream.book(m.token_id)
+        bid, ask = ob.best_bid(), ob.best_ask()
         table.add_row(
-            m.question[:50] + ("..." if len(m.question) > 50 else ""),
+            m.question[:40],
             m.outcome,
-            f"${m.price:.2f}",
-            f"${m.volume:,.0f}",
-            m.end_date[:10] if m.end_date else "N/A"
+            f"{bid:.3f}" if bid is not None else "-",
+            f"{ask:.3f}" if ask is not None else "-",
+            f"{len(ob.bids.prices)}/{len(ob.asks.prices)}",
+            str(ob.updates)
         )
-    
+
     console.print(table)
 
 
+@app.command()
+def run(
+    read_only: bool = typer.Option(False, "--read-only", help="Connect without trading credentials"),
+    universe: str = typer.Option(None, "--universe", "-u", help="Universes to scan, comma-separated or 'all' (default UNIVERSES)"),
+):
+    """Run one trading cycle per universe, universes in parallel."""
+    from src.universes import select_universes
+    from src.trader import UniverseRunner
+    
+    try:
+        universes = select_universes(universe)
+    except ValueError as e:
+        rprint(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    runner = UniverseRunner(universes)
+    if not runner.initialize(read_only=read_only):
+        rprint("[red]Failed to initialize. Check wallet credentials.[/red]")
+        raise typer.Exit(1)
+    
+    for name, results in runner.run_cycle().items():
+        rprint(
+            f"[bold]{name} cycle complete:[/bold] {results['markets_found']} markets, "
+            f"{results['decisions_made']} decisions, {results['trades_executed']} executed, "
+            f"{results['trades_failed']} failed"
+        )
+        for error in results["errors"]:
+            rprint(f"  [red]{error}[/red]")
+
+
+@app.command()
+def daemon(
+    read_only: bool = typer.Option(False, "--read-only", help="Connect without trading credentials"),
+    interval: float = typer.Option(None, "--interval", help="Minutes between timed decisions (default CHECK_INTERVAL_MINUTES)"),
+    universe: str = typer.Option("btc", "--universe", "-u", help="Market universe to trade"),
+):
+    """Run continuously: each stage on its own cadence until Ctrl-C."""
+    from src.universes import get_universe
+    from src.trader import PolymarketTrader
+    
+    try:
+        trader = PolymarketTrader(get_universe(universe))
+    except ValueError as e:
+        rprint(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    if not trader.initialize(read_only=read_only):
+        rprint("[red]Failed to initialize. Check wallet credentials.[/red]")
+        raise typer.Exit(1)
+    
+    rprint("[bold]Running continuously - Ctrl-C to stop[/bold]")
+    trader.run_continuous(interval)
+    rprint("[green]Stopped.[/green]")
+
+
+@app.command()
+def serve(
+    read_only: bool = typer.Option(False, "--read-only", help="Connect without trading credentials"),
+    schedule: bool = typer.Option(False, "--schedule", help="Also run the continuous trading stages"),
+):
+    """Keep connections, markets and caches warm and answer CLI commands over a local socket."""
+    from src.control import ControlError
+    from src.service import BotService
+    
+    rprint("[bold]Serving - Ctrl-C to stop[/bold]")
+    try:
+        BotService(read_only=read_only, schedule=schedule).serve()
+    except ControlError as e:
+        rprint(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    rprint("[green]Stopped.[/green]")
+
+
 @app.command()
 def status():
     """Show bot status and trade summary."""
+    data = call("GET", "/status", lambda: service().status())
     rprint("[bold]Polymarket BTC Trading Bot Status[/bold]\n")
     
     # Config
+    cfg = data["config"]
     rprint("[bold]Configuration:[/bold]")
-    rprint(f"  Trading enabled: {config.trading_enabled}")
-    rprint(f"  Max position size: ${config.max_position_size}")
-    rprint(f"  Min confidence: {config.min_confidence}")
-    rprint(f"  Check interval: {config.check_interval_minutes} minutes")
+    rprint(f"  Trading enabled: {cfg['trading_enabled']}")
+    rprint(f"  Max position size: ${cfg['max_position_size']}")
+    rprint(f"  Min confidence: {cfg['min_confidence']}")
+    rprint(f"  Check interval: {cfg['check_interval_minutes']} minutes")
     
     # Trade summary
-    summary = summarize_trades()
+    summary = data["trades"]
     rprint("\n[bold]Trade Summary:[/bold]")
     rprint(f"  Total trades: {summary['total_trades']}")
     rprint(f"  Executed: {summary.get('executed_trades', 0)}")
     rprint(f"  Simulated: {summary.get('simulated_trades', 0)}")
     rprint(f"  Total invested: ${summary.get('total_invested', 0):.2f}")
+    
+    # Market catalog
+    catalog_stats = data["catalog"]
+    last_sync = catalog_stats["last_sync"]
+    rprint("\n[bold]Market Catalog:[/bold]")
+    rprint(f"  Open markets: {catalog_stats['open_markets']} / {catalog_stats['markets']}")
+    rprint(f"  Last sync: {datetime.fromtimestamp(float(last_sync)).isoformat()[:19] if last_sync else 'never'}")
+    
+    # Response cache
+    rprint("\n[bold]Response Cache:[/bold]")
+    cache_stats = data["cache"]
+    if not cache_stats:
+        rprint("  [dim]empty[/dim]")
+    for source, s in cache_stats.items():
+        lookups = s["hits"] + s["disk_hits"] + s["stale"] + s["misses"]
+        hit_rate = (lookups - s["misses"]) / lookups if lookups else 0
+        rprint(
+            f"  {source}: {hit_rate:.0%} hit rate ({s['hits']} memory, {s['disk_hits']} disk, "
+            f"{s['stale']} stale, {s['misses']} miss, {s['unchanged']} unchanged), "
+            f"{s['entries']} entries, {s['bytes'] / 1024:.0f} KiB"
+        )
+    
+    # Daemon
+    daemon_info = data.get("daemon")
+    rprint("\n[bold]Daemon:[/bold]")
+    if not daemon_info:
+        rprint("  [dim]not running (python main.py serve)[/dim]")
+        return
+    mode = "read-only" if daemon_info["read_only"] else "trading"
+    rprint(f"  PID {daemon_info['pid']} ({mode}), up since {daemon_info['started'][:19]}, {daemon_info['requests']} requests")
+    scheduler = daemon_info.get("scheduler")
+    if scheduler:
+        for name, st in scheduler["stages"].items():
+            rprint(
+                f"  {name}: every {st['every_seconds']:g}s, {st['runs']} runs, {st['skipped']} skipped, "
+                f"{st['errors']} errors, last {st['last_ms']:.0f}ms"
+            )
 
 
 @app.command()
@@ -132,7 +353,7 @@ def logs(
     count: int = typer.Option(20, "--count", "-n", help="Number of log entries to show"),
 ):
     """Show recent log entries."""
-    entries = get_recent_logs(count)
+    entries = call("GET", f"/logs?count={count}", lambda: service().logs(count))["entries"]
     
     if not entries:
         rprint("[yellow]No log entries found.[/yellow]")
@@ -167,6 +388,9 @@ def sentiment():
     rprint(f"  🔴 Bearish: {result.bearish_count}")
     rprint(f"  ⚪ Neutral: {result.neutral_count}")
     rprint(f"  📊 Score: {result.sentiment_score:.2f} (-1=bearish, +1=bullish)")
+    rprint(f"  📈 Momentum: {result.momentum:+.2f} ({result.new_tweets} new tweets, {result.duplicates} reposts collapsed)")
+    for name, window in result.windows.items():
+        rprint(f"     {name:>4}: {window['score']:+.2f} over {window['total']} tweets")
     
     if result.key_signals:
         rprint("\n[bold]Key Signals:[/bold]")
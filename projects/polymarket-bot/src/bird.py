@@ -0,0 +1,173 @@
+"""bird CLI (X search) runner: one subprocess per search, or a persistent worker."""
+import asyncio
+import atexit
+import itertools
+import json
+import shlex
+import subprocess
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from .config import config
+from .logger import log_event
+
+
+def bird_command() -> list[str]:
+    """``BIRD_COMMAND`` as argv; never run through a shell."""
+    return shlex.split(config.bird_command)
+
+
+def since_args(since_id: Optional[str]) -> list[str]:
+    """``BIRD_SINCE_ARG`` and the id, when bird takes one and there is a cursor."""
+    return [config.bird_since_arg, since_id] if config.bird_since_arg and since_id else []
+
+
+async def search(query: str, count: int, timeout: float, since_id: Optional[str] = None) -> Optional[list[dict]]:
+    """One ``bird search`` subprocess; None on failure so errors are not cached.
+
+    The query is passed as a single argument, so quotes or shell syntax in
+    it are harmless. The process is killed if the search misses
+    ``timeout`` or the caller cancels it - a gather deadline - so no
+    bird outlives the read that started it.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *bird_command(), "search", query, "--count", str(count), "--json", *since_args(since_id),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+    except OSError as e:
+        log_event("sentiment", f"Bird search error: {e}", level="error")
+        return None
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        log_event("sentiment", f"Bird search timed out: {query}", level="warn")
+        return None
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        log_event("sentiment", f"Bird search failed: {stderr.decode(errors='replace').strip()}", level="warn")
+        return None
+    try:
+        return json.loads(stdout)
+    except json.JSONDecodeError:
+        log_event("sentiment", "Failed to parse bird output", level="warn")
+        return None
+
+
+class BirdWorker:
+    """A long-lived bird process answering searches, so none pays spawn cost.
+
+    Started with ``BIRD_COMMAND`` plus ``BIRD_WORKER_ARGS`` and spoken to
+    in JSON lines: ``{"id", "query", "count"}`` (plus ``"since_id"``
+    when ``BIRD_SINCE_ARG`` is set) on stdin, ``{"id",
+    "tweets"}`` or ``{"id", "error"}`` back on stdout. Requests carry ids,
+    so concurrent searches share the one process. A reader thread owns
+    stdout, which lets the worker outlive the event loop of any one read.
+    A search past its timeout is dropped (its late answer is ignored); a
+    worker that dies fails its pending searches and is restarted on the
+    next one.
+    """
+
+    def __init__(self, args: Optional[str] = None):
+        self.args = config.bird_worker_args if args is None else args
+        self._proc: Optional[subprocess.Popen] = None
+        self._pending: dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.args)
+
+    def _start(self) -> subprocess.Popen:
+        proc = subprocess.Popen(
+            bird_command() + shlex.split(self.args),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1
+        )
+        threading.Thread(target=self._read, args=(proc,), name="bird-worker", daemon=True).start()
+        log_event("sentiment", f"Started bird worker (pid {proc.pid})")
+        return proc
+
+    def _read(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            with self._lock:
+                future = self._pending.pop(reply.get("id"), None)
+            if future is not None and not future.done():
+                if "error" in reply:
+                    future.set_exception(RuntimeError(reply["error"]))
+                else:
+                    future.set_result(reply.get("tweets", []))
+        # stdout closed: the worker exited
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._proc is proc:
+                self._proc = None
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("bird worker exited"))
+
+    def submit(self, query: str, count: int, since_id: Optional[str] = None) -> Future:
+        """Send one search; the future resolves to its tweets."""
+        request = {"query": query, "count": count}
+        if since_args(since_id):
+            request["since_id"] = since_id
+        future = Future()
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = self._start()
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                self._proc.stdin.write(json.dumps({"id": request_id, **request}) + "\n")
+                self._proc.stdin.flush()
+            except OSError as e:
+                self._pending.pop(request_id, None)
+                future.set_exception(e)
+        return future
+
+    async def search(
+        self, query: str, count: int, timeout: float, since_id: Optional[str] = None
+    ) -> Optional[list[dict]]:
+        """Like ``bird.search``, through the worker."""
+        try:
+            future = self.submit(query, count, since_id)
+        except OSError as e:
+            log_event("sentiment", f"Bird worker failed to start: {e}", level="error")
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            log_event("sentiment", f"Bird search timed out: {query}", level="warn")
+            return None
+        except RuntimeError as e:
+            log_event("sentiment", f"Bird search failed: {e}", level="warn")
+            return None
+        finally:
+            with self._lock:
+                for request_id, pending in list(self._pending.items()):
+                    if pending is future:
+                        del self._pending[request_id]
+
+    def stop(self):
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.stdin.close()
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+worker = BirdWorker()
@@ -0,0 +1,391 @@
+"""Two-tier TTL cache (in-process LRU + SQLite) for upstream responses."""
+import asyncio
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from .config import config, parse_mapping
+from .transport import transport
+from .logger import log_event
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CACHE_PATH = DATA_DIR / "cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+CREATE TABLE IF NOT EXISTS stats (
+    source TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    disk_hits INTEGER NOT NULL DEFAULT 0,
+    stale INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS validators (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+# unchanged: misses answered by a 304, so the stored value was kept
+COUNTERS = ("hits", "disk_hits", "stale", "misses", "unchanged")
+
+
+class ResponseCache:
+    """TTL cache keyed by source, endpoint and params.
+
+    Lookups go memory first, then disk; a disk hit is promoted into
+    memory. Entries younger than the source's TTL are served as-is.
+    Entries past the TTL but inside ``stale_seconds`` are served
+    immediately while a background thread refetches them
+    (stale-while-revalidate). Memory holds at most ``memory_entries``
+    values and disk at most ``max_bytes``, both evicting least recently
+    used first.
+
+    Values must be JSON-serializable. A fetch returning ``None`` means
+    failure and is never cached. Hit/miss counters are kept per process
+    and added to the on-disk totals at exit, so ``status`` can show them.
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        ttls: Optional[dict[str, float]] = None,
+        stale_seconds: Optional[float] = None,
+        memory_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+        self.path = path
+        self.ttls = ttls if ttls is not None else parse_mapping(config.cache_ttls)
+        self.stale_seconds = config.cache_stale_seconds if stale_seconds is None else stale_seconds
+        self.memory_entries = memory_entries or config.cache_memory_entries
+        self.max_bytes = max_bytes or int(config.cache_max_mb * 1024 * 1024)
+        self.enabled = True
+
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counts: dict[str, dict[str, int]] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        atexit.register(self.flush_stats)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # Opened on first use so commands that never touch the cache don't create it
+        if self._conn is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._conn.executescript(SCHEMA)
+            # Stats tables from before a counter existed get its column
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(stats)")}
+            for counter in COUNTERS:
+                if counter not in columns:
+                    self._conn.execute(f"ALTER TABLE stats ADD COLUMN {counter} INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+        return self._conn
+
+    def ttl_for(self, source: str) -> float:
+        return self.ttls.get(source, config.cache_ttl)
+
+    @staticmethod
+    def make_key(source: str, parts) -> str:
+        return f"{source}:{json.dumps(parts, sort_keys=True, default=str)}"
+
+    def _count(self, source: str, counter: str):
+        with self._lock:
+            counts = self._counts.setdefault(source, dict.fromkeys(COUNTERS, 0))
+            counts[counter] += 1
+
+    def record(self, source: str, hit: bool):
+        """Count a hit or miss for a source cached elsewhere (the Gamma catalog)."""
+        self._count(source, "hits" if hit else "misses")
+
+    def stored(self, key: str) -> Any:
+        """The value stored under ``key`` whatever its age, or None."""
+        entry, _ = self._lookup(key)
+        return entry[1] if entry is not None else None
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Conditional request headers for the response stored under ``key``."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified FROM validators WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return {}
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def set_validators(self, key: str, etag: Optional[str], last_modified: Optional[str]):
+        """Remember a response's ETag/Last-Modified, or forget them if it sent neither."""
+        with self._lock:
+            if etag or last_modified:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO validators (key, etag, last_modified) VALUES (?, ?, ?)",
+                    (key, etag, last_modified)
+                )
+            else:
+                self.conn.execute("DELETE FROM validators WHERE key = ?", (key,))
+            self.conn.commit()
+
+    def _lookup(self, key: str) -> tuple[Optional[tuple[float, Any]], str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "hits"
+
+            row = self.conn.execute(
+                "SELECT stored_at, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, "misses"
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            entry = (row[0], json.loads(row[1]))
+            self._remember(key, entry)
+            return entry, "disk_hits"
+
+    def _remember(self, key: str, entry: tuple[float, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, source: str, key: str, value: Any):
+        now = time.time()
+        text = json.dumps(value)
+        with self._lock:
+            self._remember(key, (now, value))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (key, source, stored_at, accessed_at, size, value) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, now, now, len(text), text)
+            )
+            self._evict_disk()
+            self.conn.commit()
+
+    def _evict_disk(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.conn.execute("DELETE FROM validators WHERE key = ?", (key,))
+            self._memory.pop(key, None)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _revalidate(self, source: str, key: str, fetch: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = fetch()
+                if value is not None:
+                    self._store(source, key, value)
+            except Exception as e:
+                log_event("cache", f"Background refresh of {source} failed: {e}", level="warn")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # Not a daemon: a one-shot CLI command waits for the refresh on exit
+        # so the next command finds a fresh entry
+        threading.Thread(target=refresh, name=f"cache-refresh-{source}").start()
+
+    def _cached(
+        self, source: str, key: str, ttl: float, fetch: Callable[[], Any], serve_stale: bool = True
+    ) -> tuple[bool, Any]:
+        """``(True, value)`` when the cache can answer, refreshing stale entries with ``fetch``."""
+        if not self.enabled:
+            return False, None
+        entry, tier = self._lookup(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        age = time.time() - stored_at
+        if age <= ttl:
+            self._count(source, tier)
+            return True, value
+        if serve_stale and age <= ttl + self.stale_seconds:
+            self._count(source, "stale")
+            self._revalidate(source, key, fetch)
+            return True, value
+        return False, None
+
+    def get_or_fetch(
+        self,
+        source: str,
+        parts,
+        fetch: Callable[[], Any],
+        ttl: Optional[float] = None,
+        serve_stale: bool = True
+    ) -> Any:
+        """Cached value for ``(source, parts)``, calling ``fetch`` on a miss.
+
+        With the cache disabled (``--no-cache``) every call fetches, and
+        the fresh result still replaces the stored one. Without
+        ``serve_stale`` an expired entry is refetched in the foreground.
+        """
+        key = self.make_key(source, parts)
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        found, value = self._cached(source, key, ttl, fetch, serve_stale)
+        if found:
+            return value
+
+        self._count(source, "misses")
+        value = fetch()
+        if value is not None:
+            self._store(source, key, value)
+        return value
+
+    async def get_or_fetch_async(
+        self,
+        source: str,
+        parts,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """``get_or_fetch`` for a coroutine ``fetch``.
+
+        A stale entry is refreshed on the background thread in an event
+        loop of its own, since the caller's loop may be gone by then.
+        """
+        key = self.make_key(source, parts)
+        ttl = self.ttl_for(source) if ttl is None else ttl
+        found, value = self._cached(source, key, ttl, lambda: asyncio.run(fetch()))
+        if found:
+            return value
+
+        self._count(source, "misses")
+        value = await fetch()
+        if value is not None:
+            self._store(source, key, value)
+        return value
+
+    def flush_stats(self):
+        """Add this process's counters to the on-disk totals."""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            if not counts:
+                return
+            try:
+                self.conn.executemany(
+                    f"INSERT INTO stats (source, {', '.join(COUNTERS)}) VALUES (?, {', '.join('?' * len(COUNTERS))}) "
+                    "ON CONFLICT(source) DO UPDATE SET "
+                    + ", ".join(f"{c} = {c} + excluded.{c}" for c in COUNTERS),
+                    [(source, *(c[k] for k in COUNTERS)) for source, c in counts.items()]
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                log_event("cache", f"Could not save cache stats: {e}", level="warn")
+
+    def stats(self) -> dict:
+        """Lifetime hit/miss counters per source plus current entry counts."""
+        self.flush_stats()
+        with self._lock:
+            sources = {
+                row[0]: dict(zip(COUNTERS, row[1:]), entries=0, bytes=0)
+                for row in self.conn.execute(f"SELECT source, {', '.join(COUNTERS)} FROM stats")
+            }
+            for source, entries, size in self.conn.execute(
+                "SELECT source, COUNT(*), SUM(size) FROM entries GROUP BY source"
+            ):
+                stats = sources.setdefault(source, dict.fromkeys(COUNTERS, 0))
+                stats.update(entries=entries, bytes=size)
+        return dict(sorted(sources.items()))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self.conn.execute("DELETE FROM entries")
+            self.conn.execute("DELETE FROM validators")
+            self.conn.commit()
+
+
+# Process-wide cache used by every module
+cache = ResponseCache()
+
+
+def conditional_get(
+    source: str,
+    url: str,
+    params: Optional[dict] = None,
+    parse: Optional[Callable[[str], Any]] = None
+) -> tuple[Any, str]:
+    """GET through the shared transport and cache, revalidating with the origin.
+
+    Responses are cached per URL and params as usual. Once an entry has
+    expired it is re-requested with the ``If-None-Match`` and
+    ``If-Modified-Since`` validators its response carried; a 304 keeps
+    the stored value, so an unchanged resource costs no body and no
+    parse. The request is made in the foreground rather than behind a
+    stale value: a 304 costs little more, and the outcome is known. ``parse`` turns the body text into the (JSON-serializable)
+    value to store, defaulting to JSON; parsed values are keyed by the
+    parser's name too, so changing what a source stores never serves
+    entries in the old shape.
+
+    Returns ``(value, outcome)``: outcome is ``"cached"`` (answered
+    without a request), ``"unchanged"`` (304), ``"fetched"`` (200) or
+    ``"failed"``, in which case the value is None.
+    """
+    parts = (url, params) if parse is None else (url, params, parse.__name__)
+    key = cache.make_key(source, parts)
+    outcome = "cached"
+
+    def fetch():
+        nonlocal outcome
+        stored = cache.stored(key)
+        headers = cache.validators(key) if stored is not None else {}
+        resp = transport.get(url, params=params, headers=headers)
+        if resp.status_code == 304 and stored is not None:
+            outcome = "unchanged"
+            cache._count(source, "unchanged")
+            return stored
+        if resp.status_code != 200:
+            outcome = "failed"
+            log_event("cache", f"{source} returned {resp.status_code}", level="warn")
+            return None
+        value = parse(resp.text) if parse else resp.json()
+        cache.set_validators(key, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        outcome = "fetched"
+        return value
+
+    value = cache.get_or_fetch(source, parts, fetch, serve_stale=False)
+    return value, outcome
+
+
+def cached_get(source: str, url: str, params: Optional[dict] = None, as_text: bool = False) -> Any:
+    """GET through the shared transport, cached per URL and params.
+
+    Returns parsed JSON (or the body text with ``as_text``), or None if
+    the request did not return 200. Expired entries are revalidated as
+    in ``conditional_get``.
+    """
+    return conditional_get(source, url, params, parse=str if as_text else None)[0]
@@ -0,0 +1,192 @@
+"""Persistent local catalog of Gamma events and markets."""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR.mkdir(exist_ok=True)
+
+CATALOG_PATH = DATA_DIR / "markets.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS markets (
+    condition_id TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    question TEXT NOT NULL DEFAULT '',
+    yes_token TEXT NOT NULL DEFAULT '',
+    no_token TEXT NOT NULL DEFAULT '',
+    yes_price REAL NOT NULL DEFAULT 0,
+    no_price REAL NOT NULL DEFAULT 0,
+    volume REAL NOT NULL DEFAULT 0,
+    end_date TEXT NOT NULL DEFAULT '',
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_markets_event ON markets(event_id);
+CREATE INDEX IF NOT EXISTS idx_markets_yes_token ON markets(yes_token);
+CREATE INDEX IF NOT EXISTS idx_markets_no_token ON markets(no_token);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _json_list(value) -> list:
+    """Gamma encodes some list fields as JSON strings."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value) if value else []
+        except:
+            return []
+    return value or []
+
+
+def parse_gamma_market(m: dict) -> dict:
+    """Normalize one Gamma market object into catalog columns."""
+    prices = _json_list(m.get("outcomePrices", "")) or ["0", "0"]
+    token_ids = _json_list(m.get("clobTokenIds", ""))
+
+    return {
+        "condition_id": m.get("conditionId", ""),
+        "question": m.get("question", ""),
+        "yes_token": token_ids[0] if len(token_ids) > 0 else "",
+        "no_token": token_ids[1] if len(token_ids) > 1 else "",
+        "yes_price": float(prices[0]) if len(prices) > 0 else 0,
+        "no_price": float(prices[1]) if len(prices) > 1 else 0,
+        "volume": float(m.get("volume", 0) or 0),
+        "end_date": m.get("endDate", "") or "",
+        "closed": bool(m.get("closed", False)),
+    }
+
+
+class MarketCatalog:
+    """SQLite-backed store of events and markets, synced incrementally.
+
+    Markets are keyed by ``conditionId`` and indexed by both outcome token
+    ids. The catalog only stores data; ``PolymarketClient.sync_catalog``
+    decides what to fetch.
+    """
+
+    def __init__(self, path: Path = CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def get_state(self, key: str) -> Optional[str]:
+        """Read a sync bookkeeping value."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sync_state WHERE key = ?", (key,)
+            ).fetchone()
+        return row["value"] if row else None
+
+    def set_state(self, key: str, value: str):
+        """Write a sync bookkeeping value."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value)
+            )
+
+    def upsert_events(self, events: Iterable[dict], closed: bool = False) -> int:
+        """Insert or update events and their markets. Returns events written."""
+        count = 0
+        with self._lock, self._conn:
+            for event in events:
+                event_id = str(event.get("id", ""))
+                if not event_id:
+                    continue
+                event_closed = closed or bool(event.get("closed", False))
+                self._conn.execute(
+                    "INSERT INTO events (event_id, title, description, updated_at, closed) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(event_id) DO UPDATE SET title = excluded.title, "
+                    "description = excluded.description, updated_at = excluded.updated_at, "
+                    "closed = excluded.closed",
+                    (
+                        event_id,
+                        event.get("title", "") or "",
+                        event.get("description", "") or "",
+                        event.get("updatedAt", "") or "",
+                        int(event_closed),
+                    )
+                )
+                for m in event.get("markets", []):
+                    row = parse_gamma_market(m)
+                    if not row["condition_id"]:
+                        continue
+                    row["closed"] = int(row["closed"] or event_closed)
+                    self._conn.execute(
+                        "INSERT INTO markets (condition_id, event_id, question, yes_token, "
+                        "no_token, yes_price, no_price, volume, end_date, closed) "
+                        "VALUES (:condition_id, :event_id, :question, :yes_token, :no_token, "
+                        ":yes_price, :no_price, :volume, :end_date, :closed) "
+                        "ON CONFLICT(condition_id) DO UPDATE SET event_id = excluded.event_id, "
+                        "question = excluded.question, yes_token = excluded.yes_token, "
+                        "no_token = excluded.no_token, yes_price = excluded.yes_price, "
+                        "no_price = excluded.no_price, volume = excluded.volume, "
+                        "end_date = excluded.end_date, closed = excluded.closed",
+                        {**row, "event_id": event_id}
+                    )
+                count += 1
+        return count
+
+    def close_missing_events(self, open_event_ids: set[str]) -> int:
+        """After a full sync, mark every open event we didn't see as closed."""
+        with self._lock, self._conn:
+            stale = [
+                row["event_id"] for row in
+                self._conn.execute("SELECT event_id FROM events WHERE closed = 0")
+                if row["event_id"] not in open_event_ids
+            ]
+            self._conn.executemany(
+                "UPDATE events SET closed = 1 WHERE event_id = ?", [(e,) for e in stale]
+            )
+            self._conn.executemany(
+                "UPDATE markets SET closed = 1 WHERE event_id = ?", [(e,) for e in stale]
+            )
+        return len(stale)
+
+    def open_markets(self) -> list[sqlite3.Row]:
+        """All open markets joined with their event, in catalog order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT m.*, e.title AS event_title, e.description AS event_description "
+                "FROM markets m JOIN events e ON e.event_id = m.event_id "
+                "WHERE m.closed = 0 AND e.closed = 0 "
+                "ORDER BY e.rowid, m.rowid"
+            ).fetchall()
+
+    def market_for_token(self, token_id: str) -> Optional[sqlite3.Row]:
+        """Look up the market that owns an outcome token."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT m.*, e.title AS event_title FROM markets m "
+                "JOIN events e ON e.event_id = m.event_id "
+                "WHERE m.yes_token = ? OR m.no_token = ?",
+                (token_id, token_id)
+            ).fetchone()
+
+    def stats(self) -> dict:
+        """Counts for status output."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS total, SUM(closed = 0) AS open FROM markets"
+            ).fetchone()
+        return {
+            "markets": row["total"] or 0,
+            "open_markets": row["open"] or 0,
+            "last_sync": self.get_state("last_sync_at"),
+        }
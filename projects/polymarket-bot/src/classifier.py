@@ -0,0 +1,135 @@
+"""Batch tweet classification: weighted lexicons and price targets."""
+import re
+from array import array
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Union
+
+from .matcher import KeywordMatcher
+
+# "$100,000" / "$95000" price targets
+PRICE_PATTERN = re.compile(r"\$(\d{2,3}),?(\d{3})")
+
+Lexicon = Union[Iterable[str], dict[str, float]]
+
+
+def _weights(lexicon: Lexicon) -> dict[str, float]:
+    """Keyword -> weight, keywords normalized the way KeywordMatcher reports them."""
+    if not isinstance(lexicon, dict):
+        lexicon = dict.fromkeys(lexicon, 1.0)
+    return {" ".join(kw.lower().split()): weight for kw, weight in lexicon.items() if kw.strip()}
+
+
+class _TokenHits(dict):
+    """Token -> keywords in it, filled on first lookup, cleared when full."""
+
+    def __init__(self, matcher: KeywordMatcher, size: int):
+        super().__init__()
+        self.matcher = matcher
+        self.size = size
+
+    def __missing__(self, token: str) -> tuple[str, ...]:
+        if len(self) >= self.size:
+            self.clear()
+        hits = self[token] = self.matcher.findall(token)
+        return hits
+
+
+@dataclass
+class BatchResult:
+    """Per-text results of one ``classify`` call, in input order."""
+    labels: list[str]
+    scores: array  # bullish minus bearish weight
+    price_targets: list[tuple[int, ...]]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def counts(self) -> dict[str, int]:
+        counts = {"bullish": 0, "bearish": 0, "neutral": 0}
+        for label in self.labels:
+            counts[label] += 1
+        return counts
+
+
+class BatchClassifier:
+    """Label many tweets bullish/bearish/neutral, scoring tokens by lookup.
+
+    Each text is lowercased and split on whitespace once. The keywords in
+    a token are found by the lexicon regex the first time that token is
+    seen and remembered, so a batch runs the regex over its vocabulary
+    rather than over every character; tweets repeat most of their words.
+    Keywords of several words cannot sit in one token and are matched on
+    the whole text, and only when it holds their last word.
+
+    A keyword counts once per text however often it appears, and a text
+    is labelled by whichever side weighs more, so with the default weight
+    of 1 labels match ``KeywordMatcher.tally``.
+    """
+
+    def __init__(
+        self,
+        bullish: Lexicon,
+        bearish: Lexicon,
+        high_engagement: int = 1000,
+        token_cache: int = 100_000
+    ):
+        bullish, bearish = _weights(bullish), _weights(bearish)
+        self.weights = {**{kw: -w for kw, w in bearish.items()}, **bullish}
+        self.high_engagement = high_engagement
+
+        words = [kw for kw in self.weights if " " not in kw]
+        phrases = [kw for kw in self.weights if " " in kw]
+        self.word_matcher = KeywordMatcher(words, cache_size=0)
+        self.phrase_matcher = KeywordMatcher(phrases, cache_size=0) if phrases else None
+        tails = sorted({kw.rsplit(" ", 1)[1] for kw in phrases})
+        self._phrase_hint = re.compile("|".join(map(re.escape, tails))).search if tails else None
+        self._tokens = _TokenHits(self.word_matcher, token_cache)
+
+    def classify(self, texts: list[str]) -> BatchResult:
+        """Labels, scores and price targets for every text."""
+        lookup, weight = self._tokens.__getitem__, self.weights.__getitem__
+        phrase_hint, phrase_matcher = self._phrase_hint, self.phrase_matcher
+        labels, scores, prices = [], array("d"), []
+        for text in texts:
+            text = text.lower()
+            hits = set(chain.from_iterable(map(lookup, text.split())))
+            if phrase_hint and phrase_hint(text):
+                hits.update(phrase_matcher.findall(text))
+            score = sum(map(weight, hits)) if hits else 0.0
+            # Tolerance so weights like 0.1 + 0.2 against 0.3 still tie
+            labels.append("bullish" if score > 1e-9 else "bearish" if score < -1e-9 else "neutral")
+            scores.append(score)
+            prices.append(tuple(
+                int(thousands) * 1000 + int(rest) for thousands, rest in PRICE_PATTERN.findall(text)
+            ) if "$" in text else ())
+        return BatchResult(labels, scores, prices)
+
+    def label(self, text: str) -> str:
+        return self.classify([text]).labels[0]
+
+    def signals(self, tweets: list[dict], limit: int = 5) -> list[str]:
+        """Price targets and high-engagement labels from the first ten tweets.
+
+        Tweets that already carry a ``label`` (as the tweet store returns
+        them) are not classified again.
+        """
+        tweets = tweets[:10]
+        unlabelled = [
+            t.get("text", "") for t in tweets
+            if "label" not in t and t.get("likes", 0) > self.high_engagement
+        ]
+        labels = iter(self.classify(unlabelled).labels)
+        signals = []
+        for tweet in tweets:
+            text = tweet.get("text", "")
+            if "$" in text:
+                signals.extend(
+                    f"Price target: ${int(thousands) * 1000 + int(rest):,}"
+                    for thousands, rest in PRICE_PATTERN.findall(text)
+                )
+            likes = tweet.get("likes", 0)
+            if likes > self.high_engagement:
+                label = tweet["label"] if "label" in tweet else next(labels)
+                signals.append(f"High engagement ({likes} likes): {label}")
+        return signals[:limit]
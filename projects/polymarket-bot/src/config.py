@@ -6,6 +6,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def parse_mapping(spec: str) -> dict[str, float]:
+    """``"name=number,name=number"`` settings to a dict."""
+    mapping = {}
+    for part in spec.split(","):
+        name, _, value = part.strip().partition("=")
+        if name and value:
+            mapping[name.strip()] = float(value)
+    return mapping
+
+
 @dataclass
 class Config:
     """Bot configuration."""
@@ -14,7 +24,10 @@ class Config:
     private_key: str = os.getenv("POLYGON_WALLET_PRIVATE_KEY", "")
     funder_address: str = os.getenv("POLYMARKET_FUNDER_ADDRESS", "")
     clob_host: str = "https://clob.polymarket.com"
+    clob_ws_url: str = os.getenv("CLOB_WS_URL", "wss://ws-subscriptions-clob.polymarket.com/ws/market")
     chain_id: int = 137  # Polygon
+    api_creds_path: str = os.getenv("API_CREDS_PATH", "")  # default ~/.polymarket-bot/api_creds.json
+    api_creds_ttl_hours: float = float(os.getenv("API_CREDS_TTL_HOURS", "168"))
     
     # AI
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
@@ -26,15 +39,110 @@ class Config:
     min_confidence: float = float(os.getenv("MIN_CONFIDENCE", "0.7"))
     check_interval_minutes: int = int(os.getenv("CHECK_INTERVAL_MINUTES", "15"))
     
-    # Keywords for BTC markets
-    btc_keywords: list = None
+    # Pre-signed order pipeline
+    presign_tokens: int = int(os.getenv("PRESIGN_TOKENS", "6"))
+    presign_amounts: str = os.getenv("PRESIGN_AMOUNTS", "10,25")
+    presign_max_age_seconds: float = float(os.getenv("PRESIGN_MAX_AGE_SECONDS", "20"))
+    
+    # Order execution. The CLOB allows 500 orders / 10s and 3000 / 10min;
+    # burst + rate * window must stay under both (50 + 4 * 600 < 3000)
+    execution_workers: int = int(os.getenv("EXECUTION_WORKERS", "4"))
+    clob_order_rate: float = float(os.getenv("CLOB_ORDER_RATE", "4"))
+    clob_order_burst: float = float(os.getenv("CLOB_ORDER_BURST", "50"))
+    
+    # Depth-aware fills: orders are sliced to keep average price within
+    # MAX_SLIPPAGE of the touch (fraction of price); children below
+    # SLICE_MIN_ORDER USD are not sent
+    max_slippage: float = float(os.getenv("MAX_SLIPPAGE", "0.03"))
+    slice_min_order: float = float(os.getenv("SLICE_MIN_ORDER", "1.0"))
+    slice_max_children: int = int(os.getenv("SLICE_MAX_CHILDREN", "4"))
+    
+    # Gamma event crawler
+    gamma_page_size: int = int(os.getenv("GAMMA_PAGE_SIZE", "100"))
+    gamma_workers: int = int(os.getenv("GAMMA_WORKERS", "4"))
+    gamma_max_pages: int = int(os.getenv("GAMMA_MAX_PAGES", "50"))
+    
+    # CLOB batch requests
+    clob_batch_size: int = int(os.getenv("CLOB_BATCH_SIZE", "100"))
+    clob_workers: int = int(os.getenv("CLOB_WORKERS", "4"))
+    
+    # Shared HTTP transport
+    http_pool_size: int = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    http_retries: int = int(os.getenv("HTTP_RETRIES", "3"))
+    http_backoff: float = float(os.getenv("HTTP_BACKOFF", "0.5"))
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", "10"))
+    http_timeouts: str = os.getenv("HTTP_TIMEOUTS", "gamma-api.polymarket.com=15")
+    
+    # Response cache (TTLs in seconds)
+    cache_ttl: float = float(os.getenv("CACHE_TTL", "60"))
+    cache_ttls: str = os.getenv("CACHE_TTLS", "cryptocompare=120,coindesk=300,bird=90")
+    cache_stale_seconds: float = float(os.getenv("CACHE_STALE_SECONDS", "300"))
+    cache_memory_entries: int = int(os.getenv("CACHE_MEMORY_ENTRIES", "256"))
+    cache_max_mb: float = float(os.getenv("CACHE_MAX_MB", "50"))
+    
+    # Intelligence gathering: per-source deadlines in seconds. A source
+    # that misses its deadline is reported missing; the cycle goes on.
+    # Keep each stage (sentiment, news) above the deadlines of its parts
+    gather_deadline: float = float(os.getenv("GATHER_DEADLINE", "30"))
+    gather_deadlines: str = os.getenv(
+        "GATHER_DEADLINES", "markets=30,sentiment=25,bird=20,news=15,cryptocompare=10,coindesk=10"
+    )
+    
+    # bird CLI for X searches (split like a shell would, never run by
+    # one). With worker args set, one long-lived bird answers every
+    # search over JSON lines instead of a process per search. With a
+    # since arg set, searches ask only for tweets after the query's cursor
+    bird_command: str = os.getenv("BIRD_COMMAND", "bird")
+    bird_worker_args: str = os.getenv("BIRD_WORKER_ARGS", "")
+    bird_since_arg: str = os.getenv("BIRD_SINCE_ARG", "")
+    
+    # Rolling tweet store: window name=seconds (the longest is how long
+    # tweets are kept), and the window the headline sentiment score uses
+    sentiment_windows: str = os.getenv("SENTIMENT_WINDOWS", "15m=900,1h=3600,4h=14400")
+    sentiment_window: str = os.getenv("SENTIMENT_WINDOW", "1h")
+    
+    # Near-duplicate suppression for tweets and headlines: estimated
+    # similarity that makes a repost, and texts remembered per index
+    dedupe_threshold: float = float(os.getenv("DEDUPE_THRESHOLD", "0.7"))
+    dedupe_capacity: int = int(os.getenv("DEDUPE_CAPACITY", "5000"))
+    
+    # Optional local sentiment model: a directory with a quantized ONNX
+    # text classifier (model.onnx, tokenizer.json, config.json). Empty
+    # keeps the keyword lexicons. Texts per batch, batches run at once,
+    # confidence below which a label counts as neutral, scores in memory
+    sentiment_model: str = os.getenv("SENTIMENT_MODEL", "")
+    sentiment_model_batch: int = int(os.getenv("SENTIMENT_MODEL_BATCH", "32"))
+    sentiment_model_workers: int = int(os.getenv("SENTIMENT_MODEL_WORKERS", "2"))
+    sentiment_model_min_confidence: float = float(os.getenv("SENTIMENT_MODEL_MIN_CONFIDENCE", "0.6"))
+    sentiment_model_cache: int = int(os.getenv("SENTIMENT_MODEL_CACHE", "50000"))
+    
+    # Intel report versions: moves below these are not material
+    intel_price_move: float = float(os.getenv("INTEL_PRICE_MOVE", "0.02"))
+    intel_sentiment_move: float = float(os.getenv("INTEL_SENTIMENT_MOVE", "0.1"))
+    intel_history: int = int(os.getenv("INTEL_HISTORY", "200"))
+    
+    # Continuous mode: seconds between stage runs, random jitter as a
+    # fraction of each interval, and what brings a decision forward
+    schedule_intervals: str = os.getenv("SCHEDULE_INTERVALS", "markets=60,prices=5,news=60,sentiment=180")
+    schedule_jitter: float = float(os.getenv("SCHEDULE_JITTER", "0.1"))
+    decision_min_seconds: float = float(os.getenv("DECISION_MIN_SECONDS", "60"))
+    price_move_trigger: float = float(os.getenv("PRICE_MOVE_TRIGGER", "0.03"))
+    sentiment_move_trigger: float = float(os.getenv("SENTIMENT_MOVE_TRIGGER", "0.25"))
+    
+    # Control API for `main.py serve`: a Unix socket (default
+    # data/bot.sock), or this loopback port where there are none
+    control_socket: str = os.getenv("CONTROL_SOCKET", "")
+    control_port: int = int(os.getenv("CONTROL_PORT", "8765"))
+    control_timeout: float = float(os.getenv("CONTROL_TIMEOUT", "120"))
+    
+    # Local market catalog
+    catalog_sync_seconds: int = int(os.getenv("CATALOG_SYNC_SECONDS", "60"))
+    catalog_full_sync_hours: int = int(os.getenv("CATALOG_FULL_SYNC_HOURS", "24"))
     
-    def __post_init__(self):
-        self.btc_keywords = [
-            "bitcoin", "btc", "btc price", "bitcoin price",
-            "btc $", "bitcoin $", "btc above", "btc below",
-            "bitcoin above", "bitcoin below"
-        ]
+    # Market universes (see universes.py) scanned by `run`, comma-separated
+    # or "all", and how many are worked on at once
+    universes: str = os.getenv("UNIVERSES", "btc")
+    universe_workers: int = int(os.getenv("UNIVERSE_WORKERS", "4"))
     
     def validate(self) -> list[str]:
         """Validate required config. Returns list of errors."""
@@ -0,0 +1,237 @@
+"""Local control API: JSON over HTTP on a Unix socket (TCP loopback elsewhere).
+
+Stdlib only, so CLI commands can check for a running daemon without
+loading the trading stack.
+"""
+import hmac
+import http.client
+import json
+import os
+import secrets
+import socket
+import stat
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .config import config
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+SOCKET_PATH = DATA_DIR / "bot.sock"
+
+USE_UNIX = hasattr(socket, "AF_UNIX")
+
+
+class ControlError(Exception):
+    """A request the daemon answered with an error."""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def socket_path() -> Path:
+    return Path(config.control_socket or SOCKET_PATH).expanduser()
+
+
+def token_path() -> Path:
+    """Owner-only file holding the bearer token a loopback daemon requires."""
+    return socket_path().with_suffix(".token")
+
+
+def _read_token() -> Optional[str]:
+    try:
+        return token_path().read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_token(token: str):
+    path = token_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)  # O_EXCL: never reuse a file someone else made
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, stat.S_IRUSR | stat.S_IWUSR)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: Path, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.path = str(path)
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+def _connection(timeout: float) -> Optional[http.client.HTTPConnection]:
+    if USE_UNIX:
+        path = socket_path()
+        return _UnixConnection(path, timeout) if path.exists() else None
+    return http.client.HTTPConnection("127.0.0.1", config.control_port, timeout=timeout)
+
+
+def call(method: str, path: str, body: Optional[dict] = None, timeout: Optional[float] = None) -> Optional[Any]:
+    """Send one request to the daemon.
+
+    Returns the decoded JSON response, or None when no daemon is listening
+    so the caller can do the work itself. Errors the daemon reports are
+    raised as ``ControlError``.
+    """
+    headers = {"Content-Type": "application/json"}
+    if not USE_UNIX:
+        token = _read_token()
+        if token is None:
+            return None  # no daemon has published a token
+        headers["Authorization"] = f"Bearer {token}"
+    conn = _connection(timeout or config.control_timeout)
+    if conn is None:
+        return None
+    try:
+        conn.request(
+            method, path,
+            body=json.dumps(body) if body is not None else None,
+            headers=headers
+        )
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"null")
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None  # stale socket or daemon not up
+    except OSError as e:
+        raise ControlError(f"daemon did not answer: {e}", status=503)
+    finally:
+        conn.close()
+    if response.status >= 400:
+        raise ControlError((payload or {}).get("error", response.reason), response.status)
+    return payload
+
+
+def running() -> bool:
+    try:
+        return call("GET", "/health", timeout=1) is not None
+    except ControlError:
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "ControlServer"
+
+    def _refusal(self, method: str) -> Optional[tuple[int, str]]:
+        """``(status, reason)`` for a request that must not run, else None.
+
+        A web page can reach a loopback port: it can send a text/plain
+        "simple" POST without a preflight, or rebind its own hostname to
+        127.0.0.1. So requests must name a local Host, POSTs must be JSON,
+        and over TCP they must carry the token from the owner-only file.
+        """
+        host = (self.headers.get("Host") or "").rsplit(":", 1)[0]
+        if host not in ("127.0.0.1", "localhost"):
+            return 403, f"host {host!r} not allowed"
+        token = self.server.token
+        if token is not None and not hmac.compare_digest(
+            (self.headers.get("Authorization") or "").encode(), f"Bearer {token}".encode()
+        ):
+            return 401, "missing or wrong control token"
+        if method == "POST" and self.headers.get_content_type() != "application/json":
+            return 415, "Content-Type must be application/json"
+        return None
+
+    def _dispatch(self, method: str):
+        refusal = self._refusal(method)
+        if refusal is not None:
+            return self._send(refusal[0], {"error": refusal[1]})
+        url = urlparse(self.path)
+        route = self.server.routes.get((method, url.path))
+        if route is None:
+            return self._send(404, {"error": f"no route {method} {url.path}"})
+        try:
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                params.update(json.loads(self.rfile.read(length)))
+            self._send(200, route(**params))
+        except ControlError as e:
+            self._send(e.status, {"error": str(e)})
+        except (TypeError, ValueError) as e:
+            self._send(400, {"error": f"bad parameters: {e}"})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass  # requests are logged by the service
+
+
+class ControlServer(ThreadingHTTPServer):
+    """Serves ``routes`` ({(method, path): handler}) to local clients only.
+
+    On POSIX it listens on a Unix socket readable by the owner alone (the
+    API can place orders); elsewhere on 127.0.0.1:CONTROL_PORT, which any
+    local user or web page can reach, so each run writes a fresh random
+    token to an owner-only file (``token_path``) that requests must send.
+    Handlers take query/JSON parameters as keyword arguments and return
+    JSON-able values.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, routes: dict[tuple[str, str], Callable]):
+        self.routes = routes
+        self.token: Optional[str] = None
+        if USE_UNIX:
+            self.address_family = socket.AF_UNIX
+            path = socket_path()
+            if path.exists():
+                if running():
+                    raise ControlError(f"a daemon is already listening on {path}", status=409)
+                path.unlink()  # left behind by a daemon that died
+            path.parent.mkdir(parents=True, exist_ok=True)
+            umask = os.umask(0o177)
+            try:
+                super().__init__(str(path), _Handler)
+            finally:
+                os.umask(umask)
+            os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+        else:
+            super().__init__(("127.0.0.1", config.control_port), _Handler)
+            # Only once bound: a second daemon must not replace the first's token
+            self.token = secrets.token_urlsafe(32)
+            _write_token(self.token)
+
+    @property
+    def address(self) -> str:
+        return str(socket_path()) if USE_UNIX else f"http://127.0.0.1:{config.control_port}"
+
+    def server_bind(self):
+        if USE_UNIX:
+            # HTTPServer.server_bind expects a (host, port) address
+            self.socket.bind(self.server_address)
+            self.server_name, self.server_port = "localhost", 0
+        else:
+            super().server_bind()
+
+    def server_close(self):
+        super().server_close()
+        if USE_UNIX:
+            try:
+                socket_path().unlink()
+            except FileNotFoundError:
+                pass
+        elif self.token is not None:
+            token_path().unlink(missing_ok=True)
@@ -0,0 +1,73 @@
+"""On-disk cache of derived CLOB API (L2) credentials."""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import config
+from .logger import log_event
+
+CREDS_PATH = Path.home() / ".polymarket-bot" / "api_creds.json"
+
+FIELDS = ("api_key", "api_secret", "api_passphrase")
+
+
+class CredentialStore:
+    """Derived API credentials, reused across processes until they expire.
+
+    Entries are keyed by a hash of the CLOB host and signing key, so the
+    file never holds the private key and rotating the key starts a fresh
+    entry. The file and its directory are created owner-only (0600/0700).
+    Cached credentials are not checked up front; the client drops and
+    re-derives them when a request comes back 401.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_hours: Optional[float] = None):
+        self.path = Path(path or config.api_creds_path or CREDS_PATH).expanduser()
+        self.ttl = (config.api_creds_ttl_hours if ttl_hours is None else ttl_hours) * 3600
+
+    @staticmethod
+    def key_for(host: str, private_key: str) -> str:
+        return hashlib.sha256(f"{host}|{private_key}".encode()).hexdigest()[:32]
+
+    def _load(self) -> dict:
+        try:
+            if os.name == "posix" and self.path.stat().st_mode & 0o077:
+                log_event("credentials", f"{self.path} was readable by others - fixing permissions", level="warn")
+                os.chmod(self.path, 0o600)
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log_event("credentials", f"Ignoring unreadable credential cache: {e}", level="warn")
+            return {}
+
+    def _save(self, entries: dict):
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.path)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Cached credentials, or None if missing or expired."""
+        entry = self._load().get(key)
+        if not entry or time.time() - entry.get("derived_at", 0) > self.ttl:
+            return None
+        return {f: entry[f] for f in FIELDS}
+
+    def put(self, key: str, creds: dict):
+        entries = self._load()
+        entries[key] = {**{f: creds[f] for f in FIELDS}, "derived_at": time.time()}
+        try:
+            self._save(entries)
+        except OSError as e:
+            log_event("credentials", f"Could not cache API credentials: {e}", level="warn")
+
+    def invalidate(self, key: str):
+        entries = self._load()
+        if entries.pop(key, None) is not None:
+            self._save(entries)
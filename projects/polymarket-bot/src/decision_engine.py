@@ -1,26 +1,27 @@
 """AI-powered trading decision engine."""
+import importlib
 import json
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 from datetime import datetime
 
-try:
-    import openai
-except ImportError:
-    openai = None
-
-try:
-    import anthropic
-except ImportError:
-    anthropic = None
-
 from .config import config
 from .sentiment import SentimentResult
 from .news import NewsResult
 from .polymarket_client import Market
+from .token_index import TokenIndex
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE
 from .logger import log_event
 
 
+def _import_sdk(name: str):
+    """Import an optional LLM SDK, or None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
 @dataclass
 class TradeDecision:
     """A trading decision from the AI."""
@@ -48,7 +49,8 @@ class MarketAnalysis:
 class DecisionEngine:
     """AI-powered decision maker for Polymarket trades."""
     
-    SYSTEM_PROMPT = """You are an expert crypto trading analyst specializing in Bitcoin prediction markets on Polymarket.
+    # Filled in per universe (see ``system_prompt``)
+    SYSTEM_PROMPT = """You are an expert {analyst} specializing in {subject} prediction markets on Polymarket.
 
 Your job is to analyze:
 1. Current market prices (probability implied by YES/NO prices)
@@ -64,20 +66,33 @@ Rules:
 - Factor in sentiment momentum (is sentiment shifting?)
 - Look for mispricings: sentiment disagrees with current price
 - Keep position sizes conservative (max $25 per trade)
-
+{rules}
 Output JSON with your decision and reasoning."""
 
-    def __init__(self):
+    def __init__(self, universe: Optional[Universe] = None):
+        self.universe = universe or UNIVERSES[DEFAULT_UNIVERSE]
+        self.system_prompt = self.SYSTEM_PROMPT.format(
+            analyst=self.universe.analyst,
+            subject=self.universe.subject,
+            rules="".join(f"- {rule}\n" for rule in self.universe.prompt_rules)
+        )
         self.provider = None
         self._setup_provider()
     
     def _setup_provider(self):
-        """Initialize the AI provider."""
-        if config.anthropic_api_key and anthropic:
+        """Initialize the AI provider.
+        
+        The SDKs are imported here rather than at module load; each takes
+        a few hundred ms to import and most commands never call an LLM.
+        """
+        anthropic = _import_sdk("anthropic") if config.anthropic_api_key else None
+        openai = _import_sdk("openai") if config.openai_api_key and not anthropic else None
+        
+        if anthropic:
             self.provider = "anthropic"
             self.anthropic_client = anthropic.Anthropic(api_key=config.anthropic_api_key)
             log_event("decision", "Using Anthropic Claude for decisions")
-        elif config.openai_api_key and openai:
+        elif openai:
             self.provider = "openai"
             self.openai_client = openai.OpenAI(api_key=config.openai_api_key)
             log_event("decision", "Using OpenAI for decisions")
@@ -91,7 +106,7 @@ Output JSON with your decision and reasoning."""
                 response = self.anthropic_client.messages.create(
                     model="claude-sonnet-4-20250514",
                     max_tokens=1000,
-                    system=self.SYSTEM_PROMPT,
+                    system=self.system_prompt,
                     messages=[{"role": "user", "content": prompt}]
                 )
                 return response.content[0].text
@@ -101,7 +116,7 @@ Output JSON with your decision and reasoning."""
                     model="gpt-4o-mini",
                     max_tokens=1000,
                     messages=[
-                        {"role": "system", "content": self.SYSTEM_PROMPT},
+                        {"role": "system", "content": self.system_prompt},
                         {"role": "user", "content": prompt}
                     ]
                 )
@@ -112,14 +127,15 @@ Output JSON with your decision and reasoning."""
     
     def _build_analysis_prompt(
         self,
-        markets: list[Market],
+        markets: Sequence[Market],
         sentiment: SentimentResult,
-        news: NewsResult
+        news: NewsResult,
+        index: TokenIndex
     ) -> str:
         """Build the analysis prompt for the LLM."""
         
         # Format markets
-        markets_text = "## Active BTC Markets on Polymarket:\n"
+        markets_text = f"## Active {self.universe.label} Markets on Polymarket:\n"
         for i, m in enumerate(markets[:5], 1):
             markets_text += f"""
 {i}. {m.question}
@@ -127,7 +143,7 @@ Output JSON with your decision and reasoning."""
    - Current Price: ${m.price:.2f} ({m.price*100:.1f}% implied probability)
    - Volume: ${m.volume:,.0f}
    - Ends: {m.end_date}
-   - Token ID: {m.token_id[:16]}...
+   - Token ID: {index.short_id(m.token_id)}...
 """
         
         # Format sentiment
@@ -137,6 +153,7 @@ Output JSON with your decision and reasoning."""
 - Bearish tweets: {sentiment.bearish_count}
 - Neutral tweets: {sentiment.neutral_count}
 - Overall score: {sentiment.sentiment_score:.2f} (-1=bearish, +1=bullish)
+- Momentum: {sentiment.momentum:+.2f} ({', '.join(f"{name} {w['score']:+.2f}" for name, w in sentiment.windows.items()) or 'no history'})
 - Key signals: {', '.join(sentiment.key_signals) if sentiment.key_signals else 'None'}
 """
         
@@ -178,11 +195,16 @@ Only include markets where you have a clear edge. Hold if uncertain."""
     
     def analyze_markets(
         self,
-        markets: list[Market],
+        markets: Sequence[Market],
         sentiment: SentimentResult,
-        news: NewsResult
+        news: NewsResult,
+        index: Optional[TokenIndex] = None
     ) -> list[TradeDecision]:
-        """Analyze markets and generate trade decisions."""
+        """Analyze markets and generate trade decisions.
+        
+        ``index`` should cover the same market snapshot; it is built here
+        when the caller doesn't already have one.
+        """
         
         if not markets:
             log_event("decision", "No markets to analyze")
@@ -192,7 +214,8 @@ Only include markets where you have a clear edge. Hold if uncertain."""
             log_event("decision", "No AI provider available", level="error")
             return []
         
-        prompt = self._build_analysis_prompt(markets, sentiment, news)
+        index = index or TokenIndex(markets)
+        prompt = self._build_analysis_prompt(markets, sentiment, news, index)
         log_event("decision", "Requesting AI analysis...")
         
         response = self._call_llm(prompt)
@@ -212,10 +235,7 @@ Only include markets where you have a clear edge. Hold if uncertain."""
                 
                 for d in data.get("decisions", []):
                     # Find the full market info
-                    market = next(
-                        (m for m in markets if m.token_id.startswith(d.get("token_id", "")[:16])),
-                        None
-                    )
+                    market = index.resolve(d.get("token_id", ""))
                     
                     if market and d.get("action") != "hold":
                         action = "buy"
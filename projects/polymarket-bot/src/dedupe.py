@@ -0,0 +1,147 @@
+"""Near-duplicate detection: MinHash signatures in a bounded LSH index."""
+import re
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from .config import config
+
+_URL = re.compile(r"https?://\S+|@\w+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+_HASH_BITS = (1 << 64) - 1
+_EMPTY = 1 << 64
+
+Signature = tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """Lowercased words only: links, @mentions, punctuation and emoji dropped."""
+    return " ".join(_NON_WORD.sub(" ", _URL.sub(" ", text.lower())).split())
+
+
+class NearDuplicateIndex:
+    """Collapse near-identical texts (copypasta, bot reposts, syndicated headlines).
+
+    Each text becomes a MinHash signature over its character n-grams,
+    built with one-permutation hashing: every n-gram is hashed once into
+    one of ``num_perm`` bins, each bin keeps its smallest hash, and empty
+    bins borrow from the next filled one. The share of equal positions
+    in two signatures estimates the Jaccard similarity of the two n-gram
+    sets. Hashes are Python's, salted per process, so signatures are only
+    compared within one run; the index is in memory anyway.
+
+    Signatures are split into ``bands``. Texts that agree on a whole band
+    share an LSH bucket, so a lookup only compares against those texts,
+    not the whole index. A candidate at or above ``threshold`` estimated
+    similarity is a duplicate.
+
+    At most ``capacity`` texts are kept. The least recently matched one is
+    evicted first, with its buckets, so memory stays flat however long
+    the bot runs.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        capacity: Optional[int] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 5
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = config.dedupe_threshold if threshold is None else threshold
+        self.capacity = config.dedupe_capacity if capacity is None else capacity
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self._items: OrderedDict[Hashable, Signature] = OrderedDict()
+        self._buckets: dict[tuple, set] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def signature(self, text: str) -> Optional[Signature]:
+        """MinHash of the text's n-grams; None when nothing is left to compare."""
+        text = normalize(text)
+        if not text:
+            return None
+        n, k = self.ngram, self.num_perm
+        bins = [_EMPTY] * k
+        for gram in {text[i:i + n] for i in range(max(len(text) - n + 1, 1))}:
+            value, bin_ = divmod(hash(gram) & _HASH_BITS, k)
+            if value < bins[bin_]:
+                bins[bin_] = value
+        # Densify: an empty bin takes the next filled bin's value, shifted
+        # by the distance so borrowed values don't collide with real ones
+        for i in range(k):
+            if bins[i] == _EMPTY:
+                for step in range(1, k):
+                    borrowed = bins[(i + step) % k]
+                    if borrowed < _EMPTY:
+                        bins[i] = borrowed + step * _EMPTY
+                        break
+        return tuple(bins)
+
+    @staticmethod
+    def similarity(a: Signature, b: Signature) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def _band_keys(self, signature: Signature) -> list[tuple]:
+        r = self.rows
+        return [(band, signature[band * r:(band + 1) * r]) for band in range(self.bands)]
+
+    def find(self, signature: Signature) -> Optional[Hashable]:
+        """Key of the most similar indexed text at or above the threshold."""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        best, best_similarity = None, self.threshold
+        for key in candidates:
+            similarity = self.similarity(signature, self._items[key])
+            if similarity >= best_similarity:
+                best, best_similarity = key, similarity
+        return best
+
+    def add(self, key: Hashable, text: str) -> Optional[Hashable]:
+        """Index a text, or return the key of the near-duplicate it collapses into.
+
+        A key already in the index is the same item seen again, not a
+        duplicate; it returns None without recomputing anything.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return None
+            signature = self.signature(text)
+            if signature is None:
+                return None
+            original = self.find(signature)
+            if original is not None:
+                self._items.move_to_end(original)
+                return original
+            self._items[key] = signature
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._items) > self.capacity:
+                self._evict()
+            return None
+
+    def _evict(self):
+        key, signature = self._items.popitem(last=False)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def stats(self) -> dict:
+        return {"items": len(self._items), "buckets": len(self._buckets), "capacity": self.capacity}
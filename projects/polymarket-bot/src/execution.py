@@ -0,0 +1,159 @@
+"""Concurrent order execution with CLOB rate limiting and per-token ordering."""
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from .config import config
+from .logger import log_event
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst`` banked.
+
+    Any window of ``t`` seconds lets at most ``burst + rate * t`` through,
+    which is the figure to hold under a "N requests per window" limit.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError(f"rate must be above 0 tokens per second (CLOB_ORDER_RATE), got {rate}")
+        if burst <= 0:
+            raise ValueError(f"burst must be above 0 tokens (CLOB_ORDER_BURST), got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class OrderOutcome:
+    """One decision's result."""
+    token_id: str
+    ok: bool
+    elapsed_ms: float
+    waited_ms: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class ExecutionReport:
+    """Aggregated results of one batch of decisions."""
+    outcomes: list[OrderOutcome] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def executed(self) -> int:
+        return sum(o.ok for o in self.outcomes)
+
+    @property
+    def failed(self) -> int:
+        return sum(not o.ok for o in self.outcomes)
+
+    def merge_into(self, results: dict):
+        """Add counts and errors to a ``run_cycle`` results dict."""
+        results["trades_executed"] = results.get("trades_executed", 0) + self.executed
+        results["trades_failed"] = results.get("trades_failed", 0) + self.failed
+        results["execution_ms"] = round(self.elapsed_ms, 1)
+        results.setdefault("errors", []).extend(
+            f"{o.token_id[:8]}: {o.error}" for o in self.outcomes if o.error
+        )
+
+
+class ExecutionEngine:
+    """Submit independent orders concurrently.
+
+    Decisions are grouped by token: groups run in parallel on a thread
+    pool, decisions within a group run in order, and a per-token lock
+    keeps overlapping ``execute`` calls from trading one token at once.
+    Every order first takes ``cost`` tokens from a bucket sized to the
+    CLOB order limits (``CLOB_ORDER_RATE`` per second sustained,
+    ``CLOB_ORDER_BURST`` at once).
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None
+    ):
+        self.workers = workers or config.execution_workers
+        self.limiter = TokenBucket(
+            config.clob_order_rate if rate is None else rate,
+            config.clob_order_burst if burst is None else burst
+        )
+        self._token_locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def _lock_for(self, token_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._token_locks[token_id]
+
+    def _run_group(self, token_id: str, items: list, submit: Callable, cost: float) -> list[OrderOutcome]:
+        outcomes = []
+        with self._lock_for(token_id):
+            for item in items:
+                start = time.perf_counter()
+                waited = self.limiter.acquire(cost)
+                try:
+                    ok, error = bool(submit(item)), None
+                except Exception as e:
+                    ok, error = False, str(e)
+                    log_event("execution", f"Order for {token_id[:8]} raised: {e}", level="error")
+                outcomes.append(OrderOutcome(
+                    token_id, ok, (time.perf_counter() - start) * 1000, waited * 1000, error
+                ))
+        return outcomes
+
+    def execute(
+        self,
+        items: Sequence,
+        submit: Callable[[object], bool],
+        key: Callable[[object], str] = lambda d: d.token_id,
+        cost: float = 1.0
+    ) -> ExecutionReport:
+        """Run ``submit`` for every item; ``submit`` returns True on success."""
+        start = time.perf_counter()
+        groups: dict[str, list] = {}
+        for item in items:
+            groups.setdefault(key(item), []).append(item)
+
+        report = ExecutionReport()
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(groups))) as pool:
+                futures = [
+                    pool.submit(self._run_group, token_id, group, submit, cost)
+                    for token_id, group in groups.items()
+                ]
+                for future in futures:
+                    report.outcomes.extend(future.result())
+        report.elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if report.outcomes:
+            log_event(
+                "execution",
+                f"{report.executed}/{len(report.outcomes)} orders across {len(groups)} tokens "
+                f"in {report.elapsed_ms:.0f}ms"
+            )
+        return report
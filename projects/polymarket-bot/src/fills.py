@@ -0,0 +1,236 @@
+"""Depth-aware fill estimates and order slicing over full CLOB books."""
+import math
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Optional
+
+from .config import config
+from .orderbook import OrderBook, BID
+from .logger import log_event
+
+
+@dataclass
+class FillEstimate:
+    """Expected result of a market order against one side of the book."""
+    amount: float        # requested: USDC for a BUY, shares for a SELL
+    shares: float
+    cost: float          # USDC spent (BUY) or received (SELL)
+    avg_price: float
+    best_price: float
+    worst_price: float   # price limit to sign a FOK with
+    slippage: float      # avg price vs best, as a fraction of best
+    max_fillable: float  # most the whole book takes, in ``amount`` units
+    levels: int
+    filled: bool
+
+
+class DepthProfile:
+    """One side of a book as cumulative arrays, best price first.
+
+    Prefix sums of shares and cost are built once, so each estimate is a
+    bisect plus one partial level instead of a walk over every level.
+    ``side`` is the taker's side: a BUY reads asks, a SELL reads bids.
+    Amounts are USDC for a BUY and shares for a SELL, as in market orders.
+    """
+
+    def __init__(self, levels: list[tuple[float, float]], side: str = BID):
+        self.side = side.upper()
+        self.buying = self.side == BID
+        self.prices = [p for p, _ in levels]
+        self.cum_shares = [0.0, *accumulate(s for _, s in levels)]
+        self.cum_cost = [0.0, *accumulate(p * s for p, s in levels)]
+
+    @classmethod
+    def from_book(cls, book, side: str = BID) -> "DepthProfile":
+        """From an ``OrderBook`` or a normalized ``{"bids", "asks"}`` dict."""
+        buying = side.upper() == BID
+        if isinstance(book, OrderBook):
+            levels = book.levels("SELL" if buying else "BUY")
+        else:
+            levels = book.get("asks" if buying else "bids") or []
+        return cls(levels, side)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def best(self) -> Optional[float]:
+        return self.prices[0] if self.prices else None
+
+    @property
+    def _cum_amount(self) -> list[float]:
+        return self.cum_cost if self.buying else self.cum_shares
+
+    @property
+    def max_fillable(self) -> float:
+        return self._cum_amount[-1]
+
+    def estimate(self, amount: float) -> FillEstimate:
+        """Sweep ``amount`` through the book."""
+        cum = self._cum_amount
+        n = len(self.prices)
+        # First level whose cumulative amount covers the request
+        i = bisect_left(cum, amount - 1e-9, 1)
+        if i > n:
+            shares, cost, levels, filled = self.cum_shares[n], self.cum_cost[n], n, False
+        else:
+            price = self.prices[i - 1]
+            rest = amount - cum[i - 1]
+            extra = rest / price if self.buying else rest
+            shares = self.cum_shares[i - 1] + extra
+            cost = self.cum_cost[i - 1] + extra * price
+            levels, filled = i, True
+
+        best = self.best or 0.0
+        avg = cost / shares if shares else 0.0
+        return FillEstimate(
+            amount=amount,
+            shares=shares,
+            cost=cost,
+            avg_price=avg,
+            best_price=best,
+            worst_price=self.prices[levels - 1] if levels else 0.0,
+            slippage=abs(avg - best) / best if best and shares else 0.0,
+            max_fillable=self.max_fillable,
+            levels=levels,
+            filled=filled
+        )
+
+    def max_within(self, max_slippage: float, reference: Optional[float] = None) -> float:
+        """Largest amount whose average price stays within ``max_slippage``.
+
+        Slippage is measured from ``reference``, defaulting to the best price.
+        """
+        if not self.prices:
+            return 0.0
+        sign = 1 if self.buying else -1
+        limit = (reference or self.prices[0]) * (1 + sign * max_slippage)
+        # Average price only worsens level by level, so the levels that fit
+        # whole are a prefix: bisect for its end, then solve the partial level
+        lo, hi = 0, len(self.prices)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if sign * (self.cum_cost[mid] - limit * self.cum_shares[mid]) <= 1e-12:
+                lo = mid
+            else:
+                hi = mid - 1
+        k = lo
+        shares, cost = self.cum_shares[k], self.cum_cost[k]
+        if k < len(self.prices) and self.prices[k] != limit:
+            price = self.prices[k]
+            extra = max(0.0, (cost - limit * shares) / (limit - price))
+            shares += extra
+            cost += extra * price
+        return cost if self.buying else shares
+
+
+def estimate_fill(book, amount: float, side: str = BID) -> FillEstimate:
+    """Fill estimate for a market order against a full book."""
+    return DepthProfile.from_book(book, side).estimate(amount)
+
+
+@dataclass
+class SliceResult:
+    """Outcome of ``OrderSlicer.submit``."""
+    requested: float
+    filled: float = 0.0  # in ``requested`` units
+    shares: float = 0.0
+    cost: float = 0.0
+    responses: list[dict] = field(default_factory=list)
+    estimate: Optional[FillEstimate] = None
+    skipped: str = ""  # why nothing (more) was posted
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        return self.cost / self.shares if self.shares else None
+
+    @property
+    def children(self) -> int:
+        return len(self.responses)
+
+
+class OrderSlicer:
+    """Sizes FOK market orders to the book before posting them.
+
+    An order the visible depth can fill within ``max_slippage`` of the
+    touch goes out whole, signed with the walk's worst price as its limit.
+    A larger one is split into child orders, each sized to what a freshly
+    fetched book takes within ``max_slippage`` of the touch price seen
+    first, so children wait for depth to come back instead of walking the
+    price up. Slicing stops when the order is done, the book offers less
+    than ``min_child`` or ``max_children`` have been posted. Orders the
+    book cannot fill are never sent, saving the round-trip to a FOK
+    rejection.
+    """
+
+    def __init__(
+        self,
+        polymarket,
+        pipeline,
+        max_slippage: Optional[float] = None,
+        min_child: Optional[float] = None,
+        max_children: Optional[int] = None
+    ):
+        self.polymarket = polymarket
+        self.pipeline = pipeline
+        self.max_slippage = config.max_slippage if max_slippage is None else max_slippage
+        self.min_child = config.slice_min_order if min_child is None else min_child
+        self.max_children = max_children or config.slice_max_children
+
+    def _profile(self, token_id: str, side: str) -> DepthProfile:
+        return DepthProfile.from_book(self.polymarket.get_orderbook(token_id, depth=None), side)
+
+    def submit(self, token_id: str, amount: float, side: str = "BUY") -> SliceResult:
+        """Post ``amount`` as one or more book-sized FOK orders."""
+        result = SliceResult(requested=amount)
+
+        if self.pipeline.has(token_id, amount, side):
+            # Pre-signed orders were sized against the book when signed
+            submitted = self.pipeline.submit(token_id, amount, side)
+            if submitted.response:
+                price = submitted.price or 0.0
+                result.responses.append(submitted.response)
+                result.filled = amount
+                result.shares = amount / price if side == "BUY" and price else amount
+                result.cost = amount if side == "BUY" else amount * price
+            return result
+
+        start = time.perf_counter()
+        remaining = amount
+        reference = None
+        while remaining > 1e-9 and result.children < self.max_children:
+            profile = self._profile(token_id, side)
+            if result.estimate is None:
+                result.estimate = profile.estimate(remaining)
+                reference = profile.best
+            # Child sizes are whole cents (USDC) or hundredths of a share
+            size = min(remaining, math.floor(profile.max_within(self.max_slippage, reference) * 100) / 100)
+            if size <= 0 or (size < remaining and size < self.min_child):
+                result.skipped = (
+                    f"book offers {size:.2f} within {self.max_slippage:.1%} of {reference} "
+                    f"({profile.max_fillable:.2f} in total)"
+                )
+                break
+            child = profile.estimate(size)
+
+            submitted = self.pipeline.submit(token_id, child.amount, side, price=child.worst_price)
+            if not submitted.response:
+                result.skipped = "child order failed"
+                break
+            result.responses.append(submitted.response)
+            result.filled += child.amount
+            result.shares += child.shares
+            result.cost += child.cost
+            remaining -= child.amount
+
+        if result.children > 1 or result.skipped:
+            log_event(
+                "trading",
+                f"{side} {amount:g} {token_id[:8]}: filled {result.filled:g} in {result.children} "
+                f"child orders ({(time.perf_counter() - start) * 1000:.0f}ms)"
+                + (f", stopped: {result.skipped}" if result.skipped else ""),
+                level="warn" if result.filled < amount - 1e-9 else "info"
+            )
+        return result
@@ -0,0 +1,143 @@
+"""Concurrent source gathering with per-source deadlines and partial results."""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .config import config, parse_mapping
+from .logger import log_event
+
+
+def _in_thread(name: str, source: Callable) -> "asyncio.Future":
+    """Run a blocking source on its own daemon thread.
+
+    Not an executor: ``asyncio.run`` joins the default one on exit and a
+    pool joins its workers at interpreter exit, so either would hold the
+    cycle or the process on a source that already missed its deadline.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(value, error):
+        if not future.done():
+            future.set_exception(error) if error else future.set_result(value)
+
+    def run():
+        try:
+            value, error = source(), None
+        except Exception as e:
+            value, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, value, error)
+        except RuntimeError:
+            pass  # the gather finished without us and its loop is closed
+
+    threading.Thread(target=run, name=f"gather-{name}", daemon=True).start()
+    return future
+
+
+def deadline_for(name: str) -> float:
+    """Seconds ``name`` may take, from GATHER_DEADLINES or GATHER_DEADLINE."""
+    return parse_mapping(config.gather_deadlines).get(name, config.gather_deadline)
+
+
+@dataclass
+class SourceResult:
+    """One source's outcome."""
+    name: str
+    value: Any = None
+    ok: bool = False
+    timed_out: bool = False
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class GatherReport:
+    """Results of one gather, keyed by source name."""
+    results: dict[str, SourceResult] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return any(not r.ok for r in self.results.values())
+
+    @property
+    def missing(self) -> list[str]:
+        return [name for name, r in self.results.items() if not r.ok]
+
+    def value(self, name: str, default: Any = None) -> Any:
+        result = self.results.get(name)
+        return result.value if result and result.ok else default
+
+    def timings(self) -> dict[str, dict]:
+        """Per-source status for reports and logs."""
+        return {
+            name: {
+                "ok": r.ok,
+                "timed_out": r.timed_out,
+                "elapsed_ms": round(r.elapsed_ms, 1),
+                **({"error": r.error} if r.error else {})
+            }
+            for name, r in self.results.items()
+        }
+
+
+async def _run(name: str, source: Callable, deadline: float) -> SourceResult:
+    start = time.perf_counter()
+    result = SourceResult(name)
+    try:
+        if asyncio.iscoroutinefunction(source):
+            pending = source()
+        else:
+            pending = _in_thread(name, source)
+        result.value = await asyncio.wait_for(pending, deadline)
+        result.ok = True
+    except asyncio.TimeoutError:
+        # A thread can't be interrupted; it finishes in the background
+        # (results it caches still help the next cycle) and is dropped here
+        result.timed_out = True
+        result.error = f"no result within {deadline:g}s"
+    except Exception as e:
+        result.error = str(e)
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
+
+
+async def gather(
+    sources: dict[str, Callable],
+    deadlines: Optional[dict[str, float]] = None,
+    label: str = "gather"
+) -> GatherReport:
+    """Run every source at once; each gets its deadline, none waits on another.
+
+    Sources are zero-argument callables: coroutine functions are awaited,
+    anything else runs on a worker thread. Deadlines default to
+    ``deadline_for(name)``. A source that fails or misses its deadline is
+    reported as missing instead of failing the gather.
+    """
+    deadlines = deadlines or {}
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        _run(name, source, deadlines.get(name) or deadline_for(name))
+        for name, source in sources.items()
+    ))
+    report = GatherReport({r.name: r for r in results}, (time.perf_counter() - start) * 1000)
+
+    for r in results:
+        if not r.ok:
+            log_event(label, f"{r.name} missing from {label}: {r.error}", level="warn")
+    slowest = max(results, key=lambda r: r.elapsed_ms, default=None)
+    log_event(
+        label,
+        f"Gathered {len(results) - len(report.missing)}/{len(results)} sources in "
+        f"{report.elapsed_ms:.0f}ms" + (f" (slowest: {slowest.name})" if slowest else ""),
+        data=report.timings()
+    )
+    return report
+
+
+def run_sync(coro):
+    """Run a gathering coroutine to completion from synchronous code."""
+    return asyncio.run(coro)
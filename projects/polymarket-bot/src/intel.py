@@ -2,12 +2,19 @@
 import json
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+from functools import partial
+from operator import itemgetter
 from typing import Optional
 
-from .polymarket_client import PolymarketClient, Market
-from .sentiment import SentimentAnalyzer
-from .news import NewsAggregator
+from .polymarket_client import PolymarketClient
+from .market_table import MarketTable
+from .sentiment import SentimentAnalyzer, SentimentResult
+from .news import NewsAggregator, NewsResult
+from .gathering import gather, run_sync
+from .intel_history import IntelHistory, HISTORY_PATH
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE, get_universe
+from .token_index import TokenIndex
 from .logger import log_event
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -22,59 +29,71 @@ class IntelReport:
     sentiment: dict
     news: dict
     summary: dict
+    sources: dict = field(default_factory=dict)  # per-source status and timing
+    universe: str = DEFAULT_UNIVERSE
+    version: int = 0  # advances only when the content changes
+    changes: Optional[dict] = None  # IntelDelta from the previous version
 
 
-def gather_intel() -> IntelReport:
-    """Gather all market intelligence and save to file."""
-    log_event("intel", "Starting intelligence gathering...")
+def gather_intel(
+    pm: Optional[PolymarketClient] = None,
+    sentiment_analyzer: Optional[SentimentAnalyzer] = None,
+    news_aggregator: Optional[NewsAggregator] = None,
+    history: Optional[IntelHistory] = None,
+    universe: Optional[Universe] = None
+) -> IntelReport:
+    """Gather all market intelligence and save to file.
     
-    # Initialize clients
-    pm = PolymarketClient()
-    pm.connect(read_only=True)
+    Markets, sentiment and news are gathered at once, each under its own
+    deadline; a source that misses it leaves its section empty and is
+    marked missing in ``sources`` rather than holding up the report.
+    A long-running caller passes its connected clients to reuse them.
+    
+    The report is versioned in ``history``: it carries the delta from the
+    previous version, and only a report that changed is stored and
+    written to latest_intel.json.
     
-    sentiment_analyzer = SentimentAnalyzer()
-    news_aggregator = NewsAggregator()
+    ``universe`` (default BTC) picks the markets, searches and news; each
+    universe keeps its own history and latest file.
+    """
+    universe = universe or UNIVERSES[DEFAULT_UNIVERSE]
+    log_event("intel", f"Starting {universe.label} intelligence gathering...")
+    
+    # Initialize clients
+    if pm is None:
+        pm = PolymarketClient()
+        pm.connect(read_only=True)
     
-    # Get crypto markets
-    markets = pm.get_crypto_markets()
-    log_event("intel", f"Found {len(markets)} crypto market outcomes")
+    sentiment_analyzer = sentiment_analyzer or SentimentAnalyzer(universe)
+    news_aggregator = news_aggregator or NewsAggregator(universe)
     
-    # Get BTC-specific for focus
-    btc_markets = [
-        m for m in markets
-        if any(kw in m.question.lower() or kw in m.event_title.lower() 
-               for kw in ["bitcoin", "btc", "microstrategy"])
-    ]
+    gathered = run_sync(gather({
+        "markets": partial(pm.get_event_markets, universe.event_matcher, label=f"{universe.label} event"),
+        "sentiment": sentiment_analyzer.analyze_btc_sentiment_async,
+        "news": news_aggregator.aggregate_news_async
+    }, label="intel"))
     
-    # Get sentiment
-    sentiment = sentiment_analyzer.analyze_btc_sentiment()
+    markets = gathered.value("markets") or MarketTable()
+    sentiment = gathered.value("sentiment") or SentimentResult.empty("sentiment")
+    news = gathered.value("news") or NewsResult.empty("news")
+    log_event("intel", f"Found {len(markets)} {universe.label} event market outcomes")
     
-    # Get news
-    news = news_aggregator.aggregate_news()
+    # Narrow to the universe's own markets for focus
+    universe_markets = markets.filter_text(universe.market_matcher, "question", "event_title")
     
     # Build report
     report = IntelReport(
         timestamp=datetime.now().isoformat(),
-        markets=[
-            {
-                "token_id": m.token_id,
-                "condition_id": m.condition_id,
-                "question": m.question,
-                "outcome": m.outcome,
-                "price": m.price,
-                "volume": m.volume,
-                "end_date": m.end_date,
-                "event_title": m.event_title
-            }
-            for m in btc_markets[:20]  # Top 20 BTC markets
-        ],
+        markets=universe_markets.sort_by_volume()[:20].to_dicts(),  # Top 20 markets by volume
         sentiment={
             "bullish_count": sentiment.bullish_count,
             "bearish_count": sentiment.bearish_count,
             "neutral_count": sentiment.neutral_count,
             "total_tweets": sentiment.total_tweets,
             "sentiment_score": sentiment.sentiment_score,
-            "key_signals": sentiment.key_signals
+            "key_signals": sentiment.key_signals,
+            "momentum": sentiment.momentum,
+            "windows": sentiment.windows
         },
         news={
             "total_articles": len(news.items),
@@ -87,26 +106,43 @@ def gather_intel() -> IntelReport:
             ]
         },
         summary={
+            # Key names predate universes; they count any universe's markets
             "total_crypto_markets": len(markets),
-            "btc_markets": len(btc_markets),
+            "btc_markets": len(universe_markets),
             "sentiment_score": sentiment.sentiment_score,
-            "news_bias": (news.bullish_headlines - news.bearish_headlines) / max(len(news.items), 1)
-        }
+            "news_bias": (news.bullish_headlines - news.bearish_headlines) / max(len(news.items), 1),
+            "missing_sources": gathered.missing + sentiment.missing_sources + news.missing_sources
+        },
+        sources=gathered.timings(),
+        universe=universe.name
+    )
+    
+    history = history or IntelHistory(universe.data_path(DATA_DIR, HISTORY_PATH.name))
+    # Without a market gather there is no telling what closed
+    open_tokens = None if "markets" in gathered.missing else set(universe_markets.column("token_id"))
+    versioned, stored = history.record(asdict(report), open_tokens=open_tokens)
+    report.version, report.changes = versioned["version"], versioned["changes"]
+    # Sections a source missed now hold the previous version's data
+    report.markets, report.sentiment, report.news, report.summary = (
+        versioned["markets"], versioned["sentiment"], versioned["news"], versioned["summary"]
     )
+    if not stored:
+        log_event("intel", f"Unchanged since v{report.version}")
+        return report
     
     # Save to file
-    report_path = DATA_DIR / "latest_intel.json"
+    report_path = universe.data_path(DATA_DIR, "latest_intel.json")
     with open(report_path, "w") as f:
         json.dump(asdict(report), f, indent=2)
     
-    log_event("intel", f"Report saved to {report_path}")
+    log_event("intel", f"Report v{report.version} saved to {report_path}")
     
     return report
 
 
-def get_latest_intel() -> Optional[dict]:
+def get_latest_intel(universe: Optional[Universe] = None) -> Optional[dict]:
     """Load the latest intel report."""
-    report_path = DATA_DIR / "latest_intel.json"
+    report_path = (universe or UNIVERSES[DEFAULT_UNIVERSE]).data_path(DATA_DIR, "latest_intel.json")
     if report_path.exists():
         with open(report_path) as f:
             return json.load(f)
@@ -116,23 +152,40 @@ def get_latest_intel() -> Optional[dict]:
 def format_intel_for_quinn(report: dict) -> str:
     """Format intel report as readable text for Quinn."""
     lines = []
-    lines.append(f"# Polymarket Intel Report")
+    lines.append(f"# Polymarket Intel Report v{report.get('version', 0)}")
     lines.append(f"Generated: {report['timestamp']}")
     lines.append("")
     
     # Summary
     s = report['summary']
     lines.append(f"## Summary")
-    lines.append(f"- Total crypto markets: {s['total_crypto_markets']}")
-    lines.append(f"- BTC-specific markets: {s['btc_markets']}")
+    label = get_universe(report.get('universe')).label
+    lines.append(f"- Related markets: {s['total_crypto_markets']}")
+    lines.append(f"- {label}-specific markets: {s['btc_markets']}")
     lines.append(f"- Sentiment score: {s['sentiment_score']:.2f} (-1=bearish, +1=bullish)")
     lines.append(f"- News bias: {s['news_bias']:.2f}")
+    if s.get('missing_sources'):
+        lines.append(f"- PARTIAL: no data from {', '.join(s['missing_sources'])}")
+    changes = report.get('changes')
+    if changes:
+        if changes['material']:
+            lines.append(
+                f"- Since v{changes['since']}: {len(changes['price_moves'])} price moves, "
+                f"{len(changes['added_markets'])} new / {len(changes['removed_markets'])} gone markets, "
+                f"{len(changes['new_headlines'])} new headlines"
+                + (f", sentiment {changes['sentiment_shift']:+.2f}" if changes['sentiment_shift'] is not None else "")
+            )
+        else:
+            lines.append(f"- No material changes since v{changes['since']}")
     lines.append("")
     
     # Sentiment
     sent = report['sentiment']
     lines.append(f"## X/Twitter Sentiment")
     lines.append(f"- Bullish: {sent['bullish_count']} | Bearish: {sent['bearish_count']} | Neutral: {sent['neutral_count']}")
+    if sent.get('windows'):
+        scores = ", ".join(f"{name} {w['score']:+.2f}" for name, w in sent['windows'].items())
+        lines.append(f"- Momentum: {sent['momentum']:+.2f} ({scores})")
     if sent['key_signals']:
         lines.append(f"- Signals: {', '.join(sent['key_signals'][:3])}")
     lines.append("")
@@ -146,11 +199,12 @@ def format_intel_for_quinn(report: dict) -> str:
     lines.append("")
     
     # Markets
-    lines.append(f"## Top BTC Markets")
+    index = TokenIndex(report['markets'], key=itemgetter('token_id'))
+    lines.append(f"## Top {label} Markets")
     for m in report['markets'][:10]:
         price_pct = m['price'] * 100
         lines.append(f"- [{m['outcome']}@{price_pct:.0f}%] {m['question'][:60]}")
-        lines.append(f"  Vol: ${m['volume']:,.0f} | Token: {m['token_id'][:16]}...")
+        lines.append(f"  Vol: ${m['volume']:,.0f} | Token: {index.short_id(m['token_id'])}...")
     
     return "\n".join(lines)
 
@@ -0,0 +1,270 @@
+"""Versioned intel reports and the deltas between them."""
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from operator import itemgetter
+from pathlib import Path
+from typing import Optional
+
+from .config import config
+from .token_index import TokenIndex
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR.mkdir(exist_ok=True)
+
+HISTORY_PATH = DATA_DIR / "intel.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    version INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    report TEXT NOT NULL
+);
+"""
+
+# Report fields that change on every gather without saying anything new
+VOLATILE_FIELDS = ("timestamp", "sources", "version", "changes")
+
+# Report sections filled by one gather source each, with the summary keys
+# derived from them
+SECTIONS = {
+    "markets": ("total_crypto_markets", "btc_markets"),
+    "sentiment": ("sentiment_score",),
+    "news": ("news_bias",),
+}
+
+
+@dataclass
+class IntelDelta:
+    """What changed between two intel report versions.
+
+    Only moves past ``INTEL_PRICE_MOVE``/``INTEL_SENTIMENT_MOVE`` are
+    listed; anything listed is material.
+    """
+    since: int
+    version: int
+    timestamp: str
+    added_markets: list[dict] = field(default_factory=list)    # entered the top markets
+    removed_markets: list[dict] = field(default_factory=list)  # left them ("closed" when no longer open)
+    price_moves: list[dict] = field(default_factory=list)
+    new_headlines: list[dict] = field(default_factory=list)
+    breaking_news: list[str] = field(default_factory=list)
+    sentiment_shift: Optional[float] = None
+    sentiment_score: float = 0.0
+    missing_sources: list[str] = field(default_factory=list)
+
+    @property
+    def material(self) -> bool:
+        return bool(
+            self.added_markets or self.removed_markets or self.price_moves
+            or self.new_headlines or self.breaking_news or self.sentiment_shift is not None
+        )
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "material": self.material}
+
+
+def fingerprint(report: dict) -> str:
+    """Hash of a report's content, ignoring timestamps and timings."""
+    content = {k: v for k, v in report.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def missing_sections(report: dict) -> set[str]:
+    """Sections whose source failed or missed its deadline in this gather."""
+    return set(SECTIONS) & set(report["summary"].get("missing_sources", []))
+
+
+def carry_forward(report: dict, previous: dict) -> list[str]:
+    """Fill ``report``'s missing sections (and their summary keys) from ``previous``.
+
+    A section with no data is empty, not a change; diffing it would show
+    every market closed and every headline new once the source is back.
+    """
+    carried = sorted(missing_sections(report))
+    for section in carried:
+        report[section] = previous[section]
+        for key in SECTIONS[section]:
+            report["summary"][key] = previous["summary"][key]
+    return carried
+
+
+def diff_reports(
+    old: dict,
+    new: dict,
+    open_tokens: Optional[set[str]] = None,
+    price_move: Optional[float] = None,
+    sentiment_move: Optional[float] = None
+) -> IntelDelta:
+    """Material changes from ``old`` to ``new`` (both report dicts).
+
+    ``open_tokens`` (every open BTC outcome when ``new`` was gathered)
+    tells a market that closed apart from one that only fell out of the
+    top markets by volume; an empty set says nothing, so nothing is
+    marked closed. Sections ``new`` is missing are not diffed.
+    """
+    price_move = config.intel_price_move if price_move is None else price_move
+    sentiment_move = config.intel_sentiment_move if sentiment_move is None else sentiment_move
+
+    delta = IntelDelta(
+        since=old.get("version", 0),
+        version=new.get("version", 0),
+        timestamp=new["timestamp"],
+        sentiment_score=new["sentiment"]["sentiment_score"],
+        missing_sources=new["summary"].get("missing_sources", [])
+    )
+
+    missing = missing_sections(new)
+    before = {} if "markets" in missing else {m["token_id"]: m for m in old["markets"]}
+    after = {} if "markets" in missing else {m["token_id"]: m for m in new["markets"]}
+    delta.added_markets = [m for t, m in after.items() if t not in before]
+    for token_id, m in before.items():
+        if token_id not in after:
+            closed = bool(open_tokens) and token_id not in open_tokens
+            delta.removed_markets.append({**m, "closed": closed})
+    for token_id, m in after.items():
+        previous = before.get(token_id)
+        if previous is not None and abs(m["price"] - previous["price"]) >= price_move:
+            delta.price_moves.append({
+                "token_id": token_id,
+                "question": m["question"],
+                "outcome": m["outcome"],
+                "old": previous["price"],
+                "new": m["price"]
+            })
+    delta.price_moves.sort(key=lambda p: abs(p["new"] - p["old"]), reverse=True)
+
+    if "news" not in missing:
+        seen = {h["title"] for h in old["news"]["top_headlines"]}
+        delta.new_headlines = [h for h in new["news"]["top_headlines"] if h["title"] not in seen]
+        seen_breaking = set(old["news"]["breaking_news"])
+        delta.breaking_news = [h for h in new["news"]["breaking_news"] if h not in seen_breaking]
+
+    if "sentiment" not in missing:
+        shift = new["sentiment"]["sentiment_score"] - old["sentiment"]["sentiment_score"]
+        if abs(shift) >= sentiment_move:
+            delta.sentiment_shift = shift
+    return delta
+
+
+class IntelHistory:
+    """The last ``INTEL_HISTORY`` report versions, in SQLite.
+
+    A gather whose content matches the latest version (timestamps and
+    timings aside) is not stored again, so versions only advance when
+    something changed. ``changes_since`` diffs an old version against the
+    latest directly, so small moves that add up are not lost between
+    versions.
+    """
+
+    def __init__(self, path: Path = HISTORY_PATH, keep: Optional[int] = None):
+        self.path = path
+        self.keep = keep or config.intel_history
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def _load(self, sql: str, params: tuple = ()) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def latest(self) -> Optional[dict]:
+        return self._load("SELECT report FROM reports ORDER BY version DESC LIMIT 1")
+
+    def get(self, version: int) -> Optional[dict]:
+        return self._load("SELECT report FROM reports WHERE version = ?", (version,))
+
+    def oldest_version(self) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(version) FROM reports").fetchone()
+        return row[0]
+
+    def record(self, report: dict, open_tokens: Optional[set[str]] = None) -> tuple[dict, bool]:
+        """Version ``report`` against the latest one.
+
+        Fills in ``version`` and ``changes`` (the delta from the previous
+        version, None for the first). Sections whose source missed the
+        gather keep the previous version's data. Returns the report and
+        whether it was stored as a new version.
+        """
+        # One transaction under the lock: concurrent POST /intel requests
+        # (or another process on the same file) must not both read v(n)
+        # and try to insert v(n+1)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT report FROM reports ORDER BY version DESC LIMIT 1"
+            ).fetchone()
+            latest = json.loads(row[0]) if row else None
+            if latest is not None:
+                carry_forward(report, latest)
+            digest = fingerprint(report)
+            if latest is not None and fingerprint(latest) == digest:
+                report["version"] = latest["version"]
+                report["changes"] = latest.get("changes")
+                return report, False
+
+            report["version"] = (latest["version"] + 1) if latest else 1
+            report["changes"] = diff_reports(latest, report, open_tokens).to_dict() if latest else None
+            self._conn.execute(
+                "INSERT INTO reports (version, timestamp, fingerprint, report) VALUES (?, ?, ?, ?)",
+                (report["version"], report["timestamp"], digest, json.dumps(report, default=str))
+            )
+            self._conn.execute(
+                "DELETE FROM reports WHERE version <= ?", (report["version"] - self.keep,)
+            )
+        return report, True
+
+    def changes_since(self, version: int) -> Optional[IntelDelta]:
+        """Delta from ``version`` to the latest, or None if it is no longer kept."""
+        old, new = self.get(version), self.latest()
+        if old is None or new is None:
+            return None
+        return diff_reports(old, new)
+
+
+def format_changes_for_quinn(delta: dict) -> str:
+    """Compact text of an ``IntelDelta.to_dict()``."""
+    lines = [f"# Intel changes v{delta['since']} -> v{delta['version']}", f"Generated: {delta['timestamp']}"]
+    if delta["missing_sources"]:
+        lines.append(f"- PARTIAL: no data from {', '.join(delta['missing_sources'])}")
+    if not delta["material"]:
+        lines.append("- No material changes.")
+        return "\n".join(lines)
+
+    if delta["sentiment_shift"] is not None:
+        lines.append(f"- Sentiment {delta['sentiment_shift']:+.2f} (now {delta['sentiment_score']:.2f})")
+    for headline in delta["breaking_news"]:
+        lines.append(f"- BREAKING: {headline}")
+
+    index = TokenIndex(
+        delta["price_moves"] + delta["added_markets"] + delta["removed_markets"],
+        key=itemgetter("token_id")
+    )
+    if delta["price_moves"]:
+        lines.append("## Price moves")
+        for p in delta["price_moves"]:
+            lines.append(
+                f"- [{p['outcome']} {p['old'] * 100:.0f}% -> {p['new'] * 100:.0f}%] {p['question'][:60]}"
+                f" | Token: {index.short_id(p['token_id'])}..."
+            )
+    if delta["added_markets"]:
+        lines.append("## New top markets")
+        for m in delta["added_markets"]:
+            lines.append(
+                f"- [{m['outcome']}@{m['price'] * 100:.0f}%] {m['question'][:60]}"
+                f" | Token: {index.short_id(m['token_id'])}..."
+            )
+    if delta["removed_markets"]:
+        lines.append("## Gone from top markets")
+        for m in delta["removed_markets"]:
+            lines.append(f"- {'CLOSED ' if m['closed'] else ''}[{m['outcome']}] {m['question'][:60]}")
+    if delta["new_headlines"]:
+        lines.append("## New headlines")
+        for h in delta["new_headlines"]:
+            lines.append(f"- {h['title'][:80]} ({h['source']})")
+    return "\n".join(lines)
@@ -0,0 +1,240 @@
+"""Optional local CPU sentiment model: batched ONNX inference behind a score cache."""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .config import config
+from .logger import log_event
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR.mkdir(exist_ok=True)
+
+SCORES_PATH = DATA_DIR / "model_scores.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    model TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    label TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    PRIMARY KEY (model, digest)
+);
+"""
+
+Score = tuple[str, float]  # (bullish/bearish/neutral, model confidence)
+
+
+def _load_runtime():
+    """(numpy, onnxruntime, tokenizers) if installed, else None."""
+    try:
+        import numpy
+        import onnxruntime
+        import tokenizers
+        return numpy, onnxruntime, tokenizers
+    except ImportError:
+        return None
+
+
+def digest(text: str) -> str:
+    """Content hash a score is cached under."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def bot_label(name: str, index: int, count: int) -> str:
+    """Map a model's class name to bullish/bearish/neutral.
+
+    Names like ``positive``/``NEG`` are read directly; bare ``LABEL_n``
+    classes fall back to the usual order (negative, [neutral,] positive).
+    """
+    name = name.lower()
+    if name.startswith(("pos", "bull")):
+        return "bullish"
+    if name.startswith(("neg", "bear")):
+        return "bearish"
+    if name.startswith("neu"):
+        return "neutral"
+    if index == 0:
+        return "bearish"
+    return "bullish" if index == count - 1 else "neutral"
+
+
+class ScoreCache:
+    """Model scores by content hash: an in-memory LRU over SQLite.
+
+    Scores are deterministic for a model, so entries never expire; they
+    are keyed by model identity too, so a new model starts clean.
+    """
+
+    def __init__(self, model: str, path: Path = SCORES_PATH, memory_entries: Optional[int] = None):
+        self.model = model
+        self.memory_entries = config.sentiment_model_cache if memory_entries is None else memory_entries
+        self._memory: OrderedDict[str, Score] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+
+    def _remember(self, key: str, score: Score):
+        self._memory[key] = score
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: list[str]) -> dict[str, Score]:
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                score = self._memory.get(key)
+                if score is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = score
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT digest, label, confidence FROM scores WHERE model = ? "
+                    f"AND digest IN ({','.join('?' * len(chunk))})",
+                    (self.model, *chunk)
+                ).fetchall()
+                for key, label, confidence in rows:
+                    found[key] = (label, confidence)
+                    self._remember(key, (label, confidence))
+        return found
+
+    def put_many(self, scores: dict[str, Score]):
+        with self._lock:
+            for key, score in scores.items():
+                self._remember(key, score)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scores (model, digest, label, confidence) VALUES (?, ?, ?, ?)",
+                    [(self.model, key, label, confidence) for key, (label, confidence) in scores.items()]
+                )
+
+
+class LocalSentimentModel:
+    """A small quantized text classifier run on the CPU with onnxruntime.
+
+    ``path`` is a directory from an ONNX export: ``model.onnx`` (int8
+    quantized is best on CPU), ``tokenizer.json`` and ``config.json``
+    with the model's ``id2label``. Texts are scored in batches of
+    ``batch_size`` spread over ``workers`` threads; onnxruntime releases
+    the GIL, so batches run in parallel. Each text is looked up by
+    content hash first, so nothing is ever scored twice, even across
+    restarts. Predictions under ``min_confidence`` count as neutral.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        min_confidence: Optional[float] = None,
+        cache_path: Path = SCORES_PATH,
+        max_length: int = 128
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size or config.sentiment_model_batch
+        self.workers = workers or config.sentiment_model_workers
+        self.min_confidence = config.sentiment_model_min_confidence if min_confidence is None else min_confidence
+        self.max_length = max_length
+        self.inferences = 0  # texts actually run through the model
+        self._load()
+        self.cache = ScoreCache(self.identity, cache_path)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sentiment-model")
+
+    def _load(self):
+        runtime = _load_runtime()
+        if runtime is None:
+            raise RuntimeError("onnxruntime, tokenizers and numpy are needed for SENTIMENT_MODEL")
+        self.np, onnxruntime, tokenizers = runtime
+
+        model_file = self.path / "model.onnx"
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1  # parallelism comes from the batch workers
+        self.session = onnxruntime.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = tokenizers.Tokenizer.from_file(str(self.path / "tokenizer.json"))
+        self.tokenizer.enable_truncation(self.max_length)
+        self.tokenizer.enable_padding()
+
+        id2label = json.loads((self.path / "config.json").read_text()).get("id2label", {})
+        names = [id2label[k] for k in sorted(id2label, key=int)] or ["negative", "positive"]
+        self.labels = [bot_label(name, i, len(names)) for i, name in enumerate(names)]
+
+        stat = model_file.stat()
+        self.identity = f"{self.path.name}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def _infer(self, texts: list[str]) -> list[Score]:
+        """Run one batch through the model."""
+        np = self.np
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(inputs["input_ids"])
+        logits = self.session.run(None, {k: v for k, v in inputs.items() if k in self.input_names})[0]
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = exp / exp.sum(axis=1, keepdims=True)
+        return [(self.labels[int(row.argmax())], float(row.max())) for row in probs]
+
+    def score(self, texts: list[str]) -> list[Score]:
+        """Label and confidence per text, cached by content hash."""
+        keys = [digest(text) for text in texts]
+        scores = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        # Each distinct unseen text once, in batches across the workers
+        pending = {key: text for key, text in zip(keys, texts) if key not in scores}
+        if pending:
+            items = list(pending.items())
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            results = self._pool.map(lambda batch: self._infer([text for _, text in batch]), batches)
+            fresh = {}
+            for batch, batch_scores in zip(batches, results):
+                for (key, _), score in zip(batch, batch_scores):
+                    fresh[key] = score
+            self.cache.put_many(fresh)
+            self.inferences += len(fresh)
+            scores.update(fresh)
+        return [scores[key] for key in keys]
+
+    def classify(self, texts: list[str]) -> list[str]:
+        """bullish/bearish/neutral per text."""
+        return [
+            label if confidence >= self.min_confidence else "neutral"
+            for label, confidence in self.score(texts)
+        ]
+
+
+_model: Optional[LocalSentimentModel] = None
+_model_failed = False
+_model_lock = threading.Lock()
+
+
+def get_model() -> Optional[LocalSentimentModel]:
+    """The shared ``SENTIMENT_MODEL``, loaded on first use; None to use the lexicons.
+
+    A model that fails to load is reported once and not retried.
+    """
+    global _model, _model_failed
+    if not config.sentiment_model or _model_failed:
+        return None
+    with _model_lock:
+        if _model is None and not _model_failed:
+            try:
+                _model = LocalSentimentModel(config.sentiment_model)
+                log_event("sentiment", f"Loaded local sentiment model {_model.identity}")
+            except Exception as e:
+                _model_failed = True
+                log_event("sentiment", f"Local sentiment model unavailable, using lexicons: {e}", level="warn")
+    return _model
@@ -0,0 +1,217 @@
+"""Streaming market data: CLOB market websocket feeding local L2 books."""
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .config import config
+from .orderbook import OrderBook, BID, ASK
+from .logger import log_event
+
+
+def _levels(raw: list) -> list[tuple[float, float]]:
+    return [(float(l["price"]), float(l["size"])) for l in raw or []]
+
+
+class MarketDataStream:
+    """Keeps a full L2 book per token from the CLOB ``market`` channel.
+
+    The first ``book`` message for a token loads a snapshot; each
+    ``price_change`` then updates single levels in place. ``apply_message``
+    is plain synchronous code, so the same path runs against the live
+    socket, a ``ReplayServer`` or a benchmark loop.
+
+    Readers on other threads should hold ``lock`` while querying books.
+    """
+
+    def __init__(
+        self,
+        token_ids: Iterable[str],
+        url: Optional[str] = None,
+        record_path: Optional[Path] = None,
+        reconnect: bool = True
+    ):
+        self.token_ids = list(dict.fromkeys(token_ids))
+        self.url = url or config.clob_ws_url
+        self.record_path = record_path
+        self.reconnect = reconnect
+        self.books: dict[str, OrderBook] = {t: OrderBook(t) for t in self.token_ids}
+        self.lock = threading.Lock()
+        self.messages = 0
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def book(self, token_id: str) -> OrderBook:
+        """The live book for a token (created empty if unseen)."""
+        book = self.books.get(token_id)
+        if book is None:
+            book = self.books[token_id] = OrderBook(token_id)
+        return book
+
+    def apply_message(self, message):
+        """Apply one decoded channel message (a dict or a list of them)."""
+        events = message if isinstance(message, list) else [message]
+        with self.lock:
+            for event in events:
+                self._apply_event(event)
+            self.messages += 1
+
+    def _apply_event(self, event: dict):
+        kind = event.get("event_type")
+
+        if kind == "book":
+            book = self.book(event["asset_id"])
+            book.load(
+                _levels(event.get("bids", event.get("buys"))),
+                _levels(event.get("asks", event.get("sells")))
+            )
+            book.timestamp = event.get("timestamp", "")
+
+        elif kind == "price_change":
+            # Current format batches changes for several assets in
+            # "price_changes"; the older one has one asset and "changes"
+            changes = event.get("price_changes")
+            if changes is None:
+                changes = [dict(c, asset_id=event.get("asset_id")) for c in event.get("changes", [])]
+            for change in changes:
+                book = self.book(change["asset_id"])
+                side = BID if change["side"].upper() in ("BUY", "BID") else ASK
+                book.update(side, float(change["price"]), float(change["size"]))
+                book.timestamp = event.get("timestamp", book.timestamp)
+
+        elif kind == "last_trade_price":
+            self.book(event["asset_id"]).last_trade = float(event["price"])
+
+        elif kind == "tick_size_change":
+            self.book(event["asset_id"]).tick_size = float(event["new_tick_size"])
+
+    def subscription(self) -> str:
+        return json.dumps({"assets_ids": self.token_ids, "type": "market"})
+
+    async def run(self, max_seconds: Optional[float] = None):
+        """Stream until stopped, reconnecting with backoff on errors."""
+        if websockets is None:
+            raise RuntimeError("websockets not installed - pip install websockets")
+
+        self._stop = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        deadline = time.time() + max_seconds if max_seconds else None
+        backoff = 1.0
+        record = open(self.record_path, "a") if self.record_path else None
+
+        def remaining() -> Optional[float]:
+            return deadline - time.time() if deadline else None
+
+        async def pause(seconds: float) -> bool:
+            """Back off, never past the deadline or a stop; False when the run is over."""
+            left = remaining()
+            if left is not None:
+                seconds = min(seconds, left)
+            if seconds > 0:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), seconds)
+                except asyncio.TimeoutError:
+                    pass
+            left = remaining()
+            return not self._stop.is_set() and (left is None or left > 0)
+
+        try:
+            while not self._stop.is_set():
+                left = remaining()
+                if left is not None and left <= 0:
+                    return
+                try:
+                    # Opening the socket counts against the deadline too
+                    open_timeout = min(10, left) if left is not None else 10
+                    async with websockets.connect(self.url, ping_interval=10, open_timeout=open_timeout) as ws:
+                        await ws.send(self.subscription())
+                        log_event("market_data", f"Subscribed to {len(self.token_ids)} tokens at {self.url}")
+                        backoff = 1.0
+                        while not self._stop.is_set():
+                            timeout = remaining()
+                            if timeout is not None and timeout <= 0:
+                                return
+                            try:
+                                raw = await asyncio.wait_for(ws.recv(), timeout)
+                            except asyncio.TimeoutError:
+                                return
+                            if record:
+                                record.write(raw if raw.endswith("\n") else raw + "\n")
+                            if raw in ("PONG", ""):
+                                continue
+                            self.apply_message(json.loads(raw))
+                except websockets.exceptions.ConnectionClosedOK:
+                    # Replays end by closing the socket
+                    if not self.reconnect:
+                        return
+                    log_event("market_data", f"Stream closed - reconnecting in {backoff:.0f}s")
+                except Exception as e:
+                    log_event("market_data", f"Stream error: {e} - reconnecting in {backoff:.0f}s", level="warn")
+                if not await pause(backoff):
+                    return
+                backoff = min(backoff * 2, 30)
+        finally:
+            if record:
+                record.close()
+
+    def start(self) -> threading.Thread:
+        """Run the stream on a background thread with its own event loop."""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self.run()), daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Ask the stream to exit after the message in flight (thread-safe)."""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+
+class ReplayServer:
+    """Local websocket stand-in for the CLOB market channel.
+
+    Waits for a subscription, then sends recorded channel messages (a
+    JSONL file written with ``record_path``, or a list) and closes the
+    socket. ``rate`` caps messages per second; 0 sends as fast as possible.
+    """
+
+    def __init__(self, messages, host: str = "127.0.0.1", port: int = 0, rate: float = 0):
+        if isinstance(messages, (str, Path)):
+            with open(messages) as f:
+                messages = [line.strip() for line in f if line.strip()]
+        self.messages = [m if isinstance(m, str) else json.dumps(m) for m in messages]
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handle(self, ws, *_):
+        await ws.recv()  # subscription
+        delay = 1 / self.rate if self.rate else 0
+        for message in self.messages:
+            await ws.send(message)
+            if delay:
+                await asyncio.sleep(delay)
+        await ws.close()
+
+    async def __aenter__(self) -> "ReplayServer":
+        if websockets is None:
+            raise RuntimeError("websockets not installed - pip install websockets")
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
@@ -0,0 +1,216 @@
+"""Columnar, array-backed storage for market outcomes."""
+import sys
+from array import array
+from datetime import datetime
+from itertools import compress
+from typing import Iterable, Iterator, Optional, Union
+
+from .token_index import TokenIndex
+
+# Outcome codes in a selection are (market index << 1) | side
+YES, NO = 0, 1
+OUTCOMES = ("YES", "NO")
+
+
+def _parse_end_ts(end_date: str) -> float:
+    """ISO end date to a UNIX timestamp (0 when missing or unparseable)."""
+    if not end_date:
+        return 0.0
+    try:
+        return datetime.fromisoformat(end_date.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class _Columns:
+    """Per-market column storage shared by every table sliced from it.
+
+    One entry per binary market; the YES and NO outcomes share the
+    question, title, condition id, end date and volume entries.
+    """
+
+    def __init__(self):
+        self.condition_id: list[str] = []
+        self.question: list[str] = []
+        self.event_title: list[str] = []
+        self.end_date: list[str] = []
+        self.tokens: tuple[list[str], list[str]] = ([], [])
+        self.prices: tuple[array, array] = (array("d"), array("d"))
+        self.volume = array("d")
+        self.end_ts = array("d")
+
+    def append(self, row, event_title: str) -> int:
+        """Add one parsed market (see ``catalog.parse_gamma_market``)."""
+        intern = sys.intern
+        self.condition_id.append(intern(row["condition_id"]))
+        self.question.append(intern(row["question"]))
+        self.event_title.append(intern(event_title))
+        self.end_date.append(intern(row["end_date"]))
+        self.tokens[YES].append(row["yes_token"])
+        self.tokens[NO].append(row["no_token"])
+        self.prices[YES].append(row["yes_price"])
+        self.prices[NO].append(row["no_price"])
+        self.volume.append(row["volume"])
+        self.end_ts.append(_parse_end_ts(row["end_date"]))
+        return len(self.volume) - 1
+
+
+class MarketRow:
+    """Read-only view of one outcome; looks like ``polymarket_client.Market``."""
+
+    __slots__ = ("_cols", "_market", "_side")
+
+    def __init__(self, cols: _Columns, code: int):
+        self._cols = cols
+        self._market = code >> 1
+        self._side = code & 1
+
+    @property
+    def token_id(self) -> str:
+        return self._cols.tokens[self._side][self._market]
+
+    @property
+    def condition_id(self) -> str:
+        return self._cols.condition_id[self._market]
+
+    @property
+    def question(self) -> str:
+        return self._cols.question[self._market]
+
+    @property
+    def outcome(self) -> str:
+        return OUTCOMES[self._side]
+
+    @property
+    def price(self) -> float:
+        return self._cols.prices[self._side][self._market]
+
+    @property
+    def volume(self) -> float:
+        return self._cols.volume[self._market]
+
+    @property
+    def end_date(self) -> str:
+        return self._cols.end_date[self._market]
+
+    @property
+    def end_ts(self) -> float:
+        return self._cols.end_ts[self._market]
+
+    @property
+    def event_title(self) -> str:
+        return self._cols.event_title[self._market]
+
+    def to_dict(self) -> dict:
+        """Same shape as ``asdict(Market(...))``."""
+        return {
+            "token_id": self.token_id,
+            "condition_id": self.condition_id,
+            "question": self.question,
+            "outcome": self.outcome,
+            "price": self.price,
+            "volume": self.volume,
+            "end_date": self.end_date,
+            "event_title": self.event_title
+        }
+
+    def __repr__(self) -> str:
+        return f"MarketRow({self.outcome}@{self.price:.3f} {self.question[:40]!r})"
+
+
+class MarketTable:
+    """Compact table of market outcomes in YES/NO pair layout.
+
+    Columns hold one entry per market; a table is a selection vector of
+    outcome codes over those columns, so filtering, sorting and slicing
+    build a new int array and never copy strings or create row objects.
+    Iterating or indexing yields ``MarketRow`` views.
+    """
+
+    def __init__(self, cols: Optional[_Columns] = None, selection: Optional[array] = None):
+        self._cols = cols or _Columns()
+        self._sel = selection if selection is not None else array("q")
+        self._index: Optional[TokenIndex] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> "MarketTable":
+        """Build from catalog rows (parsed market columns plus ``event_title``).
+
+        Outcomes without a token id are left out of the selection, as
+        they were when each outcome was its own ``Market``.
+        """
+        table = cls()
+        for row in rows:
+            table.append(row, row["event_title"])
+        return table
+
+    def append(self, row, event_title: str):
+        """Add one parsed market and select its tradable outcomes."""
+        self._index = None
+        i = self._cols.append(row, event_title)
+        if row["yes_token"]:
+            self._sel.append(i << 1 | YES)
+        if row["no_token"]:
+            self._sel.append(i << 1 | NO)
+
+    def _with(self, selection: Iterable[int]) -> "MarketTable":
+        return MarketTable(self._cols, array("q", selection))
+
+    def __len__(self) -> int:
+        return len(self._sel)
+
+    def __iter__(self) -> Iterator[MarketRow]:
+        cols = self._cols
+        return (MarketRow(cols, code) for code in self._sel)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[MarketRow, "MarketTable"]:
+        if isinstance(key, slice):
+            return MarketTable(self._cols, self._sel[key])
+        return MarketRow(self._cols, self._sel[key])
+
+    def __bool__(self) -> bool:
+        return bool(self._sel)
+
+    def column(self, name: str) -> list:
+        """Values of one field for every selected outcome."""
+        cols = self._cols
+        if name in ("token_id", "price"):
+            source = cols.tokens if name == "token_id" else cols.prices
+            return [source[code & 1][code >> 1] for code in self._sel]
+        if name == "outcome":
+            return [OUTCOMES[code & 1] for code in self._sel]
+        values = getattr(cols, name)
+        return [values[code >> 1] for code in self._sel]
+
+    def filter(self, mask: Iterable[bool]) -> "MarketTable":
+        """Keep outcomes where ``mask`` (aligned with this table) is true."""
+        return self._with(compress(self._sel, mask))
+
+    def filter_text(self, matcher, *fields: str) -> "MarketTable":
+        """Keep outcomes whose text fields hit a ``KeywordMatcher``.
+
+        Each distinct market is matched once, not once per outcome.
+        """
+        cols = self._cols
+        columns = [getattr(cols, f) for f in fields]
+        markets = set(code >> 1 for code in self._sel)
+        hits = {i for i in markets if matcher.search(*(c[i] for c in columns))}
+        return self._with(code for code in self._sel if code >> 1 in hits)
+
+    def sort_by_volume(self, descending: bool = True) -> "MarketTable":
+        """Order outcomes by market volume, keeping YES before NO on ties."""
+        volume = self._cols.volume
+        keys = [volume[code >> 1] for code in self._sel]
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=descending)
+        sel = self._sel
+        return self._with(sel[i] for i in order)
+
+    def index(self) -> TokenIndex:
+        """Token index over this table's outcomes, built on first use."""
+        if self._index is None:
+            self._index = TokenIndex(self)
+        return self._index
+
+    def to_dicts(self) -> list[dict]:
+        """Plain dicts for JSON reports."""
+        return [row.to_dict() for row in self]
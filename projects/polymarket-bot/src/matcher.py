@@ -0,0 +1,118 @@
+"""Compiled keyword matching shared by market, news and sentiment filters."""
+import re
+from functools import lru_cache
+from typing import Iterable, Union
+
+_WORD_CHAR = re.compile(r"\w")
+
+# Trie node key marking "a keyword ends here"
+_END = ""
+
+
+def _atoms(keyword: str) -> list[str]:
+    """Split a keyword into regex atoms: escaped chars, flexible whitespace, boundaries."""
+    atoms = []
+    for i, word in enumerate(keyword.split()):
+        if i:
+            atoms.append(r"\s+")
+        atoms.extend(re.escape(ch) for ch in word)
+    if _WORD_CHAR.match(keyword[-1]):
+        atoms.append(r"\b")
+    return atoms
+
+
+def _trie_pattern(keywords: list[str]) -> str:
+    """Compile keywords into one trie-shaped alternation.
+
+    Shared prefixes are factored out (``b(?:earish|ullish)``), so the regex
+    engine does roughly constant work per text position no matter how many
+    keywords the lexicon holds.
+    """
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for atom in _atoms(kw):
+            node = node.setdefault(atom, {})
+        node[_END] = {}
+
+    def build(node: dict) -> str:
+        # Try longer continuations before a word boundary that ends the match
+        children = sorted((a for a in node if a != _END), key=lambda a: a == r"\b")
+        if not children:
+            return ""
+        alts = [a + build(node[a]) for a in children]
+        if len(alts) == 1 and _END not in node:
+            return alts[0]
+        body = "(?:" + "|".join(alts) + ")"
+        return body + "?" if _END in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Match a fixed lexicon against text in a single regex pass.
+
+    Keywords that start or end with a word character only match on word
+    boundaries, so "ath" does not hit "that" and "red" does not hit
+    "bored"; emoji and symbol keywords match anywhere. Matching is
+    case-insensitive and multi-word keywords tolerate any whitespace.
+
+    Pass a dict of ``label -> keywords`` to match several lexicons at once
+    and count hits per label with ``tally``. Results for recently seen
+    texts are memoized, which pays off for market titles and questions that
+    repeat across outcomes and cycles; pass ``cache_size=0`` for streams of
+    mostly unique text such as tweets.
+    """
+
+    def __init__(
+        self,
+        keywords: Union[Iterable[str], dict[str, Iterable[str]]],
+        cache_size: int = 4096
+    ):
+        if not isinstance(keywords, dict):
+            keywords = {"match": keywords}
+
+        self.labels: dict[str, str] = {}
+        for label, words in keywords.items():
+            for kw in words:
+                kw = " ".join(kw.lower().split())
+                if kw:
+                    self.labels[kw] = label
+
+        word_led = [kw for kw in self.labels if _WORD_CHAR.match(kw)]
+        symbol_led = [kw for kw in self.labels if not _WORD_CHAR.match(kw)]
+        parts = []
+        if word_led:
+            parts.append(r"\b" + _trie_pattern(word_led))
+        if symbol_led:
+            parts.append(_trie_pattern(symbol_led))
+        self.pattern = re.compile("|".join(parts)) if parts else None
+        self._label_names = sorted(set(self.labels.values()))
+
+        self.findall = lru_cache(maxsize=cache_size)(self._findall) if cache_size else self._findall
+
+    def _findall(self, text: str) -> tuple[str, ...]:
+        """Distinct keywords found in ``text``, in order of first appearance."""
+        if not self.pattern or not text:
+            return ()
+        labels = self.labels
+        # Only multi-word hits need their whitespace normalized
+        return tuple(dict.fromkeys(
+            m if m in labels else " ".join(m.split())
+            for m in self.pattern.findall(text.lower())
+        ))
+
+    def search(self, *texts: str) -> bool:
+        """True if any keyword occurs in any of the texts."""
+        for text in texts:
+            if self.findall(text):
+                return True
+        return False
+
+    def tally(self, text: str) -> dict[str, int]:
+        """Number of distinct keyword hits per label."""
+        counts = dict.fromkeys(self._label_names, 0)
+        labels = self.labels
+        for kw in self.findall(text):
+            counts[labels[kw]] += 1
+        return counts
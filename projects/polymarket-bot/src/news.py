@@ -1,10 +1,15 @@
 """News aggregation for BTC market intelligence."""
-import requests
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from . import local_model
 from .logger import log_event
+from .cache import cache, conditional_get
+from .dedupe import NearDuplicateIndex
+from .gathering import gather, run_sync
+from .matcher import KeywordMatcher
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE
 
 
 @dataclass
@@ -26,31 +31,74 @@ class NewsResult:
     bearish_headlines: int
     breaking_news: list[str]
     fetched_at: str
+    missing_sources: list[str] = field(default_factory=list)  # sources that failed or timed out
+    duplicates: int = 0  # syndicated copies of a headline collapsed into the first
+    sources: dict = field(default_factory=dict)  # per source: elapsed_ms and cached/unchanged/fetched/failed
+    
+    @classmethod
+    def empty(cls, missing: str) -> "NewsResult":
+        """Empty result for when news couldn't be gathered in time."""
+        return cls([], 0, 0, [], datetime.now().isoformat(), missing_sources=[missing])
+
+
+def parse_rss(text: str) -> list[dict]:
+    """Feed entries as plain dicts, so the parsed feed is what gets cached."""
+    import feedparser
+    return [
+        {"title": entry.get("title", ""), "link": entry.get("link", ""), "summary": entry.get("summary", "")}
+        for entry in feedparser.parse(text).entries
+    ]
 
 
 class NewsAggregator:
     """Aggregate BTC news from multiple sources."""
     
-    # Headline sentiment keywords
+    # Headline sentiment keywords (matched on word boundaries)
     BULLISH_WORDS = [
-        "surge", "rally", "rises", "jumps", "gains", "bullish",
-        "record", "high", "soars", "breaks", "adoption"
+        "surge", "surges", "surged", "rally", "rallies", "rallied",
+        "rise", "rises", "jumps", "jumped", "gains", "gained", "bullish",
+        "record", "high", "highs", "soars", "soared", "breaks", "adoption"
     ]
     
     BEARISH_WORDS = [
-        "crash", "plunge", "drops", "falls", "tumbles", "bearish",
-        "low", "sells", "dump", "regulation", "ban", "hack"
+        "crash", "crashes", "plunge", "plunges", "plunged", "drops", "dropped",
+        "falls", "fell", "tumbles", "tumbled", "bearish", "low", "lows",
+        "sells", "sell-off", "selloff", "dump", "dumps", "regulation",
+        "ban", "bans", "banned", "hack", "hacked", "hacks"
     ]
     
-    def __init__(self):
+    HEADLINE_MATCHER = KeywordMatcher(
+        {"bullish": BULLISH_WORDS, "bearish": BEARISH_WORDS}, cache_size=0
+    )
+    BREAKING_MATCHER = KeywordMatcher(["breaking", "just in", "urgent"])
+    
+    CRYPTOCOMPARE_URL = "https://min-api.cryptocompare.com/data/v2/news/"
+    COINDESK_RSS_URL = "https://www.coindesk.com/arc/outboundfeeds/rss/"
+    
+    def __init__(self, universe: Optional[Universe] = None):
+        self.universe = universe or UNIVERSES[DEFAULT_UNIVERSE]
         self.last_result: Optional[NewsResult] = None
+        # How each source answered this cycle
+        self.outcomes: dict[str, str] = {}
     
     def _classify_headline(self, headline: str) -> str:
         """Classify headline sentiment."""
-        headline_lower = headline.lower()
-        
-        bullish = sum(1 for w in self.BULLISH_WORDS if w in headline_lower)
-        bearish = sum(1 for w in self.BEARISH_WORDS if w in headline_lower)
+        return self._classify_headlines([headline])[0]
+    
+    def _classify_headlines(self, headlines: list[str]) -> list[str]:
+        """Classify many headlines, with the local model when one is set."""
+        model = local_model.get_model()
+        if model is not None and headlines:
+            try:
+                return model.classify(headlines)
+            except Exception as e:
+                log_event("news", f"Local model failed, using lexicons: {e}", level="warn")
+        return [self._lexicon_label(headline) for headline in headlines]
+    
+    def _lexicon_label(self, headline: str) -> str:
+        hits = self.HEADLINE_MATCHER.tally(headline)
+        bullish = hits["bullish"]
+        bearish = hits["bearish"]
         
         if bullish > bearish:
             return "bullish"
@@ -64,12 +112,10 @@ class NewsAggregator:
         
         try:
             # CryptoCompare News API (free, no key required for basic)
-            url = "https://min-api.cryptocompare.com/data/v2/news/"
-            params = {"categories": "BTC", "lang": "EN"}
+            params = {"categories": self.universe.news_categories, "lang": "EN"}
             
-            resp = requests.get(url, params=params, timeout=10)
-            if resp.status_code == 200:
-                data = resp.json()
+            data, self.outcomes["cryptocompare"] = conditional_get("cryptocompare", self.CRYPTOCOMPARE_URL, params)
+            if data is not None:
                 for article in data.get("Data", [])[:15]:
                     items.append(NewsItem(
                         title=article.get("title", ""),
@@ -80,8 +126,9 @@ class NewsAggregator:
                             article.get("published_on", 0)
                         ).isoformat() if article.get("published_on") else None
                     ))
-                log_event("news", f"Fetched {len(items)} articles from CryptoCompare")
+                log_event("news", f"Fetched {len(items)} articles from CryptoCompare ({self.outcomes['cryptocompare']})")
         except Exception as e:
+            self.outcomes["cryptocompare"] = "failed"
             log_event("news", f"CryptoCompare fetch failed: {e}", level="warn")
         
         return items
@@ -91,57 +138,97 @@ class NewsAggregator:
         items = []
         
         try:
-            import feedparser
-            feed = feedparser.parse("https://www.coindesk.com/arc/outboundfeeds/rss/")
+            import feedparser  # noqa: F401 - without it, skip the download too
+            entries, self.outcomes["coindesk"] = conditional_get("coindesk", self.COINDESK_RSS_URL, parse=parse_rss)
+            if entries is None:
+                return items
             
-            for entry in feed.entries[:10]:
-                if "bitcoin" in entry.title.lower() or "btc" in entry.title.lower():
+            for entry in entries[:10]:
+                if self.universe.headline_matcher.search(entry["title"]):
                     items.append(NewsItem(
-                        title=entry.title,
-                        url=entry.link,
+                        title=entry["title"],
+                        url=entry["link"],
                         source="CoinDesk",
-                        snippet=entry.get("summary", "")[:200]
+                        snippet=entry["summary"][:200]
                     ))
-            log_event("news", f"Fetched {len(items)} BTC articles from CoinDesk")
+            log_event(
+                "news",
+                f"Fetched {len(items)} {self.universe.label} articles from CoinDesk ({self.outcomes['coindesk']})"
+            )
         except ImportError:
+            self.outcomes["coindesk"] = "failed"
             log_event("news", "feedparser not installed - skipping CoinDesk", level="warn")
         except Exception as e:
+            self.outcomes["coindesk"] = "failed"
             log_event("news", f"CoinDesk fetch failed: {e}", level="warn")
         
         return items
     
     def aggregate_news(self) -> NewsResult:
         """Aggregate news from all sources."""
+        return run_sync(self.aggregate_news_async())
+    
+    async def aggregate_news_async(self) -> NewsResult:
+        """Aggregate news, fetching every source at once under its own deadline."""
         log_event("news", "Starting news aggregation")
         
-        all_items = []
+        sources = {
+            "cryptocompare": self.fetch_crypto_news,
+            "coindesk": self.fetch_coindesk_headlines
+        }
+        self.outcomes = {}
+        report = await gather(sources, label="news")
         
-        # Fetch from sources
-        all_items.extend(self.fetch_crypto_news())
-        all_items.extend(self.fetch_coindesk_headlines())
+        # Per-source timing and how each answered; a 304 cost no download
+        # or parse. The 304 totals are the cache's, kept across processes
+        timings = report.timings()
+        for name in sources:
+            timings[name]["outcome"] = self.outcomes.get(name, "fetched" if timings[name]["ok"] else "failed")
+        stats = cache.stats()
+        log_event(
+            "news",
+            "Sources: " + ", ".join(
+                f"{name} {t['elapsed_ms']:.0f}ms {t['outcome']} "
+                f"({stats.get(name, {}).get('unchanged', 0)} unchanged so far)"
+                for name, t in timings.items()
+            ),
+            data=timings
+        )
         
-        # Dedupe by URL
+        all_items = []
+        for name in sources:
+            all_items.extend(report.value(name, []))
+        
+        # Dedupe by URL, then collapse the same story syndicated across
+        # outlets. The index is per cycle: each result is a fresh snapshot,
+        # so a copy must collapse into an item that is shown in it
         seen_urls = set()
         unique_items = []
+        duplicates = 0
+        syndicated = NearDuplicateIndex(capacity=max(len(all_items), 1))
         for item in all_items:
-            if item.url not in seen_urls:
-                seen_urls.add(item.url)
-                unique_items.append(item)
+            if item.url in seen_urls:
+                continue
+            seen_urls.add(item.url)
+            if syndicated.add(item.url, item.title) is not None:
+                duplicates += 1
+                continue
+            unique_items.append(item)
         
         # Classify headlines
         bullish = 0
         bearish = 0
         breaking = []
         
-        for item in unique_items:
-            sentiment = self._classify_headline(item.title)
+        labels = self._classify_headlines([item.title for item in unique_items])
+        for item, sentiment in zip(unique_items, labels):
             if sentiment == "bullish":
                 bullish += 1
             elif sentiment == "bearish":
                 bearish += 1
             
             # Check for breaking/urgent news
-            if any(kw in item.title.lower() for kw in ["breaking", "just in", "urgent"]):
+            if self.BREAKING_MATCHER.search(item.title):
                 breaking.append(item.title)
         
         result = NewsResult(
@@ -149,10 +236,16 @@ class NewsAggregator:
             bullish_headlines=bullish,
             bearish_headlines=bearish,
             breaking_news=breaking,
-            fetched_at=datetime.now().isoformat()
+            fetched_at=datetime.now().isoformat(),
+            missing_sources=report.missing,
+            duplicates=duplicates,
+            sources=timings
         )
         
         self.last_result = result
-        log_event("news", f"Aggregated {len(unique_items)} items, {bullish} bullish, {bearish} bearish")
+        log_event(
+            "news",
+            f"Aggregated {len(unique_items)} items ({duplicates} duplicates), {bullish} bullish, {bearish} bearish"
+        )
         
         return result
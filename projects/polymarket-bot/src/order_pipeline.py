@@ -0,0 +1,266 @@
+"""Pre-signed order pipeline: sign candidate orders early, post on decision."""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Optional, Sequence
+
+from .config import config
+from .orderbook import OrderBook, BID
+from .logger import log_event
+
+
+@dataclass
+class PresignedOrder:
+    """A signed FOK market order waiting for a matching decision."""
+    token_id: str
+    side: str
+    amount: float
+    price: float  # worst fill price the order was signed with
+    signed: Any
+    signed_at: float
+    sign_ms: float
+
+
+@dataclass
+class OrderTimings:
+    """Milliseconds spent in each stage between a decision and the CLOB response."""
+    price_ms: float = 0.0
+    sign_ms: float = 0.0
+    post_ms: float = 0.0
+    total_ms: float = 0.0
+    presigned: bool = False
+    presign_age_ms: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of ``OrderPipeline.submit``."""
+    response: Optional[dict]
+    price: Optional[float]
+    timings: OrderTimings = field(default_factory=OrderTimings)
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+class OrderPipeline:
+    """Keeps signed BUY orders ready for the top-ranked tokens.
+
+    While the decision engine is thinking, ``start`` signs a FOK order for
+    each token and each amount in ``config.presign_amounts``, pricing them
+    off one batch book snapshot, and re-signs them every half
+    ``max_age`` so none is older than that when a decision lands.
+
+    ``submit`` posts a matching pre-signed order straight away, with the
+    price check running alongside for the trade log. Without a match it
+    signs on demand while the price check runs, and only posts once the
+    price check has passed. Stage timings are logged for every order.
+    """
+
+    def __init__(
+        self,
+        polymarket,
+        amounts: Optional[Sequence[float]] = None,
+        top_n: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        self.polymarket = polymarket
+        if amounts is None:
+            amounts = [float(a) for a in config.presign_amounts.split(",") if a.strip()]
+        self.amounts = list(amounts)
+        self.top_n = config.presign_tokens if top_n is None else top_n
+        self.max_age = max_age or config.presign_max_age_seconds
+
+        self._orders: dict[tuple[str, str, float], PresignedOrder] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Orders can only be signed on an authenticated connection."""
+        return bool(getattr(self.polymarket, "_authenticated", False))
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Run ``fn`` on the worker pool, starting a new pool after ``stop``."""
+        while True:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="presign")
+                pool = self._pool
+            try:
+                return pool.submit(fn, *args)
+            except RuntimeError:
+                # Shut down by a concurrent stop
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+
+    def _presign(self, token_id: str, amount: float, book: Optional[dict]) -> bool:
+        if not book or not book.get("asks"):
+            return False
+        ob = OrderBook(token_id)
+        ob.load(book["bids"], book["asks"])
+        walk = ob.walk(BID, amount)
+        if not walk.filled:
+            # A FOK this size would be killed at current depth
+            return False
+
+        start = time.perf_counter()
+        try:
+            signed = self.polymarket.sign_market_order(token_id, amount, "BUY", walk.worst_price)
+        except Exception as e:
+            log_event("pipeline", f"Pre-sign failed for {token_id[:8]}: {e}", level="warn")
+            return False
+        order = PresignedOrder(token_id, "BUY", amount, walk.worst_price, signed, time.time(), _ms(start))
+        with self._lock:
+            self._orders[(token_id, "BUY", amount)] = order
+        return True
+
+    def prepare(self, token_ids: Sequence[str]) -> int:
+        """Sign fresh orders for the first ``top_n`` tokens. Returns orders signed."""
+        if not self.enabled or not self.amounts:
+            return 0
+        tokens = list(dict.fromkeys(token_ids))[:self.top_n]
+        start = time.perf_counter()
+        snapshot = self.polymarket.get_snapshot(tokens, prices=False, midpoints=False)
+        snapshot_ms = _ms(start)
+        futures = [
+            self._submit(self._presign, t, amount, snapshot.books.get(t))
+            for t in tokens for amount in self.amounts
+        ]
+        signed = sum(f.result() for f in futures)
+        log_event(
+            "pipeline",
+            f"Pre-signed {signed}/{len(futures)} orders for {len(tokens)} tokens "
+            f"(book snapshot {snapshot_ms:.0f}ms, total {_ms(start):.0f}ms)"
+        )
+        return signed
+
+    def start(self, token_ids: Sequence[str]):
+        """Prepare in the background and keep orders fresh until ``stop``."""
+        if not self.enabled or self._thread is not None:
+            return
+        tokens = list(token_ids)
+        self._stop.clear()
+
+        def run():
+            while not self._stop.is_set():
+                try:
+                    self.prepare(tokens)
+                except Exception as e:
+                    log_event("pipeline", f"Pre-sign round failed: {e}", level="warn")
+                self._stop.wait(self.max_age / 2)
+
+        self._thread = threading.Thread(target=run, name="presign-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop refreshing, shut down the workers and drop unused orders.
+
+        The next ``start`` or ``submit`` starts a fresh pool.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._orders.clear()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def has(self, token_id: str, amount: float, side: str = "BUY") -> bool:
+        """A fresh matching pre-signed order is waiting."""
+        with self._lock:
+            order = self._orders.get((token_id, side, amount))
+        return order is not None and time.time() - order.signed_at <= self.max_age
+
+    def take(self, token_id: str, amount: float, side: str = "BUY") -> Optional[PresignedOrder]:
+        """Remove and return a fresh matching order (each is posted at most once)."""
+        with self._lock:
+            order = self._orders.pop((token_id, side, amount), None)
+        if order and time.time() - order.signed_at <= self.max_age:
+            return order
+        return None
+
+    def _price_check(self, token_id: str) -> tuple[Optional[float], float]:
+        start = time.perf_counter()
+        price = self.polymarket.get_price(token_id)
+        return price, _ms(start)
+
+    def submit(
+        self, token_id: str, amount: float, side: str = "BUY", price: Optional[float] = None
+    ) -> PipelineResult:
+        """Post an order for a decision, using a pre-signed one when it matches.
+
+        A caller that already priced the order off the book passes the
+        worst fill ``price``: it becomes the signed limit and replaces the
+        price check.
+        """
+        start = time.perf_counter()
+        timings = OrderTimings()
+        if price is not None:
+            price_check = self._submit(lambda: (price, 0.0))
+        else:
+            price_check = self._submit(self._price_check, token_id)
+
+        if not self.enabled:
+            # Read-only connection: keep the old price check, then
+            # place_market_order logs the refusal or simulation
+            price, timings.price_ms = price_check.result()
+            if price is None:
+                log_event("trading", "Could not get current price", level="error")
+                return PipelineResult(None, None, timings)
+            response = self.polymarket.place_market_order(token_id, amount, side)
+            timings.total_ms = _ms(start)
+            return PipelineResult(response, price, timings)
+
+        order = self.take(token_id, amount, side)
+        if order is not None:
+            signed = order.signed
+            timings.presigned = True
+            timings.presign_age_ms = (time.time() - order.signed_at) * 1000
+        else:
+            sign_start = time.perf_counter()
+            try:
+                signed = self.polymarket.sign_market_order(token_id, amount, side, price)
+            except Exception as e:
+                log_event("trading", f"Order failed: {e}", level="error")
+                return PipelineResult(None, None, timings)
+            timings.sign_ms = _ms(sign_start)
+            # Signed on demand: the price check gates the post, as before
+            price, timings.price_ms = price_check.result()
+            if price is None:
+                log_event("trading", "Could not get current price", level="error")
+                return PipelineResult(None, None, timings)
+
+        if not config.trading_enabled:
+            log_event("trading", f"SIMULATED: {side} ${amount} of {token_id[:8]}...")
+            response = {"simulated": True, "side": side, "amount": amount}
+        else:
+            post_start = time.perf_counter()
+            try:
+                response = self.polymarket.post_signed_order(signed)
+                log_event("trading", f"Order placed: {side} ${amount}", data=response)
+            except Exception as e:
+                log_event("trading", f"Order failed: {e}", level="error")
+                response = None
+            timings.post_ms = _ms(post_start)
+        timings.total_ms = _ms(start)
+
+        price, timings.price_ms = price_check.result()
+        if price is None and order is not None:
+            price = order.price
+
+        log_event(
+            "pipeline",
+            f"{side} ${amount} {token_id[:8]}: {timings.total_ms:.0f}ms to response "
+            f"({'pre-signed' if timings.presigned else f'sign {timings.sign_ms:.0f}ms'}, "
+            f"post {timings.post_ms:.0f}ms, price check {timings.price_ms:.0f}ms)",
+            data=asdict(timings)
+        )
+        return PipelineResult(response, price, timings)
@@ -0,0 +1,165 @@
+"""In-memory L2 order book built from CLOB book snapshots and deltas."""
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Optional
+
+BID, ASK = "BUY", "SELL"
+
+
+@dataclass
+class BookWalk:
+    """Result of sweeping one side of the book."""
+    shares: float        # shares that would fill
+    cost: float          # USDC spent (BUY) or received (SELL)
+    avg_price: float
+    worst_price: float
+    levels: int          # price levels touched
+    filled: bool         # whole request fits in the book
+
+
+class _Side:
+    """One side of a book: ascending price array plus price -> size map.
+
+    Lookups are O(log n) bisects; best price is O(1) at one end of the
+    array. Prediction-market prices sit on a tick grid below 1.0, so a
+    side never holds more than about a thousand levels and the list
+    insert/remove cost is a short memmove.
+
+    Cumulative sizes (as in ``fills.DepthProfile``) are built on the
+    first depth query after a change and reused until the next one.
+    """
+
+    __slots__ = ("prices", "sizes", "_cum")
+
+    def __init__(self):
+        self.prices: list[float] = []
+        self.sizes: dict[float, float] = {}
+        self._cum: Optional[list[float]] = None
+
+    @property
+    def cum(self) -> list[float]:
+        """Running size totals in price order: ``cum[i]`` covers ``prices[:i]``."""
+        if self._cum is None:
+            sizes = self.sizes
+            self._cum = [0.0, *accumulate(sizes[p] for p in self.prices)]
+        return self._cum
+
+    def set(self, price: float, size: float):
+        self._cum = None
+        if size <= 0:
+            if self.sizes.pop(price, None) is not None:
+                del self.prices[bisect_left(self.prices, price)]
+            return
+        if price not in self.sizes:
+            insort(self.prices, price)
+        self.sizes[price] = size
+
+    def clear(self):
+        self._cum = None
+        self.prices.clear()
+        self.sizes.clear()
+
+
+class OrderBook:
+    """Full-depth L2 book for one token."""
+
+    def __init__(self, token_id: str):
+        self.token_id = token_id
+        self.bids = _Side()
+        self.asks = _Side()
+        self.last_trade: Optional[float] = None
+        self.tick_size: Optional[float] = None
+        self.updates = 0
+        self.timestamp = ""
+
+    def _side(self, side: str) -> _Side:
+        return self.bids if side.upper() in (BID, "BID", "BIDS") else self.asks
+
+    def load(self, bids: list[tuple[float, float]], asks: list[tuple[float, float]]):
+        """Replace the whole book with a snapshot."""
+        self.bids.clear()
+        self.asks.clear()
+        for price, size in bids:
+            self.bids.set(price, size)
+        for price, size in asks:
+            self.asks.set(price, size)
+        self.updates += 1
+
+    def update(self, side: str, price: float, size: float):
+        """Apply one level delta; size 0 removes the level."""
+        self._side(side).set(price, size)
+        self.updates += 1
+
+    def best_bid(self) -> Optional[float]:
+        return self.bids.prices[-1] if self.bids.prices else None
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.prices[0] if self.asks.prices else None
+
+    def mid(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+
+    def spread(self) -> Optional[float]:
+        bid, ask = self.best_bid(), self.best_ask()
+        return ask - bid if bid is not None and ask is not None else None
+
+    def depth_at(self, side: str, price: float) -> float:
+        """Size resting at exactly ``price``."""
+        return self._side(side).sizes.get(price, 0.0)
+
+    def depth_through(self, side: str, price: float) -> float:
+        """Total size at prices at least as good as ``price``.
+
+        A bisect into the side's cumulative sizes: O(log n) while the side
+        is unchanged, one O(n) rebuild after an update.
+        """
+        book = self._side(side)
+        cum = book.cum
+        if book is self.bids:
+            return cum[-1] - cum[bisect_left(book.prices, price)]
+        return cum[bisect_right(book.prices, price)]
+
+    def levels(self, side: str, depth: Optional[int] = None) -> list[tuple[float, float]]:
+        """(price, size) levels, best first."""
+        book = self._side(side)
+        prices = book.prices[::-1] if book is self.bids else book.prices
+        prices = prices[:depth] if depth else prices
+        return [(p, book.sizes[p]) for p in prices]
+
+    def walk(self, side: str, amount: float, in_shares: bool = False) -> BookWalk:
+        """Sweep the book as a market order would.
+
+        ``side`` is the taker's side: a BUY consumes asks from the lowest
+        price up, a SELL consumes bids from the highest down. ``amount`` is
+        USDC for a BUY unless ``in_shares``; SELL amounts are always shares.
+        """
+        buying = side.upper() == BID
+        book = self.asks if buying else self.bids
+        prices = book.prices if buying else reversed(book.prices)
+        by_cash = buying and not in_shares
+
+        remaining = amount
+        shares = cost = 0.0
+        worst = 0.0
+        touched = 0
+        for price in prices:
+            if remaining <= 1e-12:
+                break
+            size = book.sizes[price]
+            take = min(size, remaining / price) if by_cash else min(size, remaining)
+            shares += take
+            cost += take * price
+            remaining -= take * price if by_cash else take
+            worst = price
+            touched += 1
+
+        return BookWalk(
+            shares=shares,
+            cost=cost,
+            avg_price=cost / shares if shares else 0.0,
+            worst_price=worst,
+            levels=touched,
+            filled=remaining <= 1e-9
+        )
@@ -1,20 +1,26 @@
 """Polymarket CLOB API client wrapper."""
-import json
-import requests
-from typing import Optional
-from dataclasses import dataclass
-
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import (
-    MarketOrderArgs, OrderArgs, OrderType, OpenOrderParams, BookParams
-)
-from py_clob_client.order_builder.constants import BUY, SELL
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from dataclasses import dataclass, field
 
 from .config import config
+from .catalog import MarketCatalog, parse_gamma_market
+from .matcher import KeywordMatcher
+from .market_table import MarketTable
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE, CRYPTO_KEYWORDS
+from .transport import transport
+from .cache import cache
+from .credentials import CredentialStore
 from .logger import log_event
 
 GAMMA_API = "https://gamma-api.polymarket.com"
 
+# Keyword lists live with the universes (matched on word boundaries)
+CRYPTO_MATCHER = KeywordMatcher(CRYPTO_KEYWORDS)
+
 
 @dataclass
 class Market:
@@ -29,6 +35,20 @@ class Market:
     event_title: str
 
 
+@dataclass
+class CrawlStatus:
+    """How an ``iter_events`` crawl ended, filled in as it runs."""
+    pages: int = 0
+    failed_pages: int = 0
+    reached_end: bool = False  # a short or empty page came back
+    capped: bool = False  # stopped by ``config.gamma_max_pages``
+    
+    @property
+    def complete(self) -> bool:
+        """Every event was seen: the last page was reached, none failed."""
+        return self.reached_end and not self.failed_pages and not self.capped
+
+
 @dataclass
 class Position:
     """Current position in a market."""
@@ -41,16 +61,98 @@ class Position:
     pnl: float
 
 
+@dataclass
+class MarketSnapshot:
+    """Prices, midpoints and books for many tokens, fetched together."""
+    prices: dict[str, dict[str, float]] = field(default_factory=dict)  # token -> {"BUY": p, "SELL": p}
+    midpoints: dict[str, float] = field(default_factory=dict)
+    books: dict[str, dict] = field(default_factory=dict)  # token -> {"bids": [(p, size)], "asks": [...]}
+    fetched_at: str = ""
+    requests: int = 0
+    
+    def price(self, token_id: str, side: str = "BUY") -> Optional[float]:
+        """Quoted price for one side, as returned by ``get_price``."""
+        return self.prices.get(token_id, {}).get(side)
+    
+    def best_bid(self, token_id: str) -> Optional[float]:
+        bids = self.books.get(token_id, {}).get("bids")
+        return bids[0][0] if bids else None
+    
+    def best_ask(self, token_id: str) -> Optional[float]:
+        asks = self.books.get(token_id, {}).get("asks")
+        return asks[0][0] if asks else None
+    
+    def mid(self, token_id: str) -> Optional[float]:
+        """Midpoint, falling back to the book when /midpoints had no entry."""
+        if token_id in self.midpoints:
+            return self.midpoints[token_id]
+        bid, ask = self.best_bid(token_id), self.best_ask(token_id)
+        return (bid + ask) / 2 if bid is not None and ask is not None else None
+    
+    def spread(self, token_id: str) -> Optional[float]:
+        """Best ask minus best bid (None for a one-sided or missing book)."""
+        bid, ask = self.best_bid(token_id), self.best_ask(token_id)
+        return ask - bid if bid is not None and ask is not None else None
+
+
+def _level(level) -> tuple[float, float]:
+    """One book level as (price, size); accepts OrderSummary objects or dicts."""
+    if isinstance(level, dict):
+        return float(level["price"]), float(level["size"])
+    return float(level.price), float(level.size)
+
+
+def _normalize_book(book, depth: Optional[int] = None) -> dict:
+    """Book sides as (price, size) floats, best price first.
+    
+    The CLOB doesn't promise an ordering, so both sides are sorted here.
+    """
+    bids = sorted((_level(l) for l in (book.bids or [])), reverse=True)
+    asks = sorted(_level(l) for l in (book.asks or []))
+    return {"bids": bids[:depth], "asks": asks[:depth]}
+
+
+def _is_auth_error(e: Exception) -> bool:
+    """True for a CLOB 401 (py_clob_client's PolyApiException carries status_code)."""
+    return getattr(e, "status_code", None) == 401 or "unauthorized" in str(e).lower()
+
+
+def _as_float(value) -> float:
+    """CLOB prices come back as strings, sometimes wrapped as {"mid": ...}."""
+    if isinstance(value, dict):
+        value = value.get("mid", value.get("price"))
+    return float(value)
+
+
 class PolymarketClient:
     """Wrapper for Polymarket CLOB operations."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        catalog: Optional[MarketCatalog] = None,
+        credentials: Optional[CredentialStore] = None
+    ):
         self.client = None
         self._authenticated = False
+        self.catalog = catalog or MarketCatalog()
+        self.credentials = credentials or CredentialStore()
     
     def connect(self, read_only: bool = False) -> bool:
-        """Initialize connection to Polymarket."""
+        """Initialize connection to Polymarket.
+        
+        An already connected client is reused. Authenticated connects load
+        API credentials from the on-disk cache when possible, so no signing
+        or network round-trip happens until the first real request.
+        """
+        if self.client is not None and (self._authenticated or read_only):
+            return True
+        
         try:
+            # Imported here, not at module load: py_clob_client pulls in the
+            # web3/eth-account stack, which commands reading the catalog never need
+            from py_clob_client.client import ClobClient
+            from py_clob_client.clob_types import ApiCreds
+            
             if read_only:
                 self.client = ClobClient(config.clob_host)
                 log_event("polymarket", "Connected (read-only)")
@@ -63,117 +165,304 @@ class PolymarketClient:
                 signature_type=0,  # EOA
                 funder=config.funder_address
             )
-            self.client.set_api_creds(self.client.create_or_derive_api_creds())
+            cached = self.credentials.get(self._creds_key())
+            if cached:
+                self.client.set_api_creds(ApiCreds(**cached))
+                log_event("polymarket", "Connected (authenticated, cached API credentials)")
+            else:
+                self._derive_creds()
+                log_event("polymarket", "Connected (authenticated)")
             self._authenticated = True
-            log_event("polymarket", "Connected (authenticated)")
             return True
         except Exception as e:
             log_event("polymarket", f"Connection failed: {e}", level="error")
             return False
     
-    def get_crypto_markets(self) -> list[Market]:
-        """Find all active crypto-related prediction markets via Gamma API."""
+    def _creds_key(self) -> str:
+        return CredentialStore.key_for(config.clob_host, config.private_key)
+    
+    def _derive_creds(self):
+        """Create or derive L2 API credentials and cache them on disk."""
+        creds = self.client.create_or_derive_api_creds()
+        self.client.set_api_creds(creds)
+        self.credentials.put(self._creds_key(), {
+            "api_key": creds.api_key,
+            "api_secret": creds.api_secret,
+            "api_passphrase": creds.api_passphrase
+        })
+    
+    def _with_auth(self, call, *args, **kwargs):
+        """Run an L2-authenticated CLOB call, re-deriving credentials once on a 401."""
+        try:
+            return call(*args, **kwargs)
+        except Exception as e:
+            if not _is_auth_error(e):
+                raise
+            log_event("polymarket", "API credentials rejected - re-deriving", level="warn")
+            self.credentials.invalidate(self._creds_key())
+            self._derive_creds()
+            return call(*args, **kwargs)
+    
+    def _fetch_events_page(
+        self, offset: int, limit: int, closed: bool = False, newest_first: bool = False
+    ) -> Optional[list[dict]]:
+        """Fetch one page of events from the Gamma API."""
+        params = {"closed": str(closed).lower(), "limit": limit, "offset": offset}
+        if newest_first:
+            params.update({"order": "updatedAt", "ascending": "false"})
+        try:
+            resp = transport.get(f"{GAMMA_API}/events", params=params)
+            if resp.status_code != 200:
+                log_event("polymarket", f"Gamma API error: {resp.status_code} (offset {offset})", level="error")
+                return None
+            return resp.json()
+        except Exception as e:
+            log_event("polymarket", f"Gamma page fetch failed (offset {offset}): {e}", level="error")
+            return None
+    
+    def iter_events(
+        self,
+        closed: bool = False,
+        updated_since: Optional[str] = None,
+        status: Optional[CrawlStatus] = None
+    ) -> Iterator[dict]:
+        """Page through Gamma events, fetching pages in parallel.
+        
+        Up to ``config.gamma_workers`` pages are in flight at once. Events are
+        yielded as each page arrives; crawling stops at the first short or
+        failed page (or after ``config.gamma_max_pages``). With
+        ``updated_since``, pages are requested newest-first and crawling stops
+        once events older than that watermark show up. Pass ``status`` to
+        learn how the crawl ended once the iterator is exhausted.
+        """
+        status = status if status is not None else CrawlStatus()
+        page_size = config.gamma_page_size
+        workers = max(1, config.gamma_workers)
+        newest_first = updated_since is not None
+        seen_ids = set()
+        pages = 0
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+            next_offset = 0
+            exhausted = False
+            
+            while pending or not exhausted:
+                while not exhausted and len(pending) < workers and pages < config.gamma_max_pages:
+                    fut = pool.submit(
+                        self._fetch_events_page, next_offset, page_size, closed, newest_first
+                    )
+                    pending[fut] = next_offset
+                    next_offset += page_size
+                    pages += 1
+                if pages >= config.gamma_max_pages:
+                    exhausted = True
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.pop(fut)
+                    events = fut.result()
+                    if events is None:
+                        status.failed_pages += 1
+                        exhausted = True
+                    elif len(events) < page_size:
+                        status.reached_end = True
+                        exhausted = True
+                    
+                    for event in events or []:
+                        if newest_first and (event.get("updatedAt") or "") <= updated_since:
+                            exhausted = True
+                            continue
+                        # Offsets can shift while we crawl; don't emit an event twice
+                        event_id = event.get("id")
+                        if event_id in seen_ids:
+                            continue
+                        seen_ids.add(event_id)
+                        yield event
+        
+        status.pages = pages
+        status.capped = pages >= config.gamma_max_pages and not status.reached_end
+    
+    def iter_open_events(self) -> Iterator[dict]:
+        """Page through every open Gamma event."""
+        return self.iter_events(closed=False)
+    
+    def _market_outcomes(self, row: dict, event_title: str) -> list[Market]:
+        """Build the YES/NO Market outcomes for one parsed market."""
         markets = []
         
-        # Keywords for crypto markets
-        keywords = [
-            "bitcoin", "btc", "crypto", "ethereum", "eth ", "solana", 
-            "microstrategy", "coinbase", "binance", "defi", "token",
-            "blockchain", "mining", "stablecoin", "usdc", "usdt"
-        ]
+        # Add YES outcome
+        if row["yes_token"]:
+            markets.append(Market(
+                token_id=row["yes_token"],
+                condition_id=row["condition_id"],
+                question=row["question"],
+                outcome="YES",
+                price=row["yes_price"],
+                volume=row["volume"],
+                end_date=row["end_date"],
+                event_title=event_title
+            ))
         
-        try:
-            # Fetch open events from Gamma API
-            resp = requests.get(
-                f"{GAMMA_API}/events",
-                params={"closed": "false", "limit": 200},
-                timeout=15
-            )
+        # Add NO outcome
+        if row["no_token"]:
+            markets.append(Market(
+                token_id=row["no_token"],
+                condition_id=row["condition_id"],
+                question=row["question"],
+                outcome="NO",
+                price=row["no_price"],
+                volume=row["volume"],
+                end_date=row["end_date"],
+                event_title=event_title
+            ))
+        
+        return markets
+    
+    def _parse_event_markets(self, event: dict) -> list[Market]:
+        """Turn one Gamma event into YES/NO Market outcomes."""
+        markets = []
+        event_title = event.get("title", "")
+        for m in event.get("markets", []):
+            markets.extend(self._market_outcomes(parse_gamma_market(m), event_title))
+        return markets
+    
+    def iter_crypto_markets(self) -> Iterator[Market]:
+        """Yield crypto-related market outcomes live from Gamma as pages arrive."""
+        for event in self.iter_open_events():
+            # Check if crypto-related
+            if not CRYPTO_MATCHER.search(event.get("title", ""), event.get("description", "")):
+                continue
             
-            if resp.status_code != 200:
-                log_event("polymarket", f"Gamma API error: {resp.status_code}", level="error")
-                return markets
+            yield from self._parse_event_markets(event)
+    
+    def _upsert_batches(self, events: Iterator[dict], closed: bool = False) -> int:
+        """Write crawled events to the catalog one page-sized batch at a time."""
+        written = 0
+        while True:
+            batch = list(islice(events, config.gamma_page_size))
+            if not batch:
+                return written
+            written += self.catalog.upsert_events(batch, closed=closed)
+    
+    def sync_catalog(self, full: bool = False) -> int:
+        """Bring the local market catalog up to date.
+        
+        Incremental syncs only fetch events updated since the last watermark,
+        both open ones (upserted) and closed ones (marked closed). A full sync
+        re-crawls every open event and closes whatever disappeared; it runs on
+        first use and every ``config.catalog_full_sync_hours``.
+        """
+        watermark = self.catalog.get_state("watermark")
+        last_full = float(self.catalog.get_state("last_full_sync_at") or 0)
+        full = full or watermark is None or (
+            time.time() - last_full > config.catalog_full_sync_hours * 3600
+        )
+        started = time.time()
+        newest = watermark or ""
+        
+        def track(events):
+            nonlocal newest
+            for event in events:
+                newest = max(newest, event.get("updatedAt") or "")
+                yield event
+        
+        if full:
+            seen_ids = set()
             
-            events = resp.json()
+            def remember(events):
+                for event in events:
+                    seen_ids.add(str(event.get("id", "")))
+                    yield event
             
-            for event in events:
-                event_title = event.get("title", "")
-                search_text = (event_title + " " + event.get("description", "")).lower()
-                
-                # Check if crypto-related
-                if not any(kw in search_text for kw in keywords):
-                    continue
-                
-                # Get markets within this event
-                for m in event.get("markets", []):
-                    # Parse outcome prices
-                    prices = m.get("outcomePrices", "")
-                    if isinstance(prices, str):
-                        try:
-                            prices = json.loads(prices) if prices else ["0", "0"]
-                        except:
-                            prices = ["0", "0"]
-                    
-                    yes_price = float(prices[0]) if len(prices) > 0 else 0
-                    no_price = float(prices[1]) if len(prices) > 1 else 0
-                    
-                    # Get token IDs from clobTokenIds
-                    token_ids = m.get("clobTokenIds", "")
-                    if isinstance(token_ids, str):
-                        try:
-                            token_ids = json.loads(token_ids) if token_ids else []
-                        except:
-                            token_ids = []
-                    
-                    yes_token = token_ids[0] if len(token_ids) > 0 else ""
-                    no_token = token_ids[1] if len(token_ids) > 1 else ""
-                    
-                    # Add YES outcome
-                    if yes_token:
-                        markets.append(Market(
-                            token_id=yes_token,
-                            condition_id=m.get("conditionId", ""),
-                            question=m.get("question", ""),
-                            outcome="YES",
-                            price=yes_price,
-                            volume=float(m.get("volume", 0) or 0),
-                            end_date=m.get("endDate", ""),
-                            event_title=event_title
-                        ))
-                    
-                    # Add NO outcome
-                    if no_token:
-                        markets.append(Market(
-                            token_id=no_token,
-                            condition_id=m.get("conditionId", ""),
-                            question=m.get("question", ""),
-                            outcome="NO",
-                            price=no_price,
-                            volume=float(m.get("volume", 0) or 0),
-                            end_date=m.get("endDate", ""),
-                            event_title=event_title
-                        ))
+            crawl = CrawlStatus()
+            written = self._upsert_batches(track(remember(self.iter_events(status=crawl))))
+            closed = 0
+            # Only a crawl that saw every open event may close the rest;
+            # a failed page or the page cap would close live markets
+            if written and crawl.complete:
+                closed = self.catalog.close_missing_events(seen_ids)
+                self.catalog.set_state("last_full_sync_at", str(started))
+            else:
+                log_event(
+                    "polymarket",
+                    f"Full catalog crawl incomplete ({crawl.pages} pages, {crawl.failed_pages} failed"
+                    f"{', page cap hit' if crawl.capped else ''}) - not closing missing events",
+                    level="warn"
+                )
+        else:
+            written = self._upsert_batches(track(self.iter_events(updated_since=watermark)))
+            closed = self._upsert_batches(
+                track(self.iter_events(closed=True, updated_since=watermark)), closed=True
+            )
+        
+        if newest:
+            self.catalog.set_state("watermark", newest)
+        self.catalog.set_state("last_sync_at", str(started))
+        
+        log_event(
+            "polymarket",
+            f"Catalog {'full' if full else 'incremental'} sync: "
+            f"{written} events updated, {closed} closed in {time.time() - started:.1f}s"
+        )
+        return written
+    
+    def refresh_catalog(self, force: bool = False):
+        """Sync the catalog if it is older than ``config.catalog_sync_seconds``."""
+        last_sync = float(self.catalog.get_state("last_sync_at") or 0)
+        fresh = time.time() - last_sync <= config.catalog_sync_seconds
+        # The catalog is the Gamma cache tier; --no-cache forces a sync
+        if force or not fresh or not cache.enabled:
+            cache.record("gamma", hit=False)
+            self.sync_catalog()
+        else:
+            cache.record("gamma", hit=True)
+    
+    def get_crypto_markets(self, refresh: bool = True) -> MarketTable:
+        """Find all active crypto-related prediction markets from the local catalog.
+        
+        With ``refresh=False`` the catalog is read as-is, without a Gamma sync.
+        """
+        return self.get_event_markets(CRYPTO_MATCHER, refresh, label="crypto")
+    
+    def get_event_markets(
+        self,
+        matcher: KeywordMatcher,
+        refresh: bool = True,
+        label: str = "matching"
+    ) -> MarketTable:
+        """Open market outcomes whose event title or description matches ``matcher``."""
+        markets = MarketTable()
+        
+        try:
+            if refresh:
+                self.refresh_catalog()
             
-            log_event("polymarket", f"Found {len(markets)} crypto market outcomes")
+            markets = MarketTable.from_rows(
+                row for row in self.catalog.open_markets()
+                if matcher.search(row["event_title"], row["event_description"])
+            )
+            
+            log_event("polymarket", f"Found {len(markets)} {label} market outcomes")
             
         except Exception as e:
             log_event("polymarket", f"Failed to get markets: {e}", level="error")
         
         return markets
     
-    def get_btc_markets(self) -> list[Market]:
-        """Find BTC-specific markets (subset of crypto markets)."""
-        all_crypto = self.get_crypto_markets()
-        btc_keywords = ["bitcoin", "btc", "microstrategy"]
+    def get_universe_markets(self, universe: Universe, refresh: bool = True) -> MarketTable:
+        """Markets of one universe: its events, narrowed to matching questions."""
+        candidates = self.get_event_markets(universe.event_matcher, refresh, label=f"{universe.label} event")
+        markets = candidates.filter_text(universe.market_matcher, "question", "event_title")
         
-        btc_markets = [
-            m for m in all_crypto
-            if any(kw in m.question.lower() or kw in m.event_title.lower() 
-                   for kw in btc_keywords)
-        ]
-        
-        log_event("polymarket", f"Found {len(btc_markets)} BTC-specific markets")
-        return btc_markets
+        log_event("polymarket", f"Found {len(markets)} {universe.label}-specific markets")
+        return markets
+    
+    def get_btc_markets(self, refresh: bool = True) -> MarketTable:
+        """Find BTC-specific markets (subset of crypto markets)."""
+        return self.get_universe_markets(UNIVERSES[DEFAULT_UNIVERSE], refresh)
     
     def get_price(self, token_id: str, side: str = "BUY") -> Optional[float]:
         """Get current price for a token."""
@@ -183,18 +472,100 @@ class PolymarketClient:
             log_event("polymarket", f"Failed to get price: {e}", level="error")
             return None
     
-    def get_orderbook(self, token_id: str) -> dict:
-        """Get orderbook for a token."""
+    def get_orderbook(self, token_id: str, depth: Optional[int] = 5) -> dict:
+        """Get orderbook for a token, best levels first."""
         try:
-            book = self.client.get_order_book(token_id)
-            return {
-                "bids": book.bids[:5] if book.bids else [],
-                "asks": book.asks[:5] if book.asks else []
-            }
+            return _normalize_book(self.client.get_order_book(token_id), depth)
         except Exception as e:
             log_event("polymarket", f"Failed to get orderbook: {e}", level="error")
             return {"bids": [], "asks": []}
     
+    def _fetch_batch(self, kind: str, token_ids: list[str]) -> dict:
+        """One batch CLOB request for a chunk of tokens."""
+        from py_clob_client.clob_types import BookParams
+        
+        if kind == "prices":
+            raw = self.client.get_prices([
+                BookParams(token_id=t, side=side) for t in token_ids for side in ("BUY", "SELL")
+            ])
+            return {t: {side: float(p) for side, p in sides.items()} for t, sides in raw.items()}
+        if kind == "midpoints":
+            raw = self.client.get_midpoints([BookParams(token_id=t) for t in token_ids])
+            return {t: _as_float(mid) for t, mid in raw.items()}
+        raw = self.client.get_order_books([BookParams(token_id=t) for t in token_ids])
+        return {book.asset_id: _normalize_book(book) for book in raw}
+    
+    def _fetch_single(self, kind: str, token_id: str) -> dict:
+        """Per-token fallback when a batch endpoint is unavailable."""
+        if kind == "prices":
+            return {token_id: {
+                side: float(self.client.get_price(token_id, side=side)) for side in ("BUY", "SELL")
+            }}
+        if kind == "midpoints":
+            return {token_id: _as_float(self.client.get_midpoint(token_id))}
+        return {token_id: _normalize_book(self.client.get_order_book(token_id))}
+    
+    def get_snapshot(
+        self, token_ids: Iterable[str], prices: bool = True,
+        midpoints: bool = True, books: bool = True
+    ) -> MarketSnapshot:
+        """Fetch prices, midpoints and full books for many tokens at once.
+        
+        Tokens are split into ``config.clob_batch_size`` chunks and each chunk
+        goes to the CLOB batch endpoint (/prices, /midpoints, /books), up to
+        ``config.clob_workers`` requests in parallel. A chunk whose batch call
+        fails is retried token by token on the same worker pool.
+        """
+        start = time.time()
+        tokens = list(dict.fromkeys(t for t in token_ids if t))
+        size = max(1, config.clob_batch_size)
+        chunks = [tokens[i:i + size] for i in range(0, len(tokens), size)]
+        kinds = [k for k, wanted in (("prices", prices), ("midpoints", midpoints), ("books", books)) if wanted]
+        snapshot = MarketSnapshot(fetched_at=datetime.now().isoformat())
+        failed = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, config.clob_workers)) as pool:
+            batches = {
+                pool.submit(self._fetch_batch, kind, chunk): (kind, chunk)
+                for kind in kinds for chunk in chunks
+            }
+            singles = {}
+            for fut in as_completed(batches):
+                kind, chunk = batches[fut]
+                snapshot.requests += 1
+                try:
+                    getattr(snapshot, kind).update(fut.result())
+                except Exception as e:
+                    log_event("polymarket", f"Batch {kind} failed ({e}), fetching {len(chunk)} tokens singly", level="warn")
+                    for t in chunk:
+                        singles[pool.submit(self._fetch_single, kind, t)] = (kind, t)
+            
+            for fut in as_completed(singles):
+                kind, _ = singles[fut]
+                snapshot.requests += 1
+                try:
+                    getattr(snapshot, kind).update(fut.result())
+                except Exception:
+                    failed += 1
+        
+        if failed:
+            log_event("polymarket", f"Snapshot missing {failed} token lookups", level="warn")
+        log_event(
+            "polymarket",
+            f"Snapshot of {len(tokens)} tokens in {snapshot.requests} requests ({time.time() - start:.2f}s)"
+        )
+        return snapshot
+    
+    def mark_positions(self, positions: list[Position]) -> list[Position]:
+        """Update current price and PnL of positions from one snapshot."""
+        snapshot = self.get_snapshot((p.token_id for p in positions), prices=False, books=False)
+        for p in positions:
+            mid = snapshot.mid(p.token_id)
+            if mid is not None:
+                p.current_price = mid
+                p.pnl = (mid - p.avg_price) * p.size
+        return positions
+    
     def place_market_order(
         self, token_id: str, amount: float, side: str = "BUY"
     ) -> Optional[dict]:
@@ -208,21 +579,39 @@ class PolymarketClient:
             return {"simulated": True, "side": side, "amount": amount}
         
         try:
-            order_side = BUY if side == "BUY" else SELL
-            mo = MarketOrderArgs(
-                token_id=token_id,
-                amount=amount,
-                side=order_side,
-                order_type=OrderType.FOK
-            )
-            signed = self.client.create_market_order(mo)
-            resp = self.client.post_order(signed, OrderType.FOK)
+            signed = self.sign_market_order(token_id, amount, side)
+            resp = self.post_signed_order(signed)
             log_event("trading", f"Order placed: {side} ${amount}", data=resp)
             return resp
         except Exception as e:
             log_event("trading", f"Order failed: {e}", level="error")
             return None
     
+    def sign_market_order(
+        self, token_id: str, amount: float, side: str = "BUY", price: Optional[float] = None
+    ):
+        """Build and sign a FOK market order without posting it.
+        
+        ``price`` is the worst price the order may fill at; without it
+        py_clob_client fetches the book and works it out. Raises on failure.
+        """
+        from py_clob_client.clob_types import MarketOrderArgs, OrderType
+        from py_clob_client.order_builder.constants import BUY, SELL
+        
+        mo = MarketOrderArgs(
+            token_id=token_id,
+            amount=amount,
+            side=BUY if side == "BUY" else SELL,
+            price=price or 0,
+            order_type=OrderType.FOK
+        )
+        return self.client.create_market_order(mo)
+    
+    def post_signed_order(self, signed, order_type: str = "FOK") -> dict:
+        """Post an already signed order. Raises on failure."""
+        from py_clob_client.clob_types import OrderType
+        return self._with_auth(self.client.post_order, signed, getattr(OrderType, order_type))
+    
     def place_limit_order(
         self, token_id: str, price: float, size: float, side: str = "BUY"
     ) -> Optional[dict]:
@@ -236,6 +625,9 @@ class PolymarketClient:
             return {"simulated": True, "side": side, "price": price, "size": size}
         
         try:
+            from py_clob_client.clob_types import OrderArgs, OrderType
+            from py_clob_client.order_builder.constants import BUY, SELL
+            
             order_side = BUY if side == "BUY" else SELL
             order = OrderArgs(
                 token_id=token_id,
@@ -244,7 +636,7 @@ class PolymarketClient:
                 side=order_side
             )
             signed = self.client.create_order(order)
-            resp = self.client.post_order(signed, OrderType.GTC)
+            resp = self._with_auth(self.client.post_order, signed, OrderType.GTC)
             log_event("trading", f"Limit order placed: {side} {size} @ {price}", data=resp)
             return resp
         except Exception as e:
@@ -256,7 +648,8 @@ class PolymarketClient:
         if not self._authenticated:
             return []
         try:
-            return self.client.get_orders(OpenOrderParams())
+            from py_clob_client.clob_types import OpenOrderParams
+            return self._with_auth(self.client.get_orders, OpenOrderParams())
         except Exception as e:
             log_event("polymarket", f"Failed to get orders: {e}", level="error")
             return []
@@ -266,7 +659,7 @@ class PolymarketClient:
         if not self._authenticated:
             return False
         try:
-            self.client.cancel_all()
+            self._with_auth(self.client.cancel_all)
             log_event("trading", "All orders cancelled")
             return True
         except Exception as e:
@@ -0,0 +1,303 @@
+"""Multi-cadence stage scheduler for continuous trading."""
+import logging
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from .config import config, parse_mapping
+from .transport import transport
+from .logger import log_event
+
+# Seconds between runs; SCHEDULE_INTERVALS overrides any of these
+DEFAULT_INTERVALS = {"markets": 60, "prices": 5, "news": 60, "sentiment": 180}
+
+
+@dataclass
+class StageStats:
+    """Run counters for one stage."""
+    runs: int = 0
+    skipped: int = 0  # fired while the previous run was still going
+    errors: int = 0
+    last_ms: float = 0.0
+    last_run: Optional[str] = None
+
+
+@dataclass
+class Stage:
+    """One scheduled job and its overlap policy."""
+    name: str
+    func: Callable[[], None]
+    seconds: float
+    jitter: float = 0.0
+    max_instances: int = 1  # runs of a stage never overlap; extra firings are skipped
+    coalesce: bool = True   # runs missed while busy collapse into one
+    stats: StageStats = field(default_factory=StageStats)
+
+
+class MarketState:
+    """Latest output of every stage, shared between scheduler threads.
+
+    Also keeps the prices, sentiment score and breaking headlines the last
+    decision saw, so stages can tell when the picture has moved enough to
+    decide again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.markets = None
+        self.mids: dict[str, float] = {}
+        self.sentiment = None
+        self.news = None
+        self.updated: dict[str, str] = {}
+
+        self.last_decision: Optional[float] = None  # time.monotonic()
+        self._decided_mids: dict[str, float] = {}
+        self._decided_score: Optional[float] = None
+        self._decided_breaking: set[str] = set()
+
+    def update(self, stage: str, **values):
+        with self._lock:
+            for name, value in values.items():
+                setattr(self, name, value)
+            self.updated[stage] = datetime.now().isoformat()
+
+    @property
+    def ready(self) -> bool:
+        """Markets, sentiment and news have all arrived at least once."""
+        return self.markets is not None and self.sentiment is not None and self.news is not None
+
+    def take_for_decision(self) -> dict:
+        """Intel for the decision engine; what it sees becomes the change baseline."""
+        with self._lock:
+            self.last_decision = time.monotonic()
+            self._decided_mids = dict(self.mids)
+            self._decided_score = self.sentiment.sentiment_score
+            self._decided_breaking = set(self.news.breaking_news)
+            return {
+                "markets": self.markets,
+                "sentiment": self.sentiment,
+                "news": self.news,
+                "sources": {stage: {"updated": ts} for stage, ts in self.updated.items()},
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def changes(self, price_move: float, sentiment_move: float) -> list[str]:
+        """Reasons the picture has moved since the last decision."""
+        with self._lock:
+            reasons = []
+            moved = [
+                t for t, mid in self.mids.items()
+                if t in self._decided_mids and abs(mid - self._decided_mids[t]) >= price_move
+            ]
+            if moved:
+                reasons.append(f"{len(moved)} prices moved {price_move:g}+")
+            if self.sentiment is not None and self._decided_score is not None:
+                delta = self.sentiment.sentiment_score - self._decided_score
+                if abs(delta) >= sentiment_move:
+                    reasons.append(f"sentiment {delta:+.2f}")
+            if self.news is not None:
+                breaking = set(self.news.breaking_news) - self._decided_breaking
+                if breaking:
+                    reasons.append(f"breaking: {next(iter(breaking))[:60]}")
+            return reasons
+
+
+class TradingScheduler:
+    """Runs the trader's stages on independent cadences.
+
+    Prices, markets, news and sentiment each refresh on their own interval
+    (``SCHEDULE_INTERVALS``, with ``SCHEDULE_JITTER`` of it added at random
+    so stages drift apart) into a shared ``MarketState``. Decisions run
+    every ``decision_minutes``, and sooner when a stage sees prices,
+    sentiment or breaking news move past the triggers - but never within
+    ``DECISION_MIN_SECONDS`` of the previous one. A stage never overlaps
+    itself: a run due while the last one is still going is skipped and
+    counted. ``shutdown`` waits for running stages before returning.
+    """
+
+    def __init__(
+        self,
+        trader,
+        decision_minutes: Optional[float] = None,
+        intervals: Optional[dict[str, float]] = None
+    ):
+        self.trader = trader
+        self.state = MarketState()
+        self.last_results: Optional[dict] = None
+
+        every = {**DEFAULT_INTERVALS, **parse_mapping(config.schedule_intervals), **(intervals or {})}
+        every["decide"] = (decision_minutes or config.check_interval_minutes) * 60
+        funcs = {
+            "markets": self.refresh_markets,
+            "prices": self.refresh_prices,
+            "news": self.refresh_news,
+            "sentiment": self.refresh_sentiment,
+            "decide": self.decide
+        }
+        self.stages = {
+            name: Stage(name, func, every[name], jitter=every[name] * config.schedule_jitter)
+            for name, func in funcs.items()
+        }
+
+        self._scheduler = None
+        self._stop = threading.Event()
+        self._request_lock = threading.Lock()
+
+    # Stages
+
+    def refresh_markets(self):
+        markets = self.trader.polymarket.get_universe_markets(self.trader.universe)
+        self.trader.token_index = markets.index()
+        self.state.update("markets", markets=markets)
+        self._check_changes()
+
+    def refresh_prices(self):
+        markets = self.state.markets
+        if not markets:
+            return
+        snapshot = self.trader.polymarket.get_snapshot(
+            markets.column("token_id"), prices=False, books=False
+        )
+        self.state.update("prices", mids=dict(snapshot.midpoints))
+        self._check_changes()
+
+    def refresh_news(self):
+        self.state.update("news", news=self.trader.news.aggregate_news())
+        self._check_changes()
+
+    def refresh_sentiment(self):
+        self.state.update("sentiment", sentiment=self.trader.sentiment.analyze_btc_sentiment())
+        self._check_changes()
+
+    def decide(self):
+        if not self.state.ready:
+            log_event("scheduler", "Decision skipped - waiting for markets, news and sentiment")
+            return
+        self.last_results = self.trader.decide_and_execute(self.state.take_for_decision())
+        transport.log_stats()
+
+    # Decision triggers
+
+    def _check_changes(self):
+        if self.state.last_decision is None:
+            if self.state.ready:
+                self.request_decision("first full picture")
+            return
+        reasons = self.state.changes(config.price_move_trigger, config.sentiment_move_trigger)
+        if reasons:
+            self.request_decision("; ".join(reasons))
+
+    def request_decision(self, reason: str):
+        """Bring the next decision forward, keeping ``DECISION_MIN_SECONDS`` between decisions."""
+        with self._request_lock:
+            job = self._scheduler.get_job("decide") if self._scheduler else None
+            if job is None or job.next_run_time is None:
+                return
+            wait = 0.0
+            if self.state.last_decision is not None:
+                wait = self.state.last_decision + config.decision_min_seconds - time.monotonic()
+            when = datetime.now(job.next_run_time.tzinfo) + timedelta(seconds=max(0.0, wait))
+            if job.next_run_time <= when:
+                return  # already due by then
+            log_event("scheduler", f"Decision brought forward to {when:%H:%M:%S} ({reason})")
+            job.modify(next_run_time=when)
+
+    # Lifecycle
+
+    def _runner(self, stage: Stage) -> Callable[[], None]:
+        def run():
+            start = time.perf_counter()
+            try:
+                stage.func()
+            except Exception as e:
+                stage.stats.errors += 1
+                log_event("scheduler", f"Stage {stage.name} failed: {e}", level="error")
+            stage.stats.runs += 1
+            stage.stats.last_ms = (time.perf_counter() - start) * 1000
+            stage.stats.last_run = datetime.now().isoformat()
+        return run
+
+    def _on_skipped(self, event):
+        stage = self.stages.get(event.job_id)
+        if stage:
+            stage.stats.skipped += 1
+            log_event("scheduler", f"Stage {stage.name} still running - skipped a run", level="warn")
+
+    def start(self):
+        """Start every stage on a background scheduler."""
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.executors.pool import ThreadPoolExecutor
+        from apscheduler.events import EVENT_JOB_MAX_INSTANCES
+
+        # Skipped runs and stage errors go to our log instead
+        logging.getLogger("apscheduler").setLevel(logging.ERROR)
+        self._scheduler = BackgroundScheduler(
+            executors={"default": ThreadPoolExecutor(len(self.stages))},
+            job_defaults={"misfire_grace_time": None}
+        )
+        self._scheduler.add_listener(self._on_skipped, EVENT_JOB_MAX_INSTANCES)
+
+        now = datetime.now().astimezone()
+        for stage in self.stages.values():
+            # Data stages start at once; the first decision is requested
+            # when they have all reported, with the timer as a fallback
+            first = now + timedelta(seconds=stage.seconds) if stage.name == "decide" else now
+            self._scheduler.add_job(
+                self._runner(stage), "interval",
+                seconds=stage.seconds, jitter=stage.jitter or None,
+                id=stage.name, name=stage.name, next_run_time=first,
+                max_instances=stage.max_instances, coalesce=stage.coalesce
+            )
+
+        self._stop.clear()
+        self.trader.is_running = True
+        self._scheduler.start()
+        log_event("scheduler", "Started: " + ", ".join(
+            f"{s.name} every {s.seconds:g}s" for s in self.stages.values()
+        ))
+
+    def stop(self):
+        """Ask ``run_forever`` to shut down."""
+        self._stop.set()
+
+    def shutdown(self):
+        """Stop scheduling and wait for running stages to finish."""
+        if self._scheduler is None:
+            return
+        log_event("scheduler", "Shutting down - waiting for running stages")
+        self._scheduler.shutdown(wait=True)
+        self._scheduler = None
+        self.trader.pipeline.stop()
+        self.trader.is_running = False
+        transport.log_stats()
+        log_event("scheduler", "Stopped")
+
+    def run_forever(self):
+        """Run until SIGINT/SIGTERM, ``stop`` or ``trader.stop``, then shut down."""
+        self.start()
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                previous[sig] = signal.signal(sig, lambda *_: self._stop.set())
+        try:
+            while self.trader.is_running and not self._stop.wait(1):
+                pass
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            self.shutdown()
+
+    def status(self) -> dict:
+        """Per-stage cadence, counters and next run, plus when each input last changed."""
+        stages = {}
+        for name, stage in self.stages.items():
+            job = self._scheduler.get_job(name) if self._scheduler else None
+            stages[name] = {
+                "every_seconds": stage.seconds,
+                "next_run": job.next_run_time.isoformat() if job and job.next_run_time else None,
+                **asdict(stage.stats)
+            }
+        return {"running": self._scheduler is not None, "stages": stages, "updated": dict(self.state.updated)}
@@ -1,12 +1,18 @@
 """X/Twitter sentiment analysis for BTC markets."""
-import subprocess
-import json
-import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Optional
 from datetime import datetime
 
+from . import bird, local_model
+from .cache import cache
+from .classifier import BatchClassifier
+from .config import config
+from .dedupe import NearDuplicateIndex
+from .gathering import gather, deadline_for, run_sync
 from .logger import log_event
+from .tweet_store import TweetStore
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE
 
 
 @dataclass
@@ -19,149 +25,164 @@ class SentimentResult:
     sentiment_score: float  # -1.0 (bearish) to 1.0 (bullish)
     key_signals: list[str]
     timestamp: str
+    missing_sources: list[str] = field(default_factory=list)  # searches that failed or timed out
+    windows: dict[str, dict] = field(default_factory=dict)  # counts and score per rolling window
+    momentum: float = 0.0  # shortest window's score minus longest's
+    new_tweets: int = 0  # tweets this read added to the store
+    duplicates: int = 0  # new tweets collapsed into an earlier near-identical one
+    
+    @classmethod
+    def empty(cls, missing: str) -> "SentimentResult":
+        """Neutral result for when sentiment couldn't be gathered in time."""
+        return cls(0, 0, 0, 0, 0.0, [], datetime.now().isoformat(), missing_sources=[missing])
 
 
 class SentimentAnalyzer:
     """Analyze BTC sentiment from X/Twitter using Clawdbot's bird skill."""
     
-    # Keywords indicating bullish sentiment
+    # Keywords indicating bullish sentiment (matched on word boundaries)
     BULLISH_KEYWORDS = [
-        "bullish", "moon", "pump", "buy", "long", "breakout",
-        "ath", "all time high", "green", "rally", "surge",
+        "bullish", "moon", "mooning", "pump", "pumping", "buy", "buying",
+        "long", "breakout", "ath", "all time high", "green", "rally", "surge",
         "🚀", "📈", "💚", "🐂"
     ]
     
     # Keywords indicating bearish sentiment
     BEARISH_KEYWORDS = [
-        "bearish", "dump", "sell", "short", "crash", "dip",
-        "red", "plunge", "drop", "fall", "down",
+        "bearish", "dump", "dumping", "sell", "selling", "short", "crash",
+        "dip", "red", "plunge", "drop", "fall", "down",
         "📉", "🔴", "🐻", "💀"
     ]
     
-    def __init__(self):
+    # X searches run for each analysis (the BTC universe's by default)
+    QUERIES = UNIVERSES[DEFAULT_UNIVERSE].queries
+    
+    CLASSIFIER = BatchClassifier(BULLISH_KEYWORDS, BEARISH_KEYWORDS)
+    
+    def __init__(self, universe: Optional[Universe] = None, store: Optional[TweetStore] = None):
+        self.universe = universe or UNIVERSES[DEFAULT_UNIVERSE]
+        self.queries = self.universe.queries
         self.last_result: Optional[SentimentResult] = None
+        self._store = store
+        self.duplicates = NearDuplicateIndex()
+    
+    @property
+    def store(self) -> TweetStore:
+        """The universe's rolling tweet store, opened on first read."""
+        if self._store is None:
+            self._store = TweetStore(self.universe.name)
+        return self._store
+    
+    @store.setter
+    def store(self, store: TweetStore):
+        self._store = store
     
-    def _run_bird_search(self, query: str, count: int = 20) -> list[dict]:
-        """Run a search using the bird CLI (Clawdbot X skill)."""
-        try:
-            # Use bird CLI for X search
-            cmd = f'bird search "{query}" --count {count} --json'
-            result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True, timeout=30
-            )
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            else:
-                log_event("sentiment", f"Bird search failed: {result.stderr}", level="warn")
-                return []
-        except subprocess.TimeoutExpired:
-            log_event("sentiment", "Bird search timed out", level="warn")
-            return []
-        except json.JSONDecodeError:
-            log_event("sentiment", "Failed to parse bird output", level="warn")
-            return []
-        except Exception as e:
-            log_event("sentiment", f"Bird search error: {e}", level="error")
-            return []
+    async def _run_bird_search(self, query: str, count: int = 20, since_id: Optional[str] = None) -> list[dict]:
+        """Run a search using the bird CLI (Clawdbot X skill), cached per query."""
+        tweets = await cache.get_or_fetch_async(
+            "bird", (query, count, since_id), partial(self._bird_search, query, count, since_id)
+        )
+        return tweets or []
+    
+    async def _bird_search(self, query: str, count: int, since_id: Optional[str] = None) -> Optional[list[dict]]:
+        """Uncached bird search; None on failure so errors are not cached."""
+        timeout = deadline_for("bird")
+        if bird.worker.enabled:
+            return await bird.worker.search(query, count, timeout, since_id)
+        return await bird.search(query, count, timeout, since_id)
     
     def _classify_tweet(self, text: str) -> str:
         """Classify a tweet as bullish, bearish, or neutral."""
-        text_lower = text.lower()
-        
-        bullish_hits = sum(1 for kw in self.BULLISH_KEYWORDS if kw in text_lower)
-        bearish_hits = sum(1 for kw in self.BEARISH_KEYWORDS if kw in text_lower)
-        
-        if bullish_hits > bearish_hits:
-            return "bullish"
-        elif bearish_hits > bullish_hits:
-            return "bearish"
-        return "neutral"
+        return self._classify_tweets([text])[0]
+    
+    def _classify_tweets(self, texts: list[str]) -> list[str]:
+        """Classify many tweets in one pass, with the local model when one is set."""
+        model = local_model.get_model()
+        if model is not None and texts:
+            try:
+                return model.classify(texts)
+            except Exception as e:
+                log_event("sentiment", f"Local model failed, using lexicons: {e}", level="warn")
+        return self.CLASSIFIER.classify(texts).labels
     
     def _extract_signals(self, tweets: list[dict]) -> list[str]:
-        """Extract key trading signals from tweets."""
-        signals = []
-        
-        # Look for price mentions
-        for tweet in tweets[:10]:
-            text = tweet.get("text", "")
-            
-            # Price targets
-            price_matches = re.findall(r'\$(\d{2,3}),?(\d{3})', text)
-            for match in price_matches:
-                price = int(match[0]) * 1000 + int(match[1])
-                signals.append(f"Price target: ${price:,}")
-            
-            # Influential accounts (high engagement)
-            likes = tweet.get("likes", 0)
-            if likes > 1000:
-                sentiment = self._classify_tweet(text)
-                signals.append(f"High engagement ({likes} likes): {sentiment}")
-        
-        return signals[:5]  # Top 5 signals
+        """Extract key trading signals (price targets, high engagement) from tweets."""
+        return self.CLASSIFIER.signals(tweets)
     
     def analyze_btc_sentiment(self) -> SentimentResult:
         """Analyze current BTC sentiment from X/Twitter."""
-        log_event("sentiment", "Starting BTC sentiment analysis")
-        
-        # Search queries
-        queries = [
-            "BTC",
-            "bitcoin price",
-            "#BTC",
-            "bitcoin prediction"
-        ]
-        
-        all_tweets = []
-        for query in queries:
-            tweets = self._run_bird_search(query, count=15)
-            all_tweets.extend(tweets)
+        return run_sync(self.analyze_btc_sentiment_async())
+    
+    async def analyze_btc_sentiment_async(self) -> SentimentResult:
+        """Analyze current BTC sentiment, running every search at once.
+        
+        Each search gets the ``bird`` deadline, capped by the ``sentiment``
+        one so the whole read fits in it; searches that miss it are
+        cancelled (their bird process killed), left out and listed in
+        ``missing_sources``.
+        
+        Only tweets after each query's cursor are classified; they join
+        the rolling store, and the counts and score come from its
+        ``SENTIMENT_WINDOW`` window rather than from this read alone.
+        Copypasta and bot reposts of a tweet already seen are collapsed
+        into it before classification.
+        """
+        log_event("sentiment", f"Starting {self.universe.label} sentiment analysis")
+        
+        store = self.store
+        deadline = min(deadline_for("bird"), deadline_for("sentiment"))
+        report = await gather(
+            {query: partial(self._run_bird_search, query, 15, store.since_id(query)) for query in self.queries},
+            deadlines={query: deadline for query in self.queries},
+            label="sentiment"
+        )
         
-        # Dedupe by tweet ID
-        seen_ids = set()
-        unique_tweets = []
-        for tweet in all_tweets:
-            tid = tweet.get("id")
-            if tid and tid not in seen_ids:
-                seen_ids.add(tid)
-                unique_tweets.append(tweet)
+        # Classify only what the store hasn't seen and isn't a repost
+        collapsed = []
         
-        # Classify each tweet
-        bullish = 0
-        bearish = 0
-        neutral = 0
+        def original(tweet: dict) -> bool:
+            duplicate_of = self.duplicates.add(str(tweet["id"]), tweet.get("text", ""))
+            if duplicate_of is not None:
+                collapsed.append(duplicate_of)
+            return duplicate_of is None
         
-        for tweet in unique_tweets:
-            classification = self._classify_tweet(tweet.get("text", ""))
-            if classification == "bullish":
-                bullish += 1
-            elif classification == "bearish":
-                bearish += 1
-            else:
-                neutral += 1
+        new_tweets = []
+        for query in self.queries:
+            new_tweets.extend(store.add(query, report.value(query, []), self._classify_tweets, keep=original))
+        store.advance()
+        windows = store.summary()
         
-        total = len(unique_tweets)
+        current = windows.get(config.sentiment_window) or next(iter(windows.values()))
+        shortest, longest = next(iter(windows.values())), list(windows.values())[-1]
+        momentum = shortest["score"] - longest["score"] if shortest["total"] and longest["total"] else 0.0
         
-        # Calculate sentiment score (-1 to 1)
-        if total > 0:
-            score = (bullish - bearish) / total
+        # Signals from the newest tweets; keep the last ones on a quiet read
+        if new_tweets:
+            signals = self._extract_signals(new_tweets[::-1])
         else:
-            score = 0.0
-        
-        # Extract key signals
-        signals = self._extract_signals(unique_tweets)
+            signals = self.last_result.key_signals if self.last_result else []
         
         result = SentimentResult(
-            bullish_count=bullish,
-            bearish_count=bearish,
-            neutral_count=neutral,
-            total_tweets=total,
-            sentiment_score=round(score, 3),
+            bullish_count=current["bullish"],
+            bearish_count=current["bearish"],
+            neutral_count=current["neutral"],
+            total_tweets=current["total"],
+            sentiment_score=current["score"],
             key_signals=signals,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            missing_sources=report.missing,
+            windows=windows,
+            momentum=round(momentum, 3),
+            new_tweets=len(new_tweets),
+            duplicates=len(collapsed)
         )
         
         self.last_result = result
-        log_event("sentiment", f"Analysis complete: score={score:.3f}, tweets={total}")
+        log_event(
+            "sentiment",
+            f"Analysis complete: score={result.sentiment_score:.3f}, tweets={result.total_tweets} "
+            f"({len(new_tweets)} new, {len(collapsed)} duplicates), momentum={result.momentum:+.3f}"
+        )
         
         return result
 
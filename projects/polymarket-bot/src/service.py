@@ -0,0 +1,253 @@
+"""Bot operations behind both the CLI and the control API, as JSON-able dicts."""
+import os
+import signal
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional
+
+from .config import config
+from .cache import cache
+from .control import ControlError, ControlServer
+from .logger import log_event, get_recent_logs, summarize_trades
+from .universes import get_universe
+
+
+class BotService:
+    """intel, markets, trade, status and logs, run in-process.
+
+    The CLI builds one per command when no daemon is running. ``serve``
+    keeps one alive, so the trader, its CLOB client and credentials, the
+    catalog and the response cache stay warm between requests; with
+    ``schedule`` it also runs the continuous stages, and their latest
+    market state answers ``markets``.
+    """
+
+    def __init__(self, read_only: bool = True, schedule: bool = False):
+        self.read_only = read_only
+        self.schedule = schedule
+        self.scheduler = None
+        self.started: Optional[str] = None
+        self.requests = 0
+        self._trader = None
+        self._trader_lock = threading.Lock()
+        self._histories = {}
+        self._stop = threading.Event()
+
+    @property
+    def trader(self):
+        """Connected on first use (read-only unless the service trades)."""
+        with self._trader_lock:
+            if self._trader is None:
+                from .trader import PolymarketTrader
+                trader = PolymarketTrader()
+                if not trader.initialize(read_only=self.read_only):
+                    raise ControlError("Failed to connect to Polymarket - check wallet credentials", status=503)
+                self._trader = trader
+            return self._trader
+
+    def start(self):
+        """Connect and load markets up front, as a daemon does."""
+        start = time.perf_counter()
+        self.trader.get_markets()
+        if self.schedule:
+            from .scheduler import TradingScheduler
+            self.scheduler = TradingScheduler(self.trader)
+            self.scheduler.start()
+        self.started = datetime.now().isoformat()
+        log_event("service", f"Warm in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    def serve(self):
+        """Warm up, then answer the control API until SIGINT/SIGTERM or POST /shutdown."""
+        server = ControlServer(self.routes())
+        thread = None
+        previous = {}
+        try:
+            self.start()
+            thread = threading.Thread(target=server.serve_forever, name="control-api", daemon=True)
+            thread.start()
+            log_event("service", f"Control API listening on {server.address}", level="success")
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                previous[sig] = signal.signal(sig, lambda *_: self._stop.set())
+            while not self._stop.wait(1):
+                pass
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            if thread is not None:
+                server.shutdown()
+            server.server_close()
+            self.shutdown()
+            log_event("service", "Stopped")
+
+    def shutdown(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+            self.scheduler = None
+        cache.flush_stats()
+
+    # Operations
+
+    def history(self, universe: Optional[str] = None):
+        from .intel import DATA_DIR
+        from .intel_history import IntelHistory, HISTORY_PATH
+
+        u = get_universe(universe)
+        if u.name not in self._histories:
+            self._histories[u.name] = IntelHistory(u.data_path(DATA_DIR, HISTORY_PATH.name))
+        return self._histories[u.name]
+
+    def intel(self, since: Optional[int] = None, universe: Optional[str] = None) -> dict:
+        """Gather a fresh report; with ``since``, the text is only what changed from that version."""
+        from .intel import gather_intel, format_intel_for_quinn
+
+        u = get_universe(universe)
+        trader = self.trader
+        # The trader's own searches and news are for its universe
+        clients = (trader.sentiment, trader.news) if u is trader.universe else (None, None)
+        report = asdict(gather_intel(trader.polymarket, *clients, self.history(u.name), u))
+        if since is not None:
+            changes = self.changes(int(since), u.name)
+            if changes["changes"] is not None:
+                return {"report": report, **changes}
+        return {"report": report, "changes": report["changes"], "text": format_intel_for_quinn(report)}
+
+    def changes(self, since: int, universe: Optional[str] = None) -> dict:
+        """Delta from version ``since`` to the latest stored report, without gathering.
+
+        ``changes`` is None when that version is no longer kept.
+        """
+        from .intel_history import format_changes_for_quinn
+
+        delta = self.history(universe).changes_since(int(since))
+        if delta is None:
+            return {"changes": None, "text": f"Version {since} is no longer kept - use the full report."}
+        changes = delta.to_dict()
+        return {"changes": changes, "text": format_changes_for_quinn(changes)}
+
+    def markets(
+        self,
+        refresh: bool = False,
+        by_spread: bool = False,
+        limit: int = 10,
+        universe: Optional[str] = None
+    ) -> dict:
+        u = get_universe(universe)
+        trader = self.trader
+        state = self.scheduler.state.markets if self.scheduler and u is trader.universe else None
+        if refresh:
+            trader.polymarket.refresh_catalog(force=True)
+        if state is not None and not refresh:
+            universe_markets = state.sort_by_volume()
+        else:
+            universe_markets = trader.polymarket.get_universe_markets(u).sort_by_volume()
+
+        rows = []
+        if by_spread:
+            for m, spread, snapshot in trader.rank_by_spread(universe_markets)[:int(limit)]:
+                rows.append({
+                    **self._market_row(m),
+                    "bid": snapshot.best_bid(m.token_id),
+                    "ask": snapshot.best_ask(m.token_id),
+                    "spread": spread
+                })
+        else:
+            rows = [self._market_row(m) for m in universe_markets[:int(limit)]]
+        return {"total": len(universe_markets), "markets": rows}
+
+    @staticmethod
+    def _market_row(m) -> dict:
+        return {
+            "token_id": m.token_id,
+            "question": m.question,
+            "outcome": m.outcome,
+            "price": m.price,
+            "volume": m.volume,
+            "end_date": m.end_date
+        }
+
+    def trade(
+        self,
+        token_id: str,
+        amount: float,
+        side: str = "BUY",
+        dry_run: bool = True,
+        universe: Optional[str] = None
+    ) -> dict:
+        """Place (or dry-run) a market order; short ids resolve in ``universe``'s index."""
+        dry_run = _flag(dry_run)
+        if not dry_run and self.read_only:
+            raise ControlError("Running read-only - restart without --read-only to trade", status=403)
+        trader = self._resolver() if dry_run else self.trader
+        full_token_id = trader.resolve_token(token_id, get_universe(universe) if universe else None)
+        if full_token_id is None:
+            raise ControlError(f"Token id {token_id} matches several markets - use more digits.", status=400)
+        if dry_run:
+            return {"token_id": full_token_id, "dry_run": True, "result": None}
+
+        result = trader.polymarket.place_market_order(full_token_id, float(amount), side)
+        if not result:
+            raise ControlError("Trade failed", status=502)
+        return {"token_id": full_token_id, "dry_run": False, "result": result}
+
+    def _resolver(self):
+        """A dry run only resolves the token id; it needs no connection."""
+        if self._trader is not None:
+            return self._trader
+        from .trader import PolymarketTrader
+        return PolymarketTrader()
+
+    def status(self) -> dict:
+        from .catalog import MarketCatalog
+
+        status = {
+            "config": {
+                "trading_enabled": config.trading_enabled,
+                "max_position_size": config.max_position_size,
+                "min_confidence": config.min_confidence,
+                "check_interval_minutes": config.check_interval_minutes
+            },
+            "trades": summarize_trades(),
+            "catalog": MarketCatalog().stats(),
+            "cache": cache.stats()
+        }
+        if self.started:
+            status["daemon"] = {
+                "pid": os.getpid(),
+                "started": self.started,
+                "requests": self.requests,
+                "read_only": self.read_only,
+                "scheduler": self.scheduler.status() if self.scheduler else None
+            }
+        return status
+
+    def logs(self, count: int = 20) -> dict:
+        return {"entries": get_recent_logs(int(count))}
+
+    # Control API
+
+    def routes(self) -> dict:
+        def counted(func):
+            def handler(**params):
+                self.requests += 1
+                return func(**params)
+            return handler
+
+        return {
+            ("GET", "/health"): lambda: {"ok": True, "pid": os.getpid(), "started": self.started},
+            ("GET", "/status"): counted(self.status),
+            ("GET", "/logs"): counted(self.logs),
+            ("GET", "/changes"): counted(self.changes),
+            ("GET", "/markets"): counted(lambda refresh=False, by_spread=False, limit=10, universe=None: self.markets(
+                _flag(refresh), _flag(by_spread), int(limit), universe
+            )),
+            ("POST", "/intel"): counted(self.intel),
+            ("POST", "/trade"): counted(self.trade),
+            ("POST", "/shutdown"): lambda: self._stop.set() or {"ok": True}
+        }
+
+
+def _flag(value) -> bool:
+    """Query-string booleans arrive as strings."""
+    return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
@@ -0,0 +1,78 @@
+"""Exact and prefix lookups over the token ids of a market snapshot."""
+import os
+from bisect import bisect_left
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional
+
+# Prompts and reports show at least this many digits of a token id
+MIN_SHORT_ID = 16
+
+
+class TokenIndex:
+    """Resolve full or truncated token ids to market outcomes.
+
+    Token ids are kept in a sorted array, which works as a flattened
+    prefix trie: every id sharing a prefix sits in one contiguous run found
+    with two bisects. Each id's shortest unambiguous prefix is worked out
+    once from its neighbours, so prompts never show a truncated id that
+    matches more than one outcome.
+    """
+
+    def __init__(
+        self,
+        items: Iterable,
+        key: Callable[[Any], str] = attrgetter("token_id"),
+        min_short: int = MIN_SHORT_ID
+    ):
+        self._by_id: dict[str, Any] = {}
+        for item in items:
+            token_id = key(item)
+            if token_id:
+                self._by_id[token_id] = item
+        self._sorted = sorted(self._by_id)
+        self._short: dict[str, int] = {}
+
+        ids = self._sorted
+        for i, token_id in enumerate(ids):
+            shared = 0
+            if i > 0:
+                shared = len(os.path.commonprefix((ids[i - 1], token_id)))
+            if i + 1 < len(ids):
+                shared = max(shared, len(os.path.commonprefix((token_id, ids[i + 1]))))
+            self._short[token_id] = min(max(min_short, shared + 1), len(token_id))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._by_id
+
+    def get(self, token_id: str) -> Optional[Any]:
+        """Exact lookup."""
+        return self._by_id.get(token_id)
+
+    def short_id(self, token_id: str) -> str:
+        """Shortest prefix (at least ``min_short`` chars) that resolves uniquely."""
+        return token_id[:self._short.get(token_id, len(token_id))]
+
+    def matches(self, prefix: str) -> list[str]:
+        """All indexed token ids starting with ``prefix``."""
+        if not prefix:
+            return []
+        lo = bisect_left(self._sorted, prefix)
+        # Token ids are decimal strings, so "~" sorts after any continuation
+        hi = bisect_left(self._sorted, prefix + "~", lo)
+        return self._sorted[lo:hi]
+
+    def resolve(self, token_id: str) -> Optional[Any]:
+        """Exact id, or a prefix matching exactly one indexed id."""
+        token_id = token_id.strip().rstrip(".")
+        item = self._by_id.get(token_id)
+        if item is not None:
+            return item
+        found = self.matches(token_id)
+        return self._by_id[found[0]] if len(found) == 1 else None
+
+    def is_ambiguous(self, prefix: str) -> bool:
+        """True if a prefix matches more than one indexed id."""
+        return len(self.matches(prefix)) > 1
@@ -1,29 +1,63 @@
 """Main trading orchestrator."""
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from typing import Optional
 
 from .config import config
-from .polymarket_client import PolymarketClient, Market
-from .sentiment import SentimentAnalyzer
-from .news import NewsAggregator
+from .polymarket_client import PolymarketClient
+from .market_table import MarketTable
+from .token_index import TokenIndex
+from .sentiment import SentimentAnalyzer, SentimentResult
+from .news import NewsAggregator, NewsResult
 from .decision_engine import DecisionEngine, TradeDecision
+from .order_pipeline import OrderPipeline
+from .fills import OrderSlicer, DepthProfile
+from .execution import ExecutionEngine
+from .gathering import gather, run_sync
+from .universes import Universe, UNIVERSES, DEFAULT_UNIVERSE
+from .transport import transport
 from .logger import log_event, log_trade, summarize_trades
 
 
 class PolymarketTrader:
-    """Main trading bot that orchestrates all components."""
+    """Main trading bot that orchestrates all components.
     
-    def __init__(self):
-        self.polymarket = PolymarketClient()
-        self.sentiment = SentimentAnalyzer()
-        self.news = NewsAggregator()
-        self.decision_engine = DecisionEngine()
+    Trades one market universe (BTC by default). Traders for several
+    universes can share a Polymarket connection and execution engine; see
+    ``UniverseRunner``.
+    """
+    
+    def __init__(
+        self,
+        universe: Optional[Universe] = None,
+        polymarket: Optional[PolymarketClient] = None,
+        execution: Optional[ExecutionEngine] = None
+    ):
+        self.universe = universe or UNIVERSES[DEFAULT_UNIVERSE]
+        self.polymarket = polymarket or PolymarketClient()
+        self.sentiment = SentimentAnalyzer(self.universe)
+        self.news = NewsAggregator(self.universe)
+        self._decision_engine: Optional[DecisionEngine] = None
+        self.pipeline = OrderPipeline(self.polymarket)
+        self.slicer = OrderSlicer(self.polymarket, self.pipeline)
+        self.execution = execution or ExecutionEngine()
+        
+        self.token_index: Optional[TokenIndex] = None
         
         self.is_running = False
         self.last_run: Optional[datetime] = None
         self.total_invested = 0.0
         self.total_returned = 0.0
+        self._totals_lock = threading.Lock()
+    
+    @property
+    def decision_engine(self) -> DecisionEngine:
+        """Created on first use, so commands that never ask an LLM skip the SDK import."""
+        if self._decision_engine is None:
+            self._decision_engine = DecisionEngine(self.universe)
+        return self._decision_engine
     
     def initialize(self, read_only: bool = False) -> bool:
         """Initialize all components."""
@@ -46,92 +80,167 @@ class PolymarketTrader:
         
         return True
     
-    def gather_intelligence(self) -> dict:
-        """Gather all market intelligence."""
-        log_event("trader", "Gathering market intelligence...")
+    def gather_intelligence(self, refresh: bool = True) -> dict:
+        """Gather all market intelligence.
         
-        # Get BTC markets
-        markets = self.polymarket.get_btc_markets()
+        Markets, sentiment and news run concurrently under per-source
+        deadlines, so the stage takes about as long as the slowest source
+        and a source that misses its deadline comes back empty. With
+        ``refresh=False`` markets come from the catalog without a sync.
+        """
+        log_event("trader", f"Gathering {self.universe.label} market intelligence...")
         
-        # Get sentiment
-        sentiment = self.sentiment.analyze_btc_sentiment()
+        gathered = run_sync(gather({
+            "markets": partial(self.polymarket.get_universe_markets, self.universe, refresh),
+            "sentiment": self.sentiment.analyze_btc_sentiment_async,
+            "news": self.news.aggregate_news_async
+        }, label="trader"))
         
-        # Get news
-        news = self.news.aggregate_news()
+        markets = gathered.value("markets") or MarketTable()
+        self.token_index = markets.index()
         
         return {
             "markets": markets,
-            "sentiment": sentiment,
-            "news": news,
+            "sentiment": gathered.value("sentiment") or SentimentResult.empty("sentiment"),
+            "news": gathered.value("news") or NewsResult.empty("news"),
+            "sources": gathered.timings(),
             "timestamp": datetime.now().isoformat()
         }
     
+    def token_index_for(self, universe: Optional[Universe] = None) -> TokenIndex:
+        """Token index of this trader's universe, or of ``universe``.
+        
+        The trader's own index is the latest market snapshot, loaded from
+        the catalog if this trader hasn't gathered markets yet. That load
+        skips the Gamma sync: ids being resolved come from a report built
+        on the catalog, and a sync would delay the order behind it. Other
+        universes (ids from ``intel -u``) are loaded the same way per call.
+        """
+        if universe is not None and universe is not self.universe:
+            return self.polymarket.get_universe_markets(universe, refresh=False).index()
+        if self.token_index is None:
+            self.token_index = self.polymarket.get_universe_markets(self.universe, refresh=False).index()
+        return self.token_index
+    
+    def find_market(self, token_id: str, universe: Optional[Universe] = None):
+        """Look up a market outcome by full or short token id."""
+        return self.token_index_for(universe).resolve(token_id)
+    
+    def resolve_token(self, token_id: str, universe: Optional[Universe] = None) -> Optional[str]:
+        """Expand a short token id to the full id, using ``universe``'s index if given.
+        
+        Ids that match nothing in the snapshot are passed through unchanged
+        so markets outside it can still be traded; ambiguous prefixes
+        return None.
+        """
+        index = self.token_index_for(universe)
+        market = index.resolve(token_id)
+        if market:
+            return market.token_id
+        if index.is_ambiguous(token_id):
+            log_event("trading", f"Ambiguous token id {token_id}", level="error")
+            return None
+        return token_id
+    
     def execute_trade(self, decision: TradeDecision) -> bool:
         """Execute a trading decision."""
         
-        # Get current price
-        current_price = self.polymarket.get_price(decision.token_id)
-        if current_price is None:
-            log_event("trading", "Could not get current price", level="error")
+        token_id = self.resolve_token(decision.token_id)
+        if token_id is None:
             return False
+        decision.token_id = token_id
         
-        # Execute the trade
-        result = self.polymarket.place_market_order(
-            token_id=decision.token_id,
-            amount=decision.amount,
-            side="BUY"
-        )
+        # The slicer sizes orders to the book (splitting ones it can't fill
+        # whole) and posts through the pipeline, which uses a pre-signed
+        # order when one matches
+        sliced = self.slicer.submit(decision.token_id, decision.amount, side="BUY")
         
-        if result:
-            simulated = result.get("simulated", False)
+        if sliced.responses:
+            simulated = sliced.responses[0].get("simulated", False)
             log_trade(
                 action=decision.action,
                 token_id=decision.token_id,
-                amount=decision.amount,
-                price=current_price,
+                amount=sliced.filled,
+                price=sliced.avg_price,
                 outcome=decision.outcome,
                 reasoning=decision.reasoning,
                 simulated=simulated
             )
             
             if not simulated:
-                self.total_invested += decision.amount
+                # execute_trade runs on execution engine threads
+                with self._totals_lock:
+                    self.total_invested += sliced.filled
             
             return True
         
         return False
     
-    def run_cycle(self) -> dict:
+    def run_cycle(self, refresh: bool = True) -> dict:
         """Run one trading cycle."""
         cycle_start = datetime.now()
-        log_event("trader", f"Starting trading cycle at {cycle_start.isoformat()}")
+        log_event("trader", f"Starting {self.universe.label} trading cycle at {cycle_start.isoformat()}")
         
-        results = {
-            "timestamp": cycle_start.isoformat(),
+        try:
+            intel = self.gather_intelligence(refresh)
+        except Exception as e:
+            log_event("trader", f"Cycle error: {e}", level="error")
+            intel = None
+        
+        if intel is None:
+            results = self._new_results(cycle_start)
+            results["errors"].append("intelligence gathering failed")
+        else:
+            results = self.decide_and_execute(intel, cycle_start)
+        
+        cycle_duration = (datetime.now() - cycle_start).total_seconds()
+        log_event("trader", f"Cycle complete in {cycle_duration:.1f}s")
+        transport.log_stats()
+        
+        return results
+    
+    @staticmethod
+    def _new_results(started: datetime) -> dict:
+        return {
+            "timestamp": started.isoformat(),
             "markets_found": 0,
             "decisions_made": 0,
             "trades_executed": 0,
+            "trades_failed": 0,
             "errors": []
         }
+    
+    def decide_and_execute(self, intel: dict, started: Optional[datetime] = None) -> dict:
+        """Ask the decision engine about ``intel`` and execute its decisions.
+        
+        ``intel`` is shaped like ``gather_intelligence``'s result; the
+        scheduler builds it from the latest result of each stage.
+        """
+        started = started or datetime.now()
+        results = self._new_results(started)
         
         try:
-            # Gather intelligence
-            intel = self.gather_intelligence()
             results["markets_found"] = len(intel["markets"])
+            results["sources"] = intel.get("sources", {})
             
             if not intel["markets"]:
-                log_event("trader", "No BTC markets found", level="warn")
+                log_event("trader", f"No {self.universe.label} markets found", level="warn")
                 return results
             
+            # Sign candidate orders for the top tokens while the LLM thinks
+            top_tokens = intel["markets"].sort_by_volume().column("token_id")
+            self.pipeline.start(top_tokens)
+            
             # Generate decisions
             decisions = self.decision_engine.analyze_markets(
                 markets=intel["markets"],
                 sentiment=intel["sentiment"],
-                news=intel["news"]
+                news=intel["news"],
+                index=self.token_index
             )
             results["decisions_made"] = len(decisions)
             
-            # Execute trades
+            # Execute trades: independent tokens concurrently, rate limited
             for decision in decisions:
                 log_event(
                     "trading",
@@ -142,38 +251,33 @@ class PolymarketTrader:
                         "reasoning": decision.reasoning
                     }
                 )
-                
-                if self.execute_trade(decision):
-                    results["trades_executed"] += 1
+            
+            report = self.execution.execute(
+                decisions,
+                self.execute_trade,
+                key=lambda d: self.resolve_token(d.token_id) or d.token_id
+            )
+            report.merge_into(results)
             
         except Exception as e:
             log_event("trader", f"Cycle error: {e}", level="error")
             results["errors"].append(str(e))
-        
-        self.last_run = cycle_start
-        cycle_duration = (datetime.now() - cycle_start).total_seconds()
-        log_event("trader", f"Cycle complete in {cycle_duration:.1f}s")
+        finally:
+            self.pipeline.stop()
+            self.last_run = started
         
         return results
     
     def run_continuous(self, interval_minutes: Optional[int] = None):
-        """Run the bot continuously."""
-        interval = interval_minutes or config.check_interval_minutes
+        """Run the bot continuously until interrupted or stopped.
         
-        log_event("trader", f"Starting continuous mode (every {interval} minutes)")
-        self.is_running = True
+        Stages run on their own cadences (see ``scheduler.TradingScheduler``);
+        decisions come every ``interval_minutes`` or sooner when the
+        market, news or sentiment picture changes.
+        """
+        from .scheduler import TradingScheduler
         
-        try:
-            while self.is_running:
-                self.run_cycle()
-                
-                # Wait for next cycle
-                log_event("trader", f"Sleeping for {interval} minutes...")
-                time.sleep(interval * 60)
-                
-        except KeyboardInterrupt:
-            log_event("trader", "Interrupted by user")
-            self.is_running = False
+        TradingScheduler(self, decision_minutes=interval_minutes).run_forever()
     
     def stop(self):
         """Stop the bot."""
@@ -193,19 +297,98 @@ class PolymarketTrader:
             "trades": trade_summary
         }
     
-    def get_markets(self) -> list[Market]:
-        """Get current BTC markets."""
-        return self.polymarket.get_btc_markets()
+    def get_markets(self) -> MarketTable:
+        """Get current markets of this trader's universe."""
+        return self.polymarket.get_universe_markets(self.universe)
     
     def preview_trade(self, token_id: str, amount: float) -> dict:
         """Preview a potential trade."""
-        price = self.polymarket.get_price(token_id)
-        book = self.polymarket.get_orderbook(token_id)
+        market = self.find_market(token_id)
+        token_id = market.token_id if market else token_id
+        
+        # Price and book requests go out in parallel
+        snapshot = self.polymarket.get_snapshot([token_id], midpoints=False)
+        price = snapshot.price(token_id)
+        book = snapshot.books.get(token_id, {"bids": [], "asks": []})
+        
+        # Walk the full ask side rather than assuming a fill at the quote
+        profile = DepthProfile.from_book(book, "BUY")
+        fill = profile.estimate(amount)
         
         return {
             "token_id": token_id,
+            "question": market.question if market else None,
+            "outcome": market.outcome if market else None,
             "current_price": price,
             "amount": amount,
-            "estimated_shares": amount / price if price else 0,
-            "orderbook": book
+            "estimated_shares": fill.shares,
+            "avg_price": fill.avg_price,
+            "worst_price": fill.worst_price,
+            "slippage": fill.slippage,
+            "fillable": fill.filled,
+            "max_fillable": fill.max_fillable,
+            "max_within_slippage": profile.max_within(self.slicer.max_slippage),
+            "orderbook": {"bids": book["bids"][:5], "asks": book["asks"][:5]}
         }
+    
+    def rank_by_spread(self, markets: MarketTable) -> list[tuple]:
+        """Rank market outcomes by bid/ask spread (tightest first).
+        
+        Uses one batched snapshot for every token. Returns
+        ``(market, spread, snapshot)`` tuples; outcomes without a two-sided
+        book are ranked last.
+        """
+        snapshot = self.polymarket.get_snapshot(markets.column("token_id"), prices=False)
+        ranked = [(m, snapshot.spread(m.token_id), snapshot) for m in markets]
+        ranked.sort(key=lambda r: (r[1] is None, r[1] or 0.0))
+        return ranked
+
+
+class UniverseRunner:
+    """Runs a trading cycle for several universes at once.
+    
+    Each universe gets its own trader (searches, news, prompt, order
+    pipeline), all sharing one Polymarket connection - so one market
+    catalog, synced once per round - and one execution engine, so the
+    CLOB rate limit covers every universe's orders together. Universes run
+    on a thread pool of ``UNIVERSE_WORKERS``: the work is network and LLM
+    waits, so a new universe adds a worker, not time to the others' cycle.
+    """
+    
+    def __init__(
+        self,
+        universes: list[Universe],
+        workers: Optional[int] = None,
+        polymarket: Optional[PolymarketClient] = None
+    ):
+        self.polymarket = polymarket or PolymarketClient()
+        self.execution = ExecutionEngine()
+        self.workers = workers or config.universe_workers
+        self.traders = {
+            u.name: PolymarketTrader(u, polymarket=self.polymarket, execution=self.execution)
+            for u in universes
+        }
+    
+    def initialize(self, read_only: bool = False) -> bool:
+        """Connect the shared client (through any one trader)."""
+        return next(iter(self.traders.values())).initialize(read_only=read_only)
+    
+    def run_cycle(self) -> dict[str, dict]:
+        """One cycle per universe, concurrently. Returns results by universe name."""
+        started = datetime.now()
+        self.polymarket.refresh_catalog()
+        
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="universe") as pool:
+            futures = {
+                name: pool.submit(trader.run_cycle, refresh=False)
+                for name, trader in self.traders.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        
+        log_event(
+            "trader",
+            f"{len(results)} universes in {(datetime.now() - started).total_seconds():.1f}s: " + ", ".join(
+                f"{name} {r['decisions_made']} decisions" for name, r in results.items()
+            )
+        )
+        return results
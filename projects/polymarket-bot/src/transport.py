@@ -0,0 +1,268 @@
+"""Shared HTTP transport: pooled keep-alive sessions, retries, timeouts and metrics."""
+import json
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+
+from .config import config, parse_mapping
+from .logger import log_event
+
+# Worth retrying: throttling and transient server/gateway errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 30.0
+
+
+def _load_aiohttp():
+    """aiohttp if installed, else None (imported on first async call)."""
+    try:
+        import aiohttp
+        return aiohttp
+    except ImportError:
+        return None
+
+
+@dataclass
+class HostStats:
+    """Per-host request counters."""
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.requests if self.requests else 0.0
+
+
+@dataclass
+class HttpResponse:
+    """Fully read response from the async front-end.
+
+    Mirrors the parts of ``requests.Response`` the call sites use, so
+    code reading a response works the same for either front-end.
+    """
+    url: str
+    status_code: int
+    headers: dict
+    content: bytes
+    elapsed_ms: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpTransport:
+    """One place for every outbound HTTP call.
+
+    The sync front-end shares a single ``requests.Session`` whose adapter
+    keeps a keep-alive pool per host, so repeat calls skip the TCP and TLS
+    handshakes. The async front-end keeps one ``aiohttp`` session per
+    event loop with the same pool limits (or runs the sync path in a
+    worker thread when aiohttp is missing). Both apply the same per-host
+    timeouts, jittered retries and latency/byte counters.
+
+    ``requests``, ``aiohttp`` and ``asyncio`` are imported on first use,
+    so importing this module costs nothing for commands that stay offline.
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        timeout: Optional[float] = None,
+        host_timeouts: Optional[dict[str, float]] = None
+    ):
+        self.pool_size = pool_size or config.http_pool_size
+        self.retries = config.http_retries if retries is None else retries
+        self.backoff = config.http_backoff if backoff is None else backoff
+        self.timeout = timeout or config.http_timeout
+        self.host_timeouts = host_timeouts if host_timeouts is not None else parse_mapping(config.http_timeouts)
+
+        self._session: Optional["requests.Session"] = None
+        self._async_sessions = weakref.WeakKeyDictionary()
+        self._stats: dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    # ---- shared policy -------------------------------------------------
+
+    def timeout_for(self, url: str) -> float:
+        return self.host_timeouts.get(urlsplit(url).hostname or "", self.timeout)
+
+    def _delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After."""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+        return random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** attempt))
+
+    def _record(self, url: str, elapsed_ms: float, nbytes: int, retried: bool, failed: bool):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = HostStats()
+            stats.requests += 1
+            stats.retries += retried
+            stats.errors += failed
+            stats.bytes += nbytes
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+    def stats(self) -> dict[str, dict]:
+        """Counters per host, with average latency."""
+        with self._lock:
+            return {
+                host: dict(asdict(s), avg_ms=s.avg_ms)
+                for host, s in sorted(self._stats.items())
+            }
+
+    def log_stats(self):
+        for host, s in self.stats().items():
+            log_event(
+                "http",
+                f"{host}: {s['requests']} requests, {s['retries']} retries, {s['errors']} errors, "
+                f"{s['bytes'] / 1024:.0f} KiB, avg {s['avg_ms']:.0f}ms, max {s['max_ms']:.0f}ms"
+            )
+
+    # ---- sync front-end ------------------------------------------------
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    
+                    session = requests.Session()
+                    # Retries are ours (with jitter and stats), not urllib3's
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_size,
+                        pool_maxsize=self.pool_size,
+                        max_retries=0
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs) -> "requests.Response":
+        """Send a request, retrying transient failures.
+
+        Returns the last response (possibly a retryable error status once
+        retries run out); raises the last exception if no response came back.
+        """
+        import requests
+        
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(url, (time.perf_counter() - start) * 1000, 0, attempt > 0, True)
+                if attempt >= self.retries:
+                    raise
+            else:
+                retry = resp.status_code in RETRY_STATUS and attempt < self.retries
+                self._record(
+                    url, (time.perf_counter() - start) * 1000, len(resp.content),
+                    attempt > 0, resp.status_code >= 400 and not retry
+                )
+                if not retry:
+                    return resp
+                time.sleep(self._delay(attempt, resp.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("POST", url, **kwargs)
+
+    # ---- async front-end -----------------------------------------------
+
+    def _async_session(self, aiohttp):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_size, ttl_dns_cache=300)
+            session = self._async_sessions[loop] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    async def arequest(self, method: str, url: str, **kwargs) -> HttpResponse:
+        """Async ``request``; the body is read before returning."""
+        import asyncio
+        aiohttp = _load_aiohttp()
+        if aiohttp is None:
+            resp = await asyncio.to_thread(self.request, method, url, **kwargs)
+            return HttpResponse(
+                url, resp.status_code, dict(resp.headers), resp.content,
+                resp.elapsed.total_seconds() * 1000
+            )
+
+        timeout = aiohttp.ClientTimeout(total=kwargs.pop("timeout", self.timeout_for(url)))
+        session = self._async_session(aiohttp)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                async with session.request(method, url, timeout=timeout, **kwargs) as r:
+                    content = await r.read()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    resp = HttpResponse(str(r.url), r.status, dict(r.headers), content, elapsed)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self._record(url, (time.perf_counter() - start) * 1000, 0, attempt > 0, True)
+                if attempt >= self.retries:
+                    raise
+            else:
+                retry = resp.status_code in RETRY_STATUS and attempt < self.retries
+                self._record(url, resp.elapsed_ms, len(content), attempt > 0, resp.status_code >= 400 and not retry)
+                if not retry:
+                    return resp
+                await asyncio.sleep(self._delay(attempt, resp.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            await asyncio.sleep(self._delay(attempt))
+            attempt += 1
+
+    async def aget(self, url: str, **kwargs) -> HttpResponse:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def aclose(self):
+        """Close the aiohttp session bound to the running loop."""
+        import asyncio
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+# Process-wide transport used by every module
+transport = HttpTransport()
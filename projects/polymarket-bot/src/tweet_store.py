@@ -0,0 +1,223 @@
+"""Rolling store of classified tweets with per-query since-id cursors."""
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .config import config, parse_mapping
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DATA_DIR.mkdir(exist_ok=True)
+
+TWEETS_PATH = DATA_DIR / "tweets.db"
+
+LABELS = ("bullish", "bearish", "neutral")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    universe TEXT NOT NULL,
+    tweet_id TEXT NOT NULL,
+    query TEXT NOT NULL,
+    posted_at REAL NOT NULL,
+    label TEXT NOT NULL,
+    likes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (universe, tweet_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_posted ON tweets(universe, posted_at);
+CREATE TABLE IF NOT EXISTS cursors (
+    universe TEXT NOT NULL,
+    query TEXT NOT NULL,
+    since_id TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (universe, query)
+);
+"""
+
+
+def newer(tweet_id: str, cursor: Optional[str]) -> bool:
+    """Whether an X id (an increasing integer) comes after the cursor.
+
+    Ids that are not integers have no order, so they never move a cursor
+    and are only deduplicated.
+    """
+    return tweet_id.isdigit() and (cursor is None or int(tweet_id) > int(cursor))
+
+
+def posted_at(tweet: dict, now: float) -> float:
+    """When a tweet was posted, from whichever field bird gave; ``now`` if none parses."""
+    value = tweet.get("createdAt") or tweet.get("created_at")
+    if isinstance(value, (int, float)):
+        return min(float(value), now)
+    if isinstance(value, str) and value:
+        for parse in (lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")), parsedate_to_datetime):
+            try:
+                return min(parse(value).timestamp(), now)
+            except (ValueError, TypeError):
+                continue
+        try:
+            return min(datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y").timestamp(), now)
+        except ValueError:
+            pass
+    return now
+
+
+class RollingWindow:
+    """Label counts over the last ``seconds``, kept up to date incrementally.
+
+    Entries are kept in posting order; ``advance`` drops the ones that
+    aged out from the front, so each tweet is counted in and out once.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.entries: deque[tuple[float, str]] = deque()
+        self.counts = dict.fromkeys(LABELS, 0)
+
+    def add(self, ts: float, label: str):
+        # Late tweets go in place, scanning from the newest end, so the
+        # front stays the oldest
+        i = len(self.entries)
+        while i and self.entries[i - 1][0] > ts:
+            i -= 1
+        self.entries.insert(i, (ts, label))
+        self.counts[label] += 1
+
+    def advance(self, now: float):
+        cutoff = now - self.seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            _, label = self.entries.popleft()
+            self.counts[label] -= 1
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+    @property
+    def score(self) -> float:
+        """-1 (all bearish) to 1 (all bullish)."""
+        return (self.counts["bullish"] - self.counts["bearish"]) / self.total if self.total else 0.0
+
+    def summary(self) -> dict:
+        return {**self.counts, "total": self.total, "score": round(self.score, 3)}
+
+
+class TweetStore:
+    """Classified tweets of one universe over the longest sentiment window.
+
+    Tweets are keyed by id, so a tweet returned by several searches or
+    several reads is counted once. Each query keeps the newest id it has
+    seen as a cursor: searches ask bird for newer tweets only when it
+    takes a since-id flag (``BIRD_SINCE_ARG``), and anything at or below
+    the cursor is dropped before scoring either way. Counts for every
+    window (``SENTIMENT_WINDOWS``) are updated as tweets arrive and age
+    out; tweets older than the longest window are deleted.
+    """
+
+    def __init__(
+        self,
+        universe: str,
+        path: Path = TWEETS_PATH,
+        windows: Optional[dict[str, float]] = None
+    ):
+        self.universe = universe
+        self.path = path
+        self.windows = {
+            name: RollingWindow(seconds)
+            for name, seconds in (windows or parse_mapping(config.sentiment_windows)).items()
+        }
+        self.retention = max(w.seconds for w in self.windows.values())
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._cursors = dict(self._conn.execute(
+            "SELECT query, since_id FROM cursors WHERE universe = ?", (universe,)
+        ).fetchall())
+        self._load()
+
+    def _load(self):
+        """Fill the windows from tweets still inside the longest one."""
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT posted_at, label FROM tweets WHERE universe = ? AND posted_at >= ? ORDER BY posted_at",
+            (self.universe, now - self.retention)
+        ).fetchall()
+        for ts, label in rows:
+            for window in self.windows.values():
+                window.add(ts, label)
+        self.advance(now)
+
+    def since_id(self, query: str) -> Optional[str]:
+        with self._lock:
+            return self._cursors.get(query)
+
+    def add(self, query: str, tweets: Iterable[dict], classify, keep=None) -> list[dict]:
+        """Store the tweets not seen before, classified; returns them labelled.
+
+        ``classify(texts)`` labels the new tweets, all in one call. New
+        tweets that fail ``keep(tweet)`` (near-duplicates, say) are
+        dropped unclassified. Moves the query's cursor to the newest X
+        id returned.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._cursors.get(query)
+            newest = cursor
+            fresh, rows = [], []
+            for tweet in tweets:
+                tweet_id = str(tweet.get("id") or "")
+                if not tweet_id:
+                    continue
+                if newer(tweet_id, newest):
+                    newest = tweet_id
+                if cursor is not None and tweet_id.isdigit() and not newer(tweet_id, cursor):
+                    continue
+                if keep is not None and not keep(tweet):
+                    continue
+                rows.append((tweet_id, posted_at(tweet, now), tweet))
+
+            rows.sort(key=lambda row: row[1])  # searches list newest first
+            labels = classify([tweet.get("text", "") for _, _, tweet in rows]) if rows else []
+            with self._conn:
+                for (tweet_id, ts, tweet), label in zip(rows, labels):
+                    inserted = self._conn.execute(
+                        "INSERT OR IGNORE INTO tweets (universe, tweet_id, query, posted_at, label, likes) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.universe, tweet_id, query, ts, label, int(tweet.get("likes") or 0))
+                    ).rowcount
+                    if not inserted:
+                        continue  # another query already brought it in
+                    fresh.append({**tweet, "label": label})
+                    if ts >= now - self.retention:
+                        for window in self.windows.values():
+                            window.add(ts, label)
+                if newest is not None and newest != cursor:
+                    self._cursors[query] = newest
+                    self._conn.execute(
+                        "INSERT INTO cursors (universe, query, since_id, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(universe, query) DO UPDATE SET since_id = excluded.since_id, "
+                        "updated_at = excluded.updated_at",
+                        (self.universe, query, newest, now)
+                    )
+        return fresh
+
+    def advance(self, now: Optional[float] = None):
+        """Age tweets out of every window and delete what even the longest has dropped."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for window in self.windows.values():
+                window.advance(now)
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM tweets WHERE universe = ? AND posted_at < ?",
+                    (self.universe, now - self.retention)
+                )
+
+    def summary(self) -> dict[str, dict]:
+        """Counts and score per window, shortest first."""
+        with self._lock:
+            ordered = sorted(self.windows.items(), key=lambda item: item[1].seconds)
+            return {name: window.summary() for name, window in ordered}
@@ -0,0 +1,138 @@
+"""Market universes: the markets, searches, news and prompt each strategy covers."""
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Optional
+
+from .config import config
+from .matcher import KeywordMatcher
+
+# Keywords for crypto markets (matched on word boundaries)
+CRYPTO_KEYWORDS = [
+    "bitcoin", "bitcoins", "btc", "crypto", "cryptocurrency", "cryptocurrencies",
+    "ethereum", "eth", "solana", "microstrategy", "coinbase", "binance", "defi",
+    "token", "tokens", "blockchain", "mining", "stablecoin", "stablecoins",
+    "usdc", "usdt"
+]
+
+BTC_KEYWORDS = ["bitcoin", "bitcoins", "btc", "microstrategy"]
+
+MACRO_KEYWORDS = [
+    "fed", "federal reserve", "fomc", "powell", "interest rate", "interest rates",
+    "rate cut", "rate cuts", "rate hike", "inflation", "cpi", "recession", "gdp",
+    "unemployment", "jobs report", "nonfarm payrolls", "treasury", "treasuries"
+]
+
+POLITICS_KEYWORDS = [
+    "election", "elections", "president", "presidential", "senate", "congress",
+    "governor", "democrat", "democrats", "democratic", "republican", "republicans",
+    "gop", "primary", "nominee", "trump", "electoral"
+]
+
+
+@dataclass
+class Universe:
+    """One group of markets traded with its own intel and prompt.
+
+    Markets come from the shared catalog in two passes, as for BTC:
+    events whose title or description matches ``event_keywords``, then
+    outcomes whose question or event title matches ``market_keywords``.
+    """
+    name: str
+    label: str       # short name for logs and reports ("BTC")
+    subject: str     # what the prompt says the markets are about ("Bitcoin")
+    analyst: str     # who the prompt says the LLM is
+    event_keywords: list[str]
+    market_keywords: list[str]
+    queries: list[str]              # X searches for sentiment
+    news_categories: str            # CryptoCompare news categories
+    headline_keywords: list[str]    # RSS headlines kept for this universe
+    prompt_rules: list[str] = field(default_factory=list)  # extra rules for the LLM
+
+    @cached_property
+    def event_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.event_keywords)
+
+    @cached_property
+    def market_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.market_keywords)
+
+    @cached_property
+    def headline_matcher(self) -> KeywordMatcher:
+        return KeywordMatcher(self.headline_keywords)
+
+    def data_path(self, directory: Path, filename: str) -> Path:
+        """Per-universe data file; BTC keeps the original names."""
+        if self.name == DEFAULT_UNIVERSE:
+            return directory / filename
+        stem, dot, suffix = filename.partition(".")
+        return directory / f"{stem}_{self.name}{dot}{suffix}"
+
+
+DEFAULT_UNIVERSE = "btc"
+
+UNIVERSES = {
+    "btc": Universe(
+        name="btc",
+        label="BTC",
+        subject="Bitcoin",
+        analyst="crypto trading analyst",
+        event_keywords=CRYPTO_KEYWORDS,
+        market_keywords=BTC_KEYWORDS,
+        queries=["BTC", "bitcoin price", "#BTC", "bitcoin prediction"],
+        news_categories="BTC",
+        headline_keywords=["bitcoin", "btc"]
+    ),
+    "eth": Universe(
+        name="eth",
+        label="ETH",
+        subject="Ethereum",
+        analyst="crypto trading analyst",
+        event_keywords=CRYPTO_KEYWORDS,
+        market_keywords=["ethereum", "eth", "ether"],
+        queries=["ETH", "ethereum price", "#ETH", "ethereum prediction"],
+        news_categories="ETH",
+        headline_keywords=["ethereum", "eth", "ether"],
+        prompt_rules=["Weigh ETH against BTC: most ETH moves follow Bitcoin"]
+    ),
+    "macro": Universe(
+        name="macro",
+        label="macro",
+        subject="macroeconomic (Fed, rates, inflation)",
+        analyst="macro trading analyst",
+        event_keywords=MACRO_KEYWORDS,
+        market_keywords=MACRO_KEYWORDS,
+        queries=["fed rate cut", "FOMC", "CPI inflation", "recession odds"],
+        news_categories="Fiat,Market",
+        headline_keywords=MACRO_KEYWORDS,
+        prompt_rules=["Anchor on scheduled releases (FOMC, CPI, jobs) before the resolution date"]
+    ),
+    "politics": Universe(
+        name="politics",
+        label="politics",
+        subject="political and election",
+        analyst="political forecasting analyst",
+        event_keywords=POLITICS_KEYWORDS,
+        market_keywords=POLITICS_KEYWORDS,
+        queries=["election odds", "election polls", "senate race", "polymarket election"],
+        news_categories="Regulation",
+        headline_keywords=POLITICS_KEYWORDS,
+        prompt_rules=["Prefer polling averages over single polls; X sentiment is noisy here"]
+    ),
+}
+
+
+def get_universe(name: Optional[str] = None) -> Universe:
+    """A universe by name (default BTC); ValueError if unknown."""
+    name = (name or DEFAULT_UNIVERSE).strip().lower()
+    if name not in UNIVERSES:
+        raise ValueError(f"Unknown universe '{name}' - choose from {', '.join(UNIVERSES)}")
+    return UNIVERSES[name]
+
+
+def select_universes(names: Optional[str] = None) -> list[Universe]:
+    """Universes named in ``names`` (comma-separated, or "all"), default ``UNIVERSES``."""
+    names = names or config.universes
+    if names.strip().lower() == "all":
+        return list(UNIVERSES.values())
+    return [get_universe(name) for name in names.split(",") if name.strip()]